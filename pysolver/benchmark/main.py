@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from .suite import (SEED, benchmark_cube, benchmark_import, benchmark_solver, measurement,
+                    regressions)
+from ..cli.main import ENGINES, load_engine
+from ..cube.constants import SOLVED
+from ..cube.cube import Cube
+
+
+# the stored results which runs are compared against.
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# how much worse than the baseline a timed result may be before the run
+# fails, timings on shared machines easily vary by half between runs.
+TOLERANCE = 1.0
+
+# how much worse than the baseline any other result may be before the run
+# fails, these only change when a solver does.
+COUNT_TOLERANCE = 0.1
+
+# the most milliseconds importing the command line interface may take, this
+# is most of the time taken to solve a single cube with CFOP so it is checked
+# on every run, not just against the baseline.
+IMPORT_BUDGET = 50.0
+
+# the arguments which change what is measured, a run is only compared with a
+# baseline recorded with the same ones.
+PARAMETERS = ('count', 'solves', 'seed')
+
+# the modules whose import is measured, by benchmark name.
+IMPORTS = {'cli': 'pysolver.cli.main', 'constants': 'pysolver.cube.constants'}
+
+
+def run_suite(engines, count, solves, seed=SEED):
+    """Run every benchmark.
+
+    Arguments:
+        engines (list {str}): The names of the solvers in ENGINES to
+            benchmark.
+        count (int): The number of cubes used by the cube benchmarks.
+        solves (int): The number of cubes each solver solves.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        (dict): Lookup from the name of each benchmark to its measurement.
+    """
+    results = benchmark_cube(count, seed)
+
+    for name, module in IMPORTS.items():
+        results.update(benchmark_import(name, module))
+
+    for engine in engines:
+        # solvers load their tables the first time they are used, so a
+        # solved cube is solved to include that in the setup.
+        start = time.perf_counter()
+        solver = load_engine(engine)()
+        solver.solve(Cube(SOLVED))
+
+        results[f'solve.{engine}.setup'] = measurement(time.perf_counter() - start, 's')
+        results.update(benchmark_solver(engine, solver, solves, seed))
+
+    return results
+
+
+def run_benchmarks():
+    """Run the command line interface for the benchmarks."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark pysolver over seeded random scrambles and compare the results '
+                    'with a stored baseline.',
+        prog='pysolver.benchmark'
+    )
+
+    parser.add_argument(
+        '--engine',
+        action='append',
+        choices=sorted(ENGINES),
+        dest='engines',
+        help='solver to benchmark, may be given more than once, defaults to every solver'
+    )
+
+    parser.add_argument(
+        '--count',
+        action='store',
+        default=1000,
+        help='number of cubes used to measure the cube operations',
+        type=int
+    )
+
+    parser.add_argument(
+        '--solves',
+        action='store',
+        default=20,
+        help='number of cubes each solver solves',
+        type=int
+    )
+
+    parser.add_argument(
+        '--seed',
+        action='store',
+        default=SEED,
+        help='seed used to generate the scrambles',
+        type=int
+    )
+
+    parser.add_argument(
+        '--baseline',
+        action='store',
+        default=BASELINE,
+        help='JSON file of results to compare with',
+        metavar='FILE',
+        type=str
+    )
+
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='store the results as the new baseline instead of comparing with it'
+    )
+
+    parser.add_argument(
+        '--tolerance',
+        action='store',
+        default=TOLERANCE,
+        help='fraction a timed result may be worse than the baseline before the run fails',
+        type=float
+    )
+
+    parser.add_argument(
+        '--count-tolerance',
+        action='store',
+        default=COUNT_TOLERANCE,
+        help='fraction a move count may be worse than the baseline before the run fails',
+        type=float
+    )
+
+    parser.add_argument(
+        '--import-budget',
+        action='store',
+        default=IMPORT_BUDGET,
+        help='milliseconds importing the command line interface may take before the run fails',
+        metavar='MS',
+        type=float
+    )
+
+    arguments = parser.parse_args()
+
+    if arguments.count < 1 or arguments.solves < 1:
+        parser.error('--count and --solves must be at least one')
+
+    parameters = {name: getattr(arguments, name) for name in PARAMETERS}
+    baseline = None
+
+    if not arguments.save_baseline and os.path.exists(arguments.baseline):
+        with open(arguments.baseline, encoding='utf-8') as stored:
+            baseline = json.load(stored)
+
+        differences = [f'--{name} {baseline.get(name)}' for name, value in parameters.items()
+                       if baseline.get(name) != value]
+
+        if differences:
+            parser.error(f"the baseline was recorded with {', '.join(differences)}, run with "
+                         f"the same arguments or use --save-baseline")
+
+    results = run_suite(arguments.engines or sorted(ENGINES), arguments.count, arguments.solves,
+                        arguments.seed)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+        **parameters
+    }
+
+    print(json.dumps(report, indent=4, sort_keys=True))
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w', encoding='utf-8') as stored:
+            json.dump(report, stored, indent=4, sort_keys=True)
+            stored.write('\n')
+
+        return
+
+    found = []
+
+    if results['import.cli']['value'] > arguments.import_budget:
+        found.append(f"import.cli: {results['import.cli']['value']:.6g} ms, budget "
+                     f"{arguments.import_budget:.6g} ms")
+
+    if baseline is not None:
+        found += regressions(results, baseline['results'], arguments.tolerance,
+                             arguments.count_tolerance)
+
+    for regression in found:
+        print(f'Regression: {regression}', file=sys.stderr)
+
+    if found:
+        sys.exit(1)
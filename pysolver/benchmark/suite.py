@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+
+from ..cube.constants import SOLVED
+from ..cube.cube import Cube
+from ..cube.moves import FACE_MOVES, MOVES
+from ..cube.scramble import random_states
+from ..util.algorithm import Algorithm
+
+
+# the seed used to generate the scrambles unless another is given.
+SEED = 0
+
+# the number of moves in each scramble.
+SCRAMBLE_LENGTH = 25
+
+# the units of measurements which are timed, these vary much more between
+# runs than counts of moves.
+TIMED_UNITS = ('ops/s', 'ms', 's')
+
+# the directory holding the pysolver package, so that new interpreters can
+# import it.
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# the rotate functions of the Cube object which are benchmarked.
+_ROTATIONS = ('rotate_l', 'rotate_r', 'rotate_u', 'rotate_d', 'rotate_f', 'rotate_b',
+              'rotate_m', 'rotate_e', 'rotate_s')
+
+
+def scrambles(count, seed=SEED):
+    """Generate random scrambles, the same seed always gives the same
+    scrambles.
+
+    Arguments:
+        count (int): The number of scrambles.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        (list {Algorithm}): The scrambles.
+    """
+    generator = random.Random(seed)
+
+    return [Algorithm.from_moves([generator.randrange(FACE_MOVES) for _ in range(SCRAMBLE_LENGTH)])
+            for _ in range(count)]
+
+
+def scrambled_cubes(count, seed=SEED):
+    """Generate randomly scrambled cubes, see scrambles.
+
+    Arguments:
+        count (int): The number of cubes.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        (list {Cube}): The scrambled cubes.
+    """
+    cubes = []
+
+    for scramble in scrambles(count, seed):
+        cube = Cube(SOLVED)
+        cube.do_algorithm(scramble)
+        cubes.append(cube)
+
+    return cubes
+
+
+def measurement(value, unit, better=None):
+    """Describe the result of a benchmark.
+
+    Arguments:
+        value (float): The measured value.
+        unit (str): The unit of the value e.g. ms.
+        better (str): Whether a higher or lower value is better, or None if
+            the value is informational and isn't checked for regressions.
+
+    Returns:
+        (dict): The measurement.
+    """
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def percentile(samples, fraction):
+    """Get a percentile of some samples using the nearest rank.
+
+    Arguments:
+        samples (list {float}): The samples.
+        fraction (float): The percentile as a fraction e.g. 0.9.
+
+    Returns:
+        (float): The percentile.
+    """
+    samples = sorted(samples)
+
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+
+def throughput(function, items, repeat=5, duration=0.05):
+    """Measure how many times a second a function can be called. The items
+    are passed over as many times as it takes for a run to last long enough
+    to time accurately, and the fastest of several runs is used since slower
+    runs are slowed by other processes.
+
+    Arguments:
+        function (function): The function, called once per item.
+        items (list): The argument of each call.
+        repeat (int): The number of runs.
+        duration (float): The shortest time in seconds a run may take.
+
+    Returns:
+        (dict): The measurement in calls per second.
+    """
+    passes = 1
+    best = None
+
+    while best is None or best < duration:
+        best = _time_passes(function, items, passes)
+
+        if best < duration:
+            passes *= 2
+
+    for _ in range(repeat - 1):
+        best = min(best, _time_passes(function, items, passes))
+
+    return measurement(passes * len(items) / best, 'ops/s', 'higher')
+
+
+def _time_passes(function, items, passes):
+    """Time calling a function on every item a number of times over.
+
+    Arguments:
+        function (function): The function, called once per item.
+        items (list): The argument of each call.
+        passes (int): The number of times to pass over the items.
+
+    Returns:
+        (float): The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+
+    for _ in range(passes):
+        for item in items:
+            function(item)
+
+    return time.perf_counter() - start
+
+
+def benchmark_cube(count, seed=SEED):
+    """Measure the throughput of the Cube object over scrambled cubes.
+
+    Arguments:
+        count (int): The number of cubes.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        (dict): Lookup from the name of each benchmark to its measurement.
+    """
+    cubes = scrambled_cubes(count, seed)
+    strings = [str(cube) for cube in cubes]
+    algorithms = scrambles(count, seed + 1)
+    moves = [move for algorithm in algorithms for move in algorithm.moves]
+
+    def rotate(cube):
+        for name in _ROTATIONS:
+            getattr(cube, name)()
+            getattr(cube, name)(prime=True)
+
+    def push_pop(move):
+        cubes[0].push_move(move)
+        cubes[0].pop_move()
+
+    results = {
+        'cube.parse': throughput(Cube, strings),
+        'cube.str': throughput(str, cubes),
+        'cube.push_pop': throughput(push_pop, moves),
+        'cube.do_algorithm': throughput(lambda item: item[0].do_algorithm(item[1]),
+                                        list(zip(cubes, algorithms))),
+        'algorithm.parse': throughput(Algorithm, [str(algorithm) for algorithm in algorithms])
+    }
+
+    # each call performs every rotation both ways.
+    rotations = throughput(rotate, cubes)
+    rotations['value'] *= len(_ROTATIONS) * 2
+    results['cube.rotate'] = rotations
+
+    results['cube.rotate_move'] = throughput(lambda move: cubes[0].rotate(move), list(MOVES) * 10)
+
+    # each call generates a whole batch of random cubes.
+    generated = throughput(lambda size: random_states(size, seed), [count])
+    generated['value'] *= count
+    results['scramble.random_states'] = generated
+
+    return results
+
+
+def _import_times(module):
+    """Import a module in a new interpreter with -X importtime.
+
+    Arguments:
+        module (str): The name of the module e.g. pysolver.cli.main.
+
+    Returns:
+        (dict): Lookup from the name of every module imported to the
+            microseconds spent importing it, including its own imports.
+    """
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, (_PACKAGE_ROOT,
+                                                              environment.get('PYTHONPATH'))))
+
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, check=True, env=environment, text=True)
+    times = {}
+
+    # each line is "import time: self [us] | cumulative | imported package"
+    # and the header line doesn't hold a number.
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split('|')
+
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def benchmark_import(name, module, repeat=5):
+    """Measure how long importing a module takes when the interpreter starts
+    and how many modules it brings with it, which catches a module imported
+    eagerly that should only be imported when it is used. Starting the
+    interpreter isn't counted and the fastest of several runs is used.
+
+    Arguments:
+        name (str): The name of the module used in the benchmark names.
+        module (str): The module e.g. pysolver.cli.main.
+        repeat (int): The number of runs.
+
+    Returns:
+        (dict): Lookup from the name of each benchmark to its measurement.
+    """
+    runs = [_import_times(module) for _ in range(repeat)]
+
+    return {
+        f'import.{name}': measurement(min(run[module] for run in runs) / 1000, 'ms', 'lower'),
+        f'import.{name}.modules': measurement(len(runs[0]), 'modules', 'lower'),
+        f'import.{name}.numpy': measurement(int('numpy' in runs[0]), 'modules', 'lower')
+    }
+
+
+def benchmark_solver(name, solver, count, seed=SEED):
+    """Measure how long a solver takes to solve scrambled cubes and how many
+    moves its solutions have. Solvers which can solve each stage separately
+    also have the moves of each stage measured.
+
+    Arguments:
+        name (str): The name of the solver used in the benchmark names.
+        solver (object): The solver.
+        count (int): The number of cubes.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        (dict): Lookup from the name of each benchmark to its measurement.
+    """
+    latencies = []
+    lengths = []
+    stages = {}
+    unsolved = 0
+
+    for cube in scrambled_cubes(count, seed):
+        start = time.perf_counter()
+        solution = solver.solve(cube)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        lengths.append(len(solution.moves))
+
+        solved = cube.copy()
+        solved.do_algorithm(solution)
+        unsolved += not solved.is_solved()
+
+        if hasattr(solver, 'solve_stages'):
+            for stage, algorithm in solver.solve_stages(cube):
+                stages.setdefault(stage, []).append(len(algorithm.moves))
+
+    results = {
+        f'solve.{name}.p50': measurement(percentile(latencies, 0.5), 'ms', 'lower'),
+        f'solve.{name}.p90': measurement(percentile(latencies, 0.9), 'ms', 'lower'),
+        f'solve.{name}.p99': measurement(percentile(latencies, 0.99), 'ms', 'lower'),
+        f'solve.{name}.max': measurement(max(latencies), 'ms'),
+        f'solve.{name}.moves': measurement(sum(lengths) / count, 'moves', 'lower'),
+        f'solve.{name}.unsolved': measurement(unsolved, 'cubes', 'lower')
+    }
+
+    for stage, moves in stages.items():
+        results[f'solve.{name}.moves.{stage}'] = measurement(sum(moves) / count, 'moves', 'lower')
+
+    return results
+
+
+def regressions(results, baseline, tolerance, count_tolerance):
+    """Compare benchmark results with a baseline.
+
+    Arguments:
+        results (dict): Lookup from benchmark name to measurement.
+        baseline (dict): The baseline measurements in the same format.
+        tolerance (float): How much worse than the baseline a timed
+            measurement may be as a fraction e.g. 0.5 allows 50% slower.
+        count_tolerance (float): How much worse than the baseline any other
+            measurement may be e.g. the number of moves in a solution.
+
+    Returns:
+        (list {str}): A description of each regression.
+    """
+    found = []
+
+    for name, result in sorted(results.items()):
+        expected = baseline.get(name)
+
+        if expected is None or result['better'] is None:
+            continue
+
+        allowed = tolerance if result['unit'] in TIMED_UNITS else count_tolerance
+
+        if result['better'] == 'higher':
+            limit = expected['value'] / (1 + allowed)
+            regressed = result['value'] < limit
+        else:
+            limit = expected['value'] * (1 + allowed)
+            regressed = result['value'] > limit
+
+        if regressed:
+            found.append(f"{name}: {result['value']:.6g} {result['unit']}, baseline "
+                         f"{expected['value']:.6g} {expected['unit']} (limit {limit:.6g})")
+
+    return found
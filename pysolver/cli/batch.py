@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import multiprocessing
+import threading
+
+
+# the number of cube strings sent to a worker at once.
+CHUNK_SIZE = 64
+
+# how many chunks per worker may be read ahead of the results written.
+_READ_AHEAD = 4
+
+# the solver used by this worker process, created once by initialise_worker.
+_solver = None
+
+# whether this worker process adds the solver statistics to each result.
+_stats = False
+
+
+def read_cube_strings(lines):
+    """Lazily read one cube string per line, blank lines are skipped.
+
+    Arguments:
+        lines (iterable {str}): The lines to read e.g. an open file.
+
+    Yields:
+        (tuple): The line number starting from zero and the cube string.
+    """
+    for index, line in enumerate(lines):
+        line = line.strip()
+
+        if line:
+            yield index, line
+
+
+def initialise_worker(solver, stats=False):
+    """Create the solver for a worker process, this is where the tables are
+    loaded so it only happens once per worker.
+
+    Arguments:
+        solver (function): Creates the solver e.g. CFOPSolver.
+        stats (bool): Add the solver statistics to each result.
+    """
+    global _solver, _stats
+    _solver = solver()
+    _stats = stats
+
+
+def solve_item(item):
+    """Solve a single cube string in a worker process.
+
+    Arguments:
+        item (tuple): The line number and cube string.
+
+    Returns:
+        (dict): The line number, the cube string and either the solution,
+            along with the solver statistics if they were asked for, or an
+            error message.
+    """
+    # imported here so that reading the command line doesn't import numpy.
+    from ..cube.cube import Cube, InvalidCubeString
+
+    index, cube_string = item
+    result = {'index': index, 'cube': cube_string}
+
+    try:
+        result['solution'] = str(_solver.solve(Cube(cube_string)))
+
+        if _stats:
+            result['stats'] = _solver.stats.to_dict()
+    except InvalidCubeString:
+        result['error'] = 'Input cube is not valid'
+
+    return result
+
+
+def _bounded(items, semaphore, stopped):
+    """Only let items through while the semaphore allows it, so that the
+    pool doesn't read the whole input before any results are written.
+
+    Arguments:
+        items (iterable): The items to pass through.
+        semaphore (threading.Semaphore): Released once per result written.
+        stopped (threading.Event): Set when no more results will be read.
+
+    Yields:
+        The items in order.
+    """
+    for item in items:
+        semaphore.acquire()
+
+        if stopped.is_set():
+            return
+
+        yield item
+
+
+def solve_batch(items, solver, processes=None, chunk_size=CHUNK_SIZE, ordered=True, stats=False):
+    """Solve many cubes using a pool of worker processes. Each worker creates
+    its own solver once and is then sent the cube strings in chunks.
+
+    Arguments:
+        items (iterable {tuple}): The line number and cube string of each
+            cube, as produced by read_cube_strings.
+        solver (function): Creates the solver in each worker e.g.
+            CFOPSolver, it must be picklable.
+        processes (int): The number of worker processes, defaults to the
+            number of CPUs.
+        chunk_size (int): The number of cube strings sent to a worker at once.
+        ordered (bool): Yield results in input order rather than in the order
+            they finish.
+        stats (bool): Add the solver statistics to each result.
+
+    Yields:
+        (dict): The result for each cube, see solve_item.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    semaphore = threading.Semaphore(chunk_size * processes * _READ_AHEAD)
+    stopped = threading.Event()
+
+    with multiprocessing.Pool(processes, initializer=initialise_worker,
+                              initargs=(solver, stats)) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+
+        try:
+            for result in imap(solve_item, _bounded(items, semaphore, stopped), chunk_size):
+                semaphore.release()
+                yield result
+        finally:
+            # wake the thread feeding the pool so that the pool can shut down.
+            stopped.set()
+            semaphore.release()
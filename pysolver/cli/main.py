@@ -19,8 +19,88 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import argparse
+import functools
+import importlib
+import json
 
-from ..cube.cube import Cube, InvalidCubeString
+from .batch import CHUNK_SIZE, read_cube_strings, solve_batch
+from ..cube.constants import valid_cube_string
+
+
+# the solvers which can be selected with --engine, by module and class name.
+# They are only imported once one is used, solving a single cube is quick
+# enough that importing every solver would take most of the time.
+ENGINES = {
+    'bidirectional': ('..solver.bidirectional', 'BidirectionalSolver'),
+    'cfop': ('..solver.cfop.solver', 'CFOPSolver'),
+    'twophase': ('..solver.twophase.solver', 'TwoPhaseSolver')
+}
+
+
+def load_engine(engine):
+    """Import the class of a solver.
+
+    Arguments:
+        engine (str): The name of the solver in ENGINES.
+
+    Returns:
+        (type): The solver class e.g. CFOPSolver.
+    """
+    module, name = ENGINES[engine]
+
+    return getattr(importlib.import_module(module, __package__), name)
+
+
+def create_solver(engine, cache=None, solver=None, max_time=None, max_states=None):
+    """Create the solver for the command line options.
+
+    Arguments:
+        engine (str): The name of the solver in ENGINES.
+        cache (str): The path of a solution cache database, or None.
+        solver (object): An already created solver to use instead.
+        max_time (float): Seconds to spend improving each solution with the
+            AnytimeSolver instead of using the engine, or None.
+        max_states (int): The most states the bidirectional search may hold,
+            or None for its default.
+
+    Returns:
+        (object): The solver, answering from the cache first if one is
+            given.
+    """
+    if solver is None and max_time is not None:
+        from ..solver.anytime import AnytimeSolver
+        solver = AnytimeSolver(max_time)
+    elif solver is None and max_states is not None:
+        solver = load_engine(engine)(max_states)
+    elif solver is None:
+        solver = load_engine(engine)()
+
+    if cache is None:
+        return solver
+
+    from ..solver.cache import CachedSolver, SolutionCache
+
+    return CachedSolver(solver, SolutionCache(cache))
+
+
+def _print_solution(solver, cube, stats=False):
+    """Solve a cube and print the solution.
+
+    Arguments:
+        solver (object): The solver.
+        cube (Cube): The cube to solve.
+        stats (bool): Also print the solver statistics.
+    """
+    if hasattr(solver, 'solutions'):
+        # each solution is printed as soon as it is found, the last one is
+        # the shortest.
+        for algorithm in solver.solutions(cube):
+            print(algorithm, flush=True)
+    else:
+        print(solver.solve(cube))
+
+    if stats:
+        print(solver.stats)
 
 
 def run_pysolver():
@@ -34,12 +114,146 @@ def run_pysolver():
         'cube_string',
         action='store',
         help="string representation of the Rubik's cubes current state",
+        nargs='?',
         type=str
     )
 
+    parser.add_argument(
+        '--engine',
+        action='store',
+        choices=sorted(ENGINES),
+        default='cfop',
+        help='solving strategy to use, twophase finds much shorter solutions and bidirectional '
+             'finds the shortest solution of cubes up to about 10 moves from solved, using '
+             'twophase for the rest'
+    )
+
+    parser.add_argument(
+        '--batch',
+        action='store',
+        help='solve one cube string per line of a file, or stdin when the file is -, '
+             'writing one JSON object per line',
+        metavar='FILE',
+        type=argparse.FileType('r')
+    )
+
+    parser.add_argument(
+        '--processes',
+        action='store',
+        help='number of worker processes used by --batch or --parallel, defaults to the number '
+             'of CPUs',
+        type=int
+    )
+
+    parser.add_argument(
+        '--chunk-size',
+        action='store',
+        default=CHUNK_SIZE,
+        help='number of cube strings sent to a worker at once by --batch',
+        type=int
+    )
+
+    parser.add_argument(
+        '--unordered',
+        action='store_true',
+        help='write --batch results as they finish rather than in input order'
+    )
+
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='spread the search for a single cube over worker processes, twophase only'
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store',
+        help='SQLite database of solutions, cubes equivalent to one solved before are answered '
+             'from it',
+        metavar='FILE',
+        type=str
+    )
+
+    parser.add_argument(
+        '--max-time',
+        action='store',
+        help='find a CFOP solution straight away then search for shorter ones for this many '
+             'seconds, printing each one as it is found, instead of using --engine',
+        metavar='SECONDS',
+        type=float
+    )
+
+    parser.add_argument(
+        '--max-states',
+        action='store',
+        help='most states the bidirectional search may hold before using twophase, each takes '
+             'up to 130 bytes, defaults to 256MB worth. 10 million finds solutions of up to 11 '
+             'moves',
+        metavar='STATES',
+        type=int
+    )
+
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='print the time, search nodes, pruning table cut offs, cache hits and depth of each '
+             'stage of the solve, --batch adds them to each result'
+    )
+
     arguments = parser.parse_args()
 
+    if (arguments.batch is None) == (arguments.cube_string is None):
+        parser.error('exactly one of cube_string or --batch is required')
+
+    if arguments.chunk_size < 1 or (arguments.processes is not None and arguments.processes < 1):
+        parser.error('--chunk-size and --processes must be at least one')
+
+    if arguments.parallel and (arguments.batch is not None or arguments.engine != 'twophase'):
+        parser.error('--parallel only works with --engine twophase on a single cube')
+
+    if arguments.max_time is not None and (arguments.max_time <= 0 or arguments.parallel):
+        parser.error('--max-time must be positive and does not work with --parallel')
+
+    if arguments.max_states is not None and (arguments.max_states < 1 or
+                                             arguments.engine != 'bidirectional' or
+                                             arguments.max_time is not None):
+        parser.error('--max-states must be at least one and only works with --engine '
+                     'bidirectional')
+
+    if arguments.batch is not None:
+        results = solve_batch(read_cube_strings(arguments.batch),
+                              functools.partial(create_solver, arguments.engine, arguments.cache,
+                                                max_time=arguments.max_time,
+                                                max_states=arguments.max_states),
+                              processes=arguments.processes, chunk_size=arguments.chunk_size,
+                              ordered=not arguments.unordered, stats=arguments.stats)
+
+        for result in results:
+            print(json.dumps(result), flush=True)
+
+        return
+
+    # a cube string which can't be right is rejected before numpy and the
+    # cube are imported.
+    if not valid_cube_string(''.join(arguments.cube_string.split())):
+        print('Error: Input cube is not valid')
+        return
+
+    from ..cube.cube import Cube, InvalidCubeString
+
     try:
         cube = Cube(arguments.cube_string)
+
+        if arguments.parallel:
+            from ..solver.twophase.parallel import ParallelTwoPhaseSolver
+
+            with ParallelTwoPhaseSolver(arguments.processes) as parallel:
+                _print_solution(create_solver(arguments.engine, arguments.cache, parallel), cube,
+                                arguments.stats)
+        else:
+            _print_solution(create_solver(arguments.engine, arguments.cache,
+                                          max_time=arguments.max_time,
+                                          max_states=arguments.max_states), cube,
+                            arguments.stats)
     except InvalidCubeString:
         print('Error: Input cube is not valid')
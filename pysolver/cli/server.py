@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import json
+import math
+import multiprocessing
+import time
+
+from .batch import initialise_worker, solve_item
+from .main import ENGINES, create_solver
+from ..cube.cube import Cube, InvalidCubeString
+from ..solver.cache import CACHE_SIZE, SolutionCache, cache_key, from_canonical, to_canonical
+from ..util.algorithm import Algorithm
+
+
+# the address the service listens on by default, it is only reachable from
+# this machine.
+HOST = '127.0.0.1'
+PORT = 8765
+
+# the most cube strings sent to a worker at once, and how long to wait for
+# more requests to fill a batch once there is a free worker.
+BATCH_SIZE = 16
+BATCH_DELAY = 0.002
+
+# seconds a request may wait for its solution unless it asks otherwise.
+TIMEOUT = 10.0
+
+# the number of recent latencies the percentiles are worked out from.
+_LATENCIES = 1024
+
+
+def _solve_chunk(items):
+    """Solve a batch of cube strings in a worker process.
+
+    Arguments:
+        items (list {tuple}): The index and cube string of each cube.
+
+    Returns:
+        (list {dict}): The result of each cube, see batch.solve_item.
+    """
+    return [solve_item(item) for item in items]
+
+
+class SolveService():
+    """Solve cubes for many concurrent requests using a persistent pool of
+    worker processes. Requests which arrive together are sent to a worker as
+    one batch, cubes equivalent to one solved before are answered from the
+    cache straight away and equivalent cubes which are already being solved
+    share the solve.
+
+    Arguments:
+        engine (str): The name of the solver in ENGINES.
+        processes (int): The number of worker processes, defaults to the
+            number of CPUs.
+        batch_size (int): The most cube strings sent to a worker at once.
+        batch_delay (float): Seconds to wait for more requests to fill a
+            batch.
+        cache (SolutionCache): The cache, an in memory cache by default.
+    """
+    def __init__(self, engine='cfop', processes=None, batch_size=BATCH_SIZE,
+                 batch_delay=BATCH_DELAY, cache=None):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.cache = SolutionCache(size=CACHE_SIZE) if cache is None else cache
+
+        # the cache may wait on its database for a while, so it is only used
+        # from this thread rather than holding up every other request.
+        self._cache_thread = concurrent.futures.ThreadPoolExecutor(1)
+
+        processes = processes or multiprocessing.cpu_count()
+
+        # the same keys as a CachedSolver of the engine, so that a cache file
+        # can be shared with the command line.
+        self._name = ENGINES[engine][1]
+        # workers are started as they are needed, a forked worker would keep
+        # the connections open at the time open after they are closed.
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            processes, multiprocessing.get_context('spawn'), initializer=initialise_worker,
+            initargs=(functools.partial(create_solver, engine),))
+
+        # a batch is only gathered once a worker is free to take it, so that
+        # requests wait in the queue rather than in the pool.
+        self._workers = asyncio.Semaphore(processes)
+        self._queue = asyncio.Queue()
+        self._batcher = None
+
+        # lookup from the key of each cube being solved to its solution, and
+        # to the latest deadline of the requests waiting for it.
+        self._pending = {}
+        self._deadlines = {}
+
+        self._requests = 0
+        self._cache_hits = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._batches = 0
+        self._batched = 0
+        self._in_flight = 0
+        self._latencies = collections.deque(maxlen=_LATENCIES)
+
+    async def start(self):
+        """Start sending batches to the workers."""
+        self._batcher = asyncio.ensure_future(self._send_batches())
+
+    async def close(self):
+        """Stop sending batches and shut down the workers."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+
+        self._pool.shutdown(cancel_futures=True)
+
+        await asyncio.get_running_loop().run_in_executor(self._cache_thread, self.cache.close)
+        self._cache_thread.shutdown()
+
+    async def solve(self, cube_string, timeout=TIMEOUT):
+        """Solve a cube.
+
+        Arguments:
+            cube_string (str): The string representation of the cube.
+            timeout (float): Seconds to wait for the solution.
+
+        Returns:
+            (dict): The cube string, whether it was answered from the cache,
+                how long it took and either the solution or an error.
+        """
+        start = time.perf_counter()
+        result = {'cube': cube_string, 'cached': False}
+
+        self._requests += 1
+
+        try:
+            key, symmetry = cache_key(self._name, Cube(cube_string))
+        except InvalidCubeString:
+            self._errors += 1
+            result['error'] = 'Input cube is not valid'
+            return result
+
+        loop = asyncio.get_running_loop()
+        solution = await loop.run_in_executor(self._cache_thread, self.cache.get, key)
+
+        if solution is not None:
+            self._cache_hits += 1
+            result['cached'] = True
+        else:
+            if key not in self._pending:
+                self._pending[key] = loop.create_future()
+                self._deadlines[key] = 0.0
+                self._queue.put_nowait((key, cube_string, symmetry))
+
+            self._deadlines[key] = max(self._deadlines[key], loop.time() + timeout)
+
+            try:
+                # another request may be waiting for the same solution.
+                solution = await asyncio.wait_for(asyncio.shield(self._pending[key]), timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                result['error'] = 'Timed out'
+                return result
+            except InvalidCubeString:
+                self._errors += 1
+                result['error'] = 'Input cube is not valid'
+                return result
+            except Exception:
+                self._errors += 1
+                result['error'] = 'Solver failed'
+                return result
+
+        result['solution'] = str(from_canonical(solution, symmetry))
+        result['seconds'] = time.perf_counter() - start
+
+        self._latencies.append(result['seconds'])
+
+        return result
+
+    def metrics(self):
+        """Get the current state of the service.
+
+        Returns:
+            (dict): The number of requests waiting to be batched, being
+                solved and served, the number answered from the cache, timed
+                out or failed, the mean batch size and recent latency
+                percentiles in milliseconds.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            return latencies[int(fraction * (len(latencies) - 1))] * 1000 if latencies else 0.0
+
+        return {
+            'queue_depth': self._queue.qsize(),
+            'pending': len(self._pending),
+            'in_flight': self._in_flight,
+            'requests': self._requests,
+            'cache_hits': self._cache_hits,
+            'timeouts': self._timeouts,
+            'errors': self._errors,
+            'batches': self._batches,
+            'mean_batch_size': self._batched / self._batches if self._batches else 0.0,
+            'latency_ms': {'p50': percentile(0.5), 'p90': percentile(0.9),
+                           'p99': percentile(0.99)}
+        }
+
+    async def _send_batches(self):
+        """Gather queued cubes into batches and send each to a free worker."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self._workers.acquire()
+
+            batch = [await self._next_request(None)]
+            deadline = loop.time() + self.batch_delay
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(await self._next_request(deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+
+            asyncio.ensure_future(self._solve_batch(batch))
+
+    async def _next_request(self, timeout):
+        """Take the next cube off the queue, cubes which every request has
+        stopped waiting for are dropped so that they aren't solved. A request
+        still waiting for a dropped cube is told it timed out.
+
+        Arguments:
+            timeout (float): Seconds to wait for a cube, or None to wait for
+                as long as it takes.
+
+        Returns:
+            (tuple): The key, cube string and symmetry of the cube.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            request = await asyncio.wait_for(self._queue.get(), remaining)
+
+            if self._deadlines[request[0]] > loop.time():
+                return request
+
+            future = self._pending.pop(request[0])
+            del self._deadlines[request[0]]
+
+            future.set_exception(asyncio.TimeoutError())
+            future.exception()
+
+    async def _solve_batch(self, batch):
+        """Solve a batch of cubes in a worker, handing each solution to the
+        requests waiting for it and then storing it in the cache.
+
+        Arguments:
+            batch (list {tuple}): The key, cube string and symmetry of each
+                cube.
+        """
+        self._batches += 1
+        self._batched += len(batch)
+        self._in_flight += len(batch)
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(
+                self._pool, _solve_chunk, [(index, item[1]) for index, item in enumerate(batch)])
+        except asyncio.CancelledError:
+            # the workers are cancelled when the service is closed, the
+            # requests waiting for them are still answered.
+            results = [RuntimeError('The service was closed')] * len(batch)
+        except Exception as error:
+            results = [error] * len(batch)
+        finally:
+            self._in_flight -= len(batch)
+            self._workers.release()
+
+        writes = []
+
+        for (key, _, symmetry), result in zip(batch, results):
+            future = self._pending.pop(key)
+            del self._deadlines[key]
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            elif 'error' in result:
+                future.set_exception(InvalidCubeString())
+            else:
+                # the cache holds the solution of the canonical cube.
+                solution = to_canonical(Algorithm(result['solution']), symmetry)
+                future.set_result(solution)
+
+                # the cache thread looks up later requests after this.
+                writes.append(loop.run_in_executor(self._cache_thread, self.cache.put, key,
+                                                   solution))
+
+            # every request waiting for the solution may have timed out, so
+            # mark any error as seen.
+            future.exception()
+
+        # a solution which couldn't be stored is solved again next time.
+        await asyncio.gather(*writes, return_exceptions=True)
+
+
+def _valid_timeout(timeout):
+    """Check the timeout of a request.
+
+    Arguments:
+        timeout (object): The timeout given in the request.
+
+    Returns:
+        (bool): Whether the timeout is a finite number of seconds greater
+            than zero.
+    """
+    return (isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and
+            math.isfinite(timeout) and timeout > 0)
+
+
+async def _response(service, request):
+    """Work out the response to a request.
+
+    Arguments:
+        service (SolveService): The service.
+        request (dict): The request, see _respond.
+
+    Returns:
+        (dict): The response.
+    """
+    if request.get('metrics'):
+        return {'metrics': service.metrics()}
+
+    timeout = request.get('timeout', TIMEOUT)
+
+    if not isinstance(request.get('cube'), str) or not _valid_timeout(timeout):
+        return {'error': 'Request is not valid'}
+
+    return await service.solve(request['cube'], timeout)
+
+
+async def _respond(service, line, writer):
+    """Answer a single request line and write the response line.
+
+    Arguments:
+        service (SolveService): The service.
+        line (bytes): The request, either a cube string or a JSON object
+            with the cube string, an optional id and an optional timeout, or
+            a JSON object asking for the metrics.
+        writer (asyncio.StreamWriter): The connection.
+    """
+    text = line.decode('utf-8', 'replace').strip()
+
+    try:
+        request = json.loads(text) if text.startswith('{') else {'cube': text}
+    except json.JSONDecodeError:
+        request = {}
+
+    try:
+        response = await _response(service, request)
+    except Exception:
+        # every request gets an answer, however it fails.
+        response = {'error': 'Request failed'}
+
+    if 'id' in request:
+        response['id'] = request['id']
+
+    writer.write(json.dumps(response).encode('utf-8') + b'\n')
+    await writer.drain()
+
+
+async def _handle(service, reader, writer):
+    """Answer every request on a connection, responses are written as soon
+    as they are ready so they may be out of order.
+
+    Arguments:
+        service (SolveService): The service.
+        reader (asyncio.StreamReader): The requests.
+        writer (asyncio.StreamWriter): The connection.
+    """
+    tasks = set()
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            if line.strip():
+                task = asyncio.ensure_future(_respond(service, line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            # a connection which fails part way through mustn't stop the
+            # responses still being worked out from being written.
+            await asyncio.gather(*tasks, return_exceptions=True)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host=HOST, port=PORT):
+    """Serve requests until cancelled. Each request is one line, either a
+    cube string or a JSON object, and is answered with one line of JSON.
+
+    Arguments:
+        service (SolveService): The service.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+    await service.start()
+
+    server = await asyncio.start_server(functools.partial(_handle, service), host, port)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def run_server():
+    """Run the command line interface for the solve service."""
+    parser = argparse.ArgumentParser(
+        description="Serve Rubik's cube solutions over a line based JSON protocol.",
+        prog='pysolver.cli.server'
+    )
+
+    parser.add_argument(
+        '--engine',
+        action='store',
+        choices=sorted(ENGINES),
+        default='cfop',
+        help='solving strategy to use, twophase finds much shorter solutions'
+    )
+
+    parser.add_argument(
+        '--host',
+        action='store',
+        default=HOST,
+        help='address to listen on',
+        type=str
+    )
+
+    parser.add_argument(
+        '--port',
+        action='store',
+        default=PORT,
+        help='port to listen on',
+        type=int
+    )
+
+    parser.add_argument(
+        '--processes',
+        action='store',
+        help='number of worker processes, defaults to the number of CPUs',
+        type=int
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        action='store',
+        default=BATCH_SIZE,
+        help='most cube strings sent to a worker at once',
+        type=int
+    )
+
+    parser.add_argument(
+        '--batch-delay',
+        action='store',
+        default=BATCH_DELAY,
+        help='seconds to wait for more requests to fill a batch',
+        type=float
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store',
+        help='SQLite database of solutions, cubes equivalent to one solved before are answered '
+             'from it',
+        metavar='FILE',
+        type=str
+    )
+
+    arguments = parser.parse_args()
+
+    if arguments.batch_size < 1 or (arguments.processes is not None and arguments.processes < 1):
+        parser.error('--batch-size and --processes must be at least one')
+
+    service = SolveService(arguments.engine, arguments.processes, arguments.batch_size,
+                           arguments.batch_delay, SolutionCache(arguments.cache))
+
+    try:
+        asyncio.run(serve(service, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    run_server()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import string
+
+import numpy as np
+
+from .cube import Cube, InvalidCubeString
+from .cubie import solvable
+from .moves import MOVES, PERMUTATIONS
+
+
+# the colors which make up a valid cube string.
+_COLORS = 'RGBOWY'
+
+# translation table which removes whitespace from cube strings.
+_WHITESPACE = str.maketrans('', '', string.whitespace)
+
+# the whitespace removed from buffers of cube strings.
+_WHITESPACE_BYTES = string.whitespace.encode('ascii')
+
+
+def parse_cube_strings(data):
+    """Turn a buffer holding many cube strings into an array of cube states
+    in one go, any whitespace such as the newlines between cube strings is
+    ignored. The cubes aren't checked, see CubeBatch.from_buffer.
+
+    Arguments:
+        data (bytes|str): The cube strings one after another.
+
+    Returns:
+        (np.ndarray): An (N, 54) array of sticker colors.
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii')
+
+    data = bytes(data).translate(None, _WHITESPACE_BYTES)
+
+    if len(data) % 54:
+        raise InvalidCubeString
+
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 54).copy()
+
+
+def format_cube_strings(states):
+    """Turn an array of cube states into a buffer of cube strings, one per
+    line.
+
+    Arguments:
+        states (np.ndarray): An (N, 54) array of sticker colors.
+
+    Returns:
+        (bytes): The cube strings each followed by a newline.
+    """
+    lines = np.empty((len(states), 55), dtype=np.uint8)
+    lines[:, :54] = states
+    lines[:, 54] = ord('\n')
+
+    return lines.tobytes()
+
+
+class CubeBatch():
+    """Many Rubik's cubes stored together so that moves and algorithms can be
+    applied to all of them at once. Each row of the state array holds one
+    cube using the same sticker layout as the Cube object.
+
+    Arguments:
+        cube_strings (iterable {str}): String representations of the cubes.
+
+    Attributes:
+        _states (np.ndarray): An (N, 54) array of sticker colors.
+    """
+    def __init__(self, cube_strings):
+        cube_strings = [cs.translate(_WHITESPACE) for cs in cube_strings]
+
+        if any(len(cs) != 54 for cs in cube_strings):
+            raise InvalidCubeString
+
+        states = np.frombuffer(''.join(cube_strings).encode('ascii'), dtype=np.uint8)
+        self._states = states.reshape(len(cube_strings), 54).copy()
+        self._check()
+
+    def _check(self):
+        """Make sure that every cube in the batch is a valid Rubik's cube.
+
+        Raises:
+            InvalidCubeString: If any of the cubes isn't valid.
+        """
+        # verify every cube has 9 of each color.
+        counts = np.stack([np.count_nonzero(self._states == ord(color), axis=1)
+                           for color in _COLORS], axis=1)
+
+        if not np.all(counts == 9) or not np.all(solvable(self._states)):
+            raise InvalidCubeString
+
+    @classmethod
+    def from_buffer(cls, data):
+        """Create a batch from a buffer holding many cube strings e.g. the
+        contents of a file with one cube string per line, without handling
+        each cube string separately.
+
+        Arguments:
+            data (bytes|str): The cube strings one after another.
+
+        Returns:
+            (CubeBatch): A batch holding each cube.
+        """
+        batch = cls.__new__(cls)
+        batch._states = parse_cube_strings(data)
+        batch._check()
+
+        return batch
+
+    @classmethod
+    def from_cubes(cls, cubes):
+        """Create a batch from existing Cube objects.
+
+        Arguments:
+            cubes (iterable {Cube}): The cubes to copy into the batch.
+
+        Returns:
+            (CubeBatch): A batch holding the state of each cube.
+        """
+        return cls(str(cube) for cube in cubes)
+
+    @property
+    def states(self):
+        """Get the sticker colors of every cube in the batch.
+
+        Returns:
+            (np.ndarray): An (N, 54) read only view of the cube states.
+        """
+        states = self._states.view()
+        states.flags.writeable = False
+
+        return states
+
+    def rotate(self, move):
+        """Perform a single move on every cube in the batch.
+
+        Arguments:
+            move (str): The move to perform using the standard notation.
+        """
+        self._states = self._states[:, PERMUTATIONS[MOVES[move]]]
+
+    def do_algorithm(self, algorithm):
+        """Perform all of the steps of an algorithm on every cube in the
+        batch.
+
+        Arguments:
+            algorithm (Algorithm): The algorithm to perform.
+        """
+        self._states = self._states[:, algorithm.permutation]
+
+    def to_strings(self):
+        """Get the string representation of every cube in the batch.
+
+        Returns:
+            (list {str}): A cube string for each cube in the batch.
+        """
+        data = self._states.tobytes().decode('ascii')
+
+        return [data[index:index + 54] for index in range(0, len(data), 54)]
+
+    def to_buffer(self):
+        """Get the string representation of every cube in the batch as a
+        single buffer, see format_cube_strings.
+
+        Returns:
+            (bytes): The cube strings each followed by a newline.
+        """
+        return format_cube_strings(self._states)
+
+    def to_cubes(self):
+        """Get a Cube object for every cube in the batch.
+
+        Returns:
+            (list {Cube}): A copy of each cube in the batch.
+        """
+        return [Cube._from_state(state) for state in self._states.copy()]
+
+    def __getitem__(self, index):
+        """Get a copy of a single cube from the batch.
+
+        Arguments:
+            index (int): The position of the cube in the batch.
+
+        Returns:
+            (Cube): A copy of the cube.
+        """
+        return Cube._from_state(self._states[index].copy())
+
+    def __len__(self):
+        """Get the number of cubes in the batch.
+
+        Returns:
+            (int): The number of cubes.
+        """
+        return len(self._states)
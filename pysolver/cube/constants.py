@@ -18,21 +18,22 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import numpy as np
-
+# the vectors and matrices are plain tuples so that the cube strings can be
+# checked without importing numpy, see valid_cube_string. Wrap them in
+# np.array to do arithmetic with them.
 
 # axis vectors
-X_AXIS = np.array([1, 0, 0])
-Y_AXIS = np.array([0, 1, 0])
-Z_AXIS = np.array([0, 0, 1])
+X_AXIS = (1, 0, 0)
+Y_AXIS = (0, 1, 0)
+Z_AXIS = (0, 0, 1)
 
 # cube face vectors
-UP = np.array([0, 1, 0])
-DOWN = np.array([0, -1, 0])
-RIGHT = np.array([1, 0, 0])
-LEFT = np.array([-1, 0, 0])
-FRONT = np.array([0, 0, 1])
-BACK = np.array([0, 0, -1])
+UP = (0, 1, 0)
+DOWN = (0, -1, 0)
+RIGHT = (1, 0, 0)
+LEFT = (-1, 0, 0)
+FRONT = (0, 0, 1)
+BACK = (0, 0, -1)
 
 # piece types
 FACE = 0
@@ -40,38 +41,92 @@ EDGE = 1
 CORNER = 2
 
 # rotation matrices
-ROT_YZ = np.array([
-    [1, 0, 0],
-    [0, 0, 1],
-    [0, -1, 0]
-])
-
-ROT_YZ_PRIME = np.array([
-    [1, 0, 0],
-    [0, 0, -1],
-    [0, 1, 0]
-])
-
-ROT_XZ = np.array([
-    [0, 0, -1],
-    [0, 1, 0],
-    [1, 0, 0]
-])
-
-ROT_XZ_PRIME = np.array([
-    [0, 0, 1],
-    [0, 1, 0],
-    [-1, 0, 0]
-])
-
-ROT_XY = np.array([
-    [0, 1, 0],
-    [-1, 0, 0],
-    [0, 0, 1]
-])
-
-ROT_XY_PRIME = np.array([
-    [0, -1, 0],
-    [1, 0, 0],
-    [0, 0, 1]
-])
+ROT_YZ = (
+    (1, 0, 0),
+    (0, 0, 1),
+    (0, -1, 0)
+)
+
+ROT_YZ_PRIME = (
+    (1, 0, 0),
+    (0, 0, -1),
+    (0, 1, 0)
+)
+
+ROT_XZ = (
+    (0, 0, -1),
+    (0, 1, 0),
+    (1, 0, 0)
+)
+
+ROT_XZ_PRIME = (
+    (0, 0, 1),
+    (0, 1, 0),
+    (-1, 0, 0)
+)
+
+ROT_XY = (
+    (0, 1, 0),
+    (-1, 0, 0),
+    (0, 0, 1)
+)
+
+ROT_XY_PRIME = (
+    (0, -1, 0),
+    (1, 0, 0),
+    (0, 0, 1)
+)
+
+# cube string for a solved cube.
+SOLVED = 'BBBBBBBBB' + 'OOOWWWRRRYYY' * 3 + 'GGGGGGGGG'
+
+# sticker layout of the cube string, each entry is the position of the piece
+# which owns the sticker followed by the direction that the sticker faces.
+FACELETS = (
+    ((-1, -1, -1), (0, 0, -1)), ((0, -1, -1), (0, 0, -1)),
+    ((1, -1, -1), (0, 0, -1)), ((-1, 0, -1), (0, 0, -1)),
+    ((0, 0, -1), (0, 0, -1)), ((1, 0, -1), (0, 0, -1)),
+    ((-1, 1, -1), (0, 0, -1)), ((0, 1, -1), (0, 0, -1)),
+    ((1, 1, -1), (0, 0, -1)), ((-1, -1, -1), (-1, 0, 0)),
+    ((-1, 0, -1), (-1, 0, 0)), ((-1, 1, -1), (-1, 0, 0)),
+    ((-1, 1, -1), (0, 1, 0)), ((0, 1, -1), (0, 1, 0)),
+    ((1, 1, -1), (0, 1, 0)), ((1, 1, -1), (1, 0, 0)),
+    ((1, 0, -1), (1, 0, 0)), ((1, -1, -1), (1, 0, 0)),
+    ((1, -1, -1), (0, -1, 0)), ((0, -1, -1), (0, -1, 0)),
+    ((-1, -1, -1), (0, -1, 0)), ((-1, -1, 0), (-1, 0, 0)),
+    ((-1, 0, 0), (-1, 0, 0)), ((-1, 1, 0), (-1, 0, 0)),
+    ((-1, 1, 0), (0, 1, 0)), ((0, 1, 0), (0, 1, 0)),
+    ((1, 1, 0), (0, 1, 0)), ((1, 1, 0), (1, 0, 0)),
+    ((1, 0, 0), (1, 0, 0)), ((1, -1, 0), (1, 0, 0)),
+    ((1, -1, 0), (0, -1, 0)), ((0, -1, 0), (0, -1, 0)),
+    ((-1, -1, 0), (0, -1, 0)), ((-1, -1, 1), (-1, 0, 0)),
+    ((-1, 0, 1), (-1, 0, 0)), ((-1, 1, 1), (-1, 0, 0)),
+    ((-1, 1, 1), (0, 1, 0)), ((0, 1, 1), (0, 1, 0)),
+    ((1, 1, 1), (0, 1, 0)), ((1, 1, 1), (1, 0, 0)),
+    ((1, 0, 1), (1, 0, 0)), ((1, -1, 1), (1, 0, 0)),
+    ((1, -1, 1), (0, -1, 0)), ((0, -1, 1), (0, -1, 0)),
+    ((-1, -1, 1), (0, -1, 0)), ((-1, 1, 1), (0, 0, 1)),
+    ((0, 1, 1), (0, 0, 1)), ((1, 1, 1), (0, 0, 1)),
+    ((-1, 0, 1), (0, 0, 1)), ((0, 0, 1), (0, 0, 1)),
+    ((1, 0, 1), (0, 0, 1)), ((-1, -1, 1), (0, 0, 1)),
+    ((0, -1, 1), (0, 0, 1)), ((1, -1, 1), (0, 0, 1))
+)
+
+
+def valid_cube_string(cube_string):
+    """Naive verification to see if the cube string can produce a Cube
+    object, see Cube.valid_cube_string.
+
+    Arguments:
+        cube_string (str): The string representation of the cubes colors.
+
+    Returns:
+        (bool): True if the cube string is valid.
+    """
+    # verify we have enough sticker colors.
+    if len(cube_string) != len(SOLVED):
+        return False
+
+    # verify we have 9 of each color, with 54 stickers this also rules out
+    # any other letters.
+    return all(cube_string.count(color) == 9 for color in 'RGBOWY')
@@ -20,11 +20,17 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import string
 
-from .constants import (X_AXIS, Y_AXIS, Z_AXIS, UP, DOWN, RIGHT, LEFT, FRONT,
-                        BACK, ROT_YZ, ROT_YZ_PRIME, ROT_XZ, ROT_XZ_PRIME,
-                        ROT_XY, ROT_XY_PRIME)
+import numpy as np
+
+from .constants import FACELETS, valid_cube_string
+from .cubie import is_solvable, is_solved, pack_state, unpack_state
+from .moves import INVERSE, MOVES, PERMUTATIONS, POSITIONS, LAYER_STICKERS
 from .piece import Piece
+from ..util.algorithm import Algorithm
+
 
+# translation table which removes whitespace from cube strings.
+_WHITESPACE = str.maketrans('', '', string.whitespace)
 
 class InvalidCubeString(Exception):
     """This exception is raised when the given cube string does not
@@ -70,54 +76,92 @@ class Cube():
     """
     def __init__(self, cs):
         # remove any whitespace from the cube string.
-        cs = [char for char in cs if char not in string.whitespace]
+        cs = cs.translate(_WHITESPACE)
 
         # check too see if we can make a cube from the given cube string.
         if not self.valid_cube_string(cs):
             raise InvalidCubeString
 
-        self._faces = set()
-        self._edges = set()
-        self._corners = set()
-
-        # create the face pieces from colors in the cube string.
-        self._faces.add(Piece(BACK, [None, None, cs[4]]))
-        self._faces.add(Piece(LEFT, [cs[22], None, None]))
-        self._faces.add(Piece(UP, [None, cs[25], None]))
-        self._faces.add(Piece(RIGHT, [cs[28], None, None]))
-        self._faces.add(Piece(DOWN, [None, cs[31], None]))
-        self._faces.add(Piece(FRONT, [None, None, cs[49]]))
-
-        # create the edge pieces from colors in the cube string.
-        self._edges.add(Piece(FRONT + UP, [None, cs[37], cs[46]]))
-        self._edges.add(Piece(BACK + UP, [None, cs[13], cs[7]]))
-        self._edges.add(Piece(LEFT + UP, [cs[23], cs[24], None]))
-        self._edges.add(Piece(RIGHT + UP, [cs[27], cs[26], None]))
-        self._edges.add(Piece(BACK + LEFT, [cs[10], None, cs[3]]))
-        self._edges.add(Piece(BACK + RIGHT, [cs[16], None, cs[5]]))
-        self._edges.add(Piece(LEFT + FRONT, [cs[34], None, cs[48]]))
-        self._edges.add(Piece(RIGHT + FRONT, [cs[40], None, cs[50]]))
-        self._edges.add(Piece(FRONT + DOWN, [None, cs[43], cs[52]]))
-        self._edges.add(Piece(BACK + DOWN, [None, cs[19], cs[1]]))
-        self._edges.add(Piece(LEFT + DOWN, [cs[21], cs[32], None]))
-        self._edges.add(Piece(RIGHT + DOWN, [cs[29], cs[30], None]))
-
-        # create the corner pieces from colors in the cube string.
-        self._corners.add(Piece(UP + LEFT + FRONT, [cs[35], cs[36], cs[45]]))
-        self._corners.add(Piece(UP + RIGHT + FRONT, [cs[39], cs[38], cs[47]]))
-        self._corners.add(Piece(UP + LEFT + BACK, [cs[11], cs[12], cs[6]]))
-        self._corners.add(Piece(UP + RIGHT + BACK, [cs[15], cs[14], cs[8]]))
-        self._corners.add(Piece(DOWN + LEFT + FRONT, [cs[33], cs[44], cs[51]]))
-        self._corners.add(Piece(DOWN + RIGHT + FRONT, [cs[41], cs[42], cs[53]]))
-        self._corners.add(Piece(DOWN + LEFT + BACK, [cs[9], cs[20], cs[0]]))
-        self._corners.add(Piece(DOWN + RIGHT + BACK, [cs[17], cs[18], cs[2]]))
-
-        self._pieces = self._faces | self._edges | self._corners
+        # the cube is stored as one byte per sticker in the same order as the
+        # cube string, so a rotation is a single gather over 54 bytes.
+        self._state = np.frombuffer(cs.encode('ascii'), dtype=np.uint8).copy()
+
+        # the buffer moves are gathered into by push_move and pop_move, and
+        # the moves they can undo; both are created by the first push_move so
+        # that cubes which are never searched only allocate their stickers.
+        self._scratch = None
+        self._history = None
 
         # check too see if the cube string produced an accurate Rubik's cube.
         if not self._valid():
             raise InvalidCubeString
 
+    @classmethod
+    def _from_state(cls, state):
+        """Create a cube from sticker colors which are already known to be
+        valid e.g. a row of a CubeBatch, skipping the parsing and checks.
+
+        Arguments:
+            state (np.array): The 54 sticker colors, owned by the new cube.
+
+        Returns:
+            (Cube): The cube.
+        """
+        cube = cls.__new__(cls)
+        cube._state = state
+        cube._scratch = None
+        cube._history = None
+
+        return cube
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Create a cube from its packed representation.
+
+        Arguments:
+            data (bytes): The cube packed by to_bytes.
+
+        Returns:
+            (Cube): The cube.
+        """
+        state = unpack_state(bytes(data))
+
+        if state is None or not is_solvable(state):
+            raise InvalidCubeString
+
+        return cls._from_state(state)
+
+    def to_bytes(self):
+        """Pack the cube into 26 bytes; the center colors followed by the
+        corner and edge in each slot along with its twist or flip.
+
+        Returns:
+            (bytes): The packed cube.
+        """
+        return pack_state(self._state)
+
+    def copy(self):
+        """Get an independent copy of the cube, the moves which pop_move
+        could undo aren't copied.
+
+        Returns:
+            (Cube): The copy.
+        """
+        return self._from_state(self._state.copy())
+
+    @property
+    def state(self):
+        """Get the sticker colors of the cube in the same order as the cube
+        string.
+
+        Returns:
+            (np.array): A read only view of the 54 sticker colors.
+        """
+        state = self._state.view()
+        state.flags.writeable = False
+
+        return state
+
     def do_algorithm(self, algorithm):
         """Perform all of the steps of an algorithm.
 
@@ -126,6 +170,43 @@ class Cube():
         """
         assert isinstance(algorithm, Algorithm)
 
+        self._state = self._state[algorithm.permutation]
+
+    def push_move(self, move):
+        """Perform a move in place and remember it so that pop_move can undo
+        it. Nothing is allocated, which is what the inner loop of a search
+        needs, once the first call has created the buffers.
+
+        Arguments:
+            move (int): The move id e.g. MOVES['R'].
+        """
+        if self._scratch is None:
+            self._scratch = np.empty_like(self._state)
+            self._history = []
+
+        # wrap mode lets take write straight into the output buffer rather
+        # than bounds checking into a temporary.
+        self._state.take(PERMUTATIONS[move], out=self._scratch, mode='wrap')
+        self._state[...] = self._scratch
+        self._history.append(move)
+
+    def pop_move(self):
+        """Undo the last move performed by push_move by performing its
+        inverse in place.
+
+        Returns:
+            (int): The move id which was undone.
+        """
+        if not self._history:
+            raise IndexError('pop_move without a matching push_move')
+
+        move = self._history.pop()
+
+        self._state.take(PERMUTATIONS[INVERSE[move]], out=self._scratch, mode='wrap')
+        self._state[...] = self._scratch
+
+        return move
+
     def rotate_l(self, prime=False):
         """Rotate the left face of the cube 90 degrees.
 
@@ -133,9 +214,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. l'
         """
         if prime:
-            self._rotate_face(LEFT, ROT_YZ)
+            self._state = self._state[PERMUTATIONS[MOVES["L'"]]]
         else:
-            self._rotate_face(LEFT, ROT_YZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES['L']]]
 
     def rotate_r(self, prime=False):
         """Rotate the right face of the cube 90 degrees.
@@ -144,9 +225,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. r'
         """
         if prime:
-            self._rotate_face(RIGHT, ROT_YZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES["R'"]]]
         else:
-            self._rotate_face(RIGHT, ROT_YZ)
+            self._state = self._state[PERMUTATIONS[MOVES['R']]]
 
     def rotate_u(self, prime=False):
         """Rotate the upper face of the cube 90 degrees.
@@ -155,9 +236,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. u'
         """
         if prime:
-            self._rotate_face(UP, ROT_XZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES["U'"]]]
         else:
-            self._rotate_face(UP, ROT_XZ)
+            self._state = self._state[PERMUTATIONS[MOVES['U']]]
 
     def rotate_d(self, prime=False):
         """Rotate the bottom/down face of the cube 90 degrees.
@@ -166,9 +247,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. d'
         """
         if prime:
-            self._rotate_face(DOWN, ROT_XZ)
+            self._state = self._state[PERMUTATIONS[MOVES["D'"]]]
         else:
-            self._rotate_face(DOWN, ROT_XZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES['D']]]
 
     def rotate_f(self, prime=False):
         """Rotate the front face of the cube 90 degrees.
@@ -177,9 +258,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. f'
         """
         if prime:
-            self._rotate_face(FRONT, ROT_XY_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES["F'"]]]
         else:
-            self._rotate_face(FRONT, ROT_XY)
+            self._state = self._state[PERMUTATIONS[MOVES['F']]]
 
     def rotate_b(self, prime=False):
         """Rotate the back face of the cube 90 degrees.
@@ -188,9 +269,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. b'
         """
         if prime:
-            self._rotate_face(BACK, ROT_XY)
+            self._state = self._state[PERMUTATIONS[MOVES["B'"]]]
         else:
-            self._rotate_face(BACK, ROT_XY_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES['B']]]
 
     def rotate_m(self, prime=False):
         """Rotate the m slice 90 degrees.
@@ -199,9 +280,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. m'
         """
         if prime:
-            self._rotate_slice(Y_AXIS + Z_AXIS, ROT_YZ)
+            self._state = self._state[PERMUTATIONS[MOVES["M'"]]]
         else:
-            self._rotate_slice(Y_AXIS + Z_AXIS, ROT_YZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES['M']]]
 
     def rotate_e(self, prime=False):
         """Rotate the e slice 90 degrees.
@@ -210,9 +291,9 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. e'
         """
         if prime:
-            self._rotate_slice(X_AXIS + Z_AXIS, ROT_XZ)
+            self._state = self._state[PERMUTATIONS[MOVES["E'"]]]
         else:
-            self._rotate_slice(X_AXIS + Z_AXIS, ROT_XZ_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES['E']]]
 
     def rotate_s(self, prime=False):
         """Rotate the s slice 90 degrees.
@@ -221,78 +302,72 @@ class Cube():
             prime (bool): True if rotating the opposite way. e.g. s'
         """
         if prime:
-            self._rotate_slice(X_AXIS + Y_AXIS, ROT_XY_PRIME)
+            self._state = self._state[PERMUTATIONS[MOVES["S'"]]]
         else:
-            self._rotate_slice(X_AXIS + Y_AXIS, ROT_XY)
+            self._state = self._state[PERMUTATIONS[MOVES['S']]]
 
-    def _rotate_face(self, face, matrix):
-        """Rotate a specific face using a rotation matrix.
+    def rotate(self, move):
+        """Perform a single move using the standard notation, this includes
+        half turns which the rotate functions don't cover.
 
         Arguments:
-            face (np.array): One of the constants FRONT, BACK, LEFT, RIGHT,
-                UP, DOWN.
-            matrix (np.ndarray): The rotation which will be applied to each
-                piece.
+            move (str): The move to perform. e.g. R2
         """
-        for piece in self._face(face):
-            piece.rotate(matrix)
+        self._state = self._state[PERMUTATIONS[MOVES[move]]]
 
-    def _rotate_slice(self, plane, matrix):
-        """Rotate a specific slice using a rotation matrix.
+    def _face(self, face):
+        """Get the indices of all the stickers on one face of the cube.
 
         Arguments:
-            plane (np.array): The plane of rotation. Will be a comination of
-                two constants. e.g. X_AXIS + Y_AXIS
-            matrix (np.ndarray): The rotation which will be applied to each
-                piece.
+            face (tuple {int}): One of the constants FRONT, BACK, LEFT,
+                RIGHT, UP, DOWN.
         """
-        for piece in self._slice(plane):
-            piece.rotate(matrix)
+        return LAYER_STICKERS[tuple(face)]
 
-    def _face(self, face):
-        """Get all the pieces on one face of the cube.
+    def _slice(self, plane):
+        """Get the indices of all the stickers in a slice on the cube e.g the
+        'm' slice.
 
         Arguments:
-            face (np.array): One of the constants FRONT, BACK, LEFT, RIGHT,
-                UP, DOWN.
+            plane (tuple {int}): The plane of rotation. Will be a comination
+                of two constants. e.g. np.add(X_AXIS, Y_AXIS)
         """
-        face_pieces = set()
-
-        for piece in self._pieces:
-            if list(abs(piece.position + face)).count(2) == 1:
-                face_pieces.add(piece)
+        return LAYER_STICKERS[tuple(plane)]
 
-        return face_pieces
-
-    def _slice(self, plane):
-        """Get all the pieces in a slice on the cube e.g the 'm' slice.
+    def _piece(self, position):
+        """Get the piece which is currently at a position on the cube.
 
         Arguments:
-            plane (np.array): The plane of rotation. Will be a comination of
-                two constants. e.g. X_AXIS + Y_AXIS
+            position (tuple {int}): x, y, z position of the piece.
+
+        Returns:
+            (Piece): The piece at that position.
         """
-        slice_pieces = set()
+        colors = [None, None, None]
 
-        for index, value in enumerate(plane):
-            if value != 0:
-                continue
+        for sticker in POSITIONS[position]:
+            _, direction = FACELETS[sticker]
+            colors[np.flatnonzero(direction)[0]] = chr(self._state[sticker])
 
-            for piece in self._pieces:
-                if piece.position[index] != 0:
-                    continue
+        return Piece(np.array(position), colors)
 
-                slice_pieces.add(piece)
+    def is_solved(self):
+        """Check whether the cube is solved, it may be turned any way round.
 
-        return slice_pieces
+        Returns:
+            (bool): True if every face is a single color.
+        """
+        return is_solved(self._state)
 
     def _valid(self):
         """Advanced verification to make sure that the current cube object is
-        in fact a valid Rubik's cube.
+        in fact a valid Rubik's cube; every corner and edge exists and the
+        cube can be reached from a solved cube by turning the faces.
 
         Returns:
             (bool): True if the cube is valid.
         """
-        return True
+        return is_solvable(self._state)
 
     def __iter__(self):
         """Iterate over the pieces of the cube when iterating over the cube
@@ -301,7 +376,7 @@ class Cube():
         Returns:
             (iter): All the cubes pieces.
         """
-        return iter(self._pieces)
+        return (self._piece(position) for position in POSITIONS)
 
     def __str__(self):
         """Get a string representation of the Rubik's cube. This will be in
@@ -310,37 +385,30 @@ class Cube():
         Returns:
             (str): A cube string representing the current state of the cube.
         """
-        color_list = []
-        face_colors = {'back': [], 'up': [], 'left': [], 'right': [],
-                       'down': [], 'front': []}
-
-        for piece in sorted(self._face(BACK), key=lambda p: (p.y, p.x)):
-            face_colors['back'].append(piece.colors[2])
+        return self._state.tobytes().decode('ascii')
 
-        for piece in sorted(self._face(UP), key=lambda p: (p.z, p.x)):
-            face_colors['up'].append(piece.colors[1])
+    def __eq__(self, other):
+        """Two cubes are equal when all of their stickers are the same color.
 
-        for piece in sorted(self._face(LEFT), key=lambda p: (p.z, p.y)):
-            face_colors['left'].append(piece.colors[0])
-
-        for piece in sorted(self._face(RIGHT), key=lambda p: (p.z, -p.y)):
-            face_colors['right'].append(piece.colors[0])
-
-        for piece in sorted(self._face(DOWN), key=lambda p: (p.z, -p.x)):
-            face_colors['down'].append(piece.colors[1])
-
-        for piece in sorted(self._face(FRONT), key=lambda p: (-p.y, p.x)):
-            face_colors['front'].append(piece.colors[2])
+        Arguments:
+            other (Cube): The cube to compare with.
 
-        color_list += face_colors['back']
+        Returns:
+            (bool): True if the cubes are equal.
+        """
+        if not isinstance(other, Cube):
+            return NotImplemented
 
-        for index in range(0, 9, 3):
-            for face in ['left', 'up', 'right', 'down']:
-                color_list += face_colors[face][index:index + 3]
+        return self._state.tobytes() == other._state.tobytes()
 
-        color_list += face_colors['front']
+    def __hash__(self):
+        """Hash the sticker colors so cubes can be kept in sets and as
+        dictionary keys, a cube mustn't be moved while it is stored in one.
 
-        return ''.join(color_list)
+        Returns:
+            (int): The hash of the cube.
+        """
+        return hash(self._state.tobytes())
 
     @classmethod
     def valid_cube_string(cls, cube_string):
@@ -353,16 +421,4 @@ class Cube():
         Returns:
             (bool): True if the cube string is valid.
         """
-        valid = True
-
-        # verify we have enough sticker colors.
-        if len(cube_string) != 54:
-            valid = False
-
-        # verify we have 9 of each color.
-        colors = {'R': 0, 'G': 0, 'B': 0, 'O': 0, 'W': 0, 'Y': 0}
-
-        for element in cube_string:
-            colors[element] += 1
-
-        return all(c == 9 for (_, c) in colors.items())
+        return valid_cube_string(cube_string)
@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+from .constants import UP, DOWN, RIGHT, LEFT, FRONT, BACK, FACELETS
+from .moves import FACE_MOVES, PERMUTATIONS, POSITIONS
+
+
+# the direction each face of the cube points in.
+FACES = {'U': UP, 'R': RIGHT, 'F': FRONT, 'D': DOWN, 'L': LEFT, 'B': BACK}
+
+# corner and edge slots, each slot lists its faces starting with the up or
+# down face (front or back for the middle layer edges) and then going
+# clockwise around the piece.
+CORNERS = ('URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB')
+EDGES = ('UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR')
+
+# lookup from a stickers position and direction to its index in the cube.
+_FACELET_INDEX = {facelet: index for index, facelet in enumerate(FACELETS)}
+
+
+def _facelets(name):
+    """Get the sticker indices for a corner or edge slot.
+
+    Arguments:
+        name (str): The faces which the slot lies on. e.g. URF
+
+    Returns:
+        (tuple {int}): The sticker index on each face in the same order as
+            the name.
+    """
+    position = tuple(int(v) for v in np.sum([FACES[face] for face in name], axis=0))
+
+    return tuple(_FACELET_INDEX[(position, tuple(int(v) for v in FACES[face]))]
+                 for face in name)
+
+
+# sticker indices of each corner and edge slot.
+CORNER_FACELETS = tuple(_facelets(name) for name in CORNERS)
+EDGE_FACELETS = tuple(_facelets(name) for name in EDGES)
+
+# sticker index of the center piece on each face.
+CENTERS = {face: POSITIONS[tuple(int(v) for v in direction)][0]
+           for face, direction in FACES.items()}
+
+
+def face_colors(state):
+    """Get the color of each face from the center pieces.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+
+    Returns:
+        (dict): Lookup from a face e.g. U to the color of that face.
+    """
+    return {face: state[sticker] for face, sticker in CENTERS.items()}
+
+
+def corner_coordinate(state, corner):
+    """Find where a corner currently is and how it is twisted. The twist is
+    the sticker of the slot which holds the corners up or down colour.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+        corner (int): The index of the corner in CORNERS.
+
+    Returns:
+        (int): The slot multiplied by three plus the twist, or None if the
+            corner isn't on the cube.
+    """
+    colors = face_colors(state)
+    reference, *others = (colors[face] for face in CORNERS[corner])
+
+    for slot, facelets in enumerate(CORNER_FACELETS):
+        stickers = [state[facelet] for facelet in facelets]
+
+        if reference not in stickers:
+            continue
+
+        twist = stickers.index(reference)
+
+        if stickers[(twist + 1) % 3] == others[0] and stickers[(twist + 2) % 3] == others[1]:
+            return slot * 3 + twist
+
+    return None
+
+
+def edge_coordinate(state, edge):
+    """Find where an edge currently is and whether it is flipped.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+        edge (int): The index of the edge in EDGES.
+
+    Returns:
+        (int): The slot multiplied by two plus the flip, or None if the edge
+            isn't on the cube.
+    """
+    colors = face_colors(state)
+    first, second = (colors[face] for face in EDGES[edge])
+
+    for slot, (facelet_a, facelet_b) in enumerate(EDGE_FACELETS):
+        if state[facelet_a] == first and state[facelet_b] == second:
+            return slot * 2
+
+        if state[facelet_a] == second and state[facelet_b] == first:
+            return slot * 2 + 1
+
+    return None
+
+
+def _coordinate_moves(slots):
+    """Build a table which gives the new coordinate of a single piece after
+    each face move.
+
+    Arguments:
+        slots (tuple {tuple {int}}): The sticker indices of each slot e.g.
+            CORNER_FACELETS.
+
+    Returns:
+        (np.ndarray): Table indexed by coordinate then move id.
+    """
+    size = len(slots[0])
+    location = {facelet: slot * size + index for slot, facelets in enumerate(slots)
+                for index, facelet in enumerate(facelets)}
+
+    table = np.zeros((len(slots) * size, FACE_MOVES), dtype=np.intp)
+
+    for move in range(FACE_MOVES):
+        destination = np.argsort(PERMUTATIONS[move])
+
+        for coordinate in range(len(slots) * size):
+            slot, index = divmod(coordinate, size)
+            table[coordinate, move] = location[destination[slots[slot][index]]]
+
+    table.flags.writeable = False
+
+    return table
+
+
+# the coordinate of a single corner or edge after each face move.
+CORNER_MOVES = _coordinate_moves(CORNER_FACELETS)
+EDGE_MOVES = _coordinate_moves(EDGE_FACELETS)
+
+
+def _piece_lookup(pieces):
+    """Build a table which identifies a corner or edge from the faces its
+    stickers match. Each face is numbered by its position in FACES, with an
+    extra number for stickers which don't match any center.
+
+    Arguments:
+        pieces (tuple {str}): The pieces e.g. CORNERS.
+
+    Returns:
+        (np.array): The piece multiplied by its number of stickers plus the
+            twist or flip, or -1 if there is no such piece. Indexed by the
+            face numbers of the stickers of a slot read as a base seven
+            number.
+    """
+    size = len(pieces[0])
+    table = np.full((len(FACES) + 1) ** size, -1, dtype=np.intp)
+
+    for piece, name in enumerate(pieces):
+        for twist in range(size):
+            faces = [0] * size
+
+            for index, face in enumerate(name):
+                faces[(index + twist) % size] = list(FACES).index(face)
+
+            table[sum(face * (len(FACES) + 1) ** (size - 1 - index)
+                      for index, face in enumerate(faces))] = piece * size + twist
+
+    return table
+
+
+def _piece_faces(pieces):
+    """Build a table of the faces which the stickers of a slot match when it
+    holds a corner or edge, the reverse of _piece_lookup.
+
+    Arguments:
+        pieces (tuple {str}): The pieces e.g. CORNERS.
+
+    Returns:
+        (np.ndarray): The face number of each sticker of the slot, indexed by
+            the piece multiplied by its number of stickers plus the twist or
+            flip.
+    """
+    size = len(pieces[0])
+    table = np.zeros((len(pieces) * size, size), dtype=np.intp)
+
+    for piece, name in enumerate(pieces):
+        for twist in range(size):
+            for index, face in enumerate(name):
+                table[piece * size + twist, (index + twist) % size] = list(FACES).index(face)
+
+    return table
+
+
+# lookups from the face numbers of a slot to the piece and twist or flip.
+_CORNER_LOOKUP = _piece_lookup(CORNERS)
+_EDGE_LOOKUP = _piece_lookup(EDGES)
+
+# the sticker index of each center and of each corner and edge slot.
+_CENTER_STICKERS = np.array(list(CENTERS.values()))
+_CORNER_STICKERS = np.array(CORNER_FACELETS)
+_EDGE_STICKERS = np.array(EDGE_FACELETS)
+
+# the same lookups as lists, for checking a single cube without numpy.
+_CORNER_LOOKUP_LIST = _CORNER_LOOKUP.tolist()
+_EDGE_LOOKUP_LIST = _EDGE_LOOKUP.tolist()
+
+# the face number of each sticker of a slot holding each piece and twist or
+# flip, the reverse of the lookups above.
+_CORNER_FACES = _piece_faces(CORNERS)
+_EDGE_FACES = _piece_faces(EDGES)
+
+# where each sticker is in the array built by build_states before it is put
+# into place, and where the edges start in that array.
+_STICKER_ORDER = np.argsort(np.concatenate([_CENTER_STICKERS, _CORNER_STICKERS.ravel(),
+                                            _EDGE_STICKERS.ravel()]))
+_EDGES_START = len(FACES) + _CORNER_STICKERS.size
+
+# the piece and twist or flip in each slot of a solved cube.
+_SOLVED_CORNERS = [corner * 3 for corner in range(len(CORNERS))]
+_SOLVED_EDGES = [edge * 2 for edge in range(len(EDGES))]
+
+# the number of bytes in a cube packed by pack_state.
+PACKED_SIZE = len(FACES) + len(CORNERS) + len(EDGES)
+
+# every pair of slots, used to count the inversions of a permutation.
+_CORNER_PAIRS = np.triu_indices(len(CORNERS), 1)
+_EDGE_PAIRS = np.triu_indices(len(EDGES), 1)
+
+
+def mismatched_parity(cp, ep):
+    """Work out which cubes have a corner permutation and edge permutation of
+    different parity, which can't be reached by turning the faces.
+
+    Arguments:
+        cp (np.ndarray): The corner in each corner slot, one row per cube.
+        ep (np.ndarray): The edge in each edge slot, one row per cube.
+
+    Returns:
+        (np.array): True for each cube whose parities don't match.
+    """
+    return (np.count_nonzero(cp[:, _CORNER_PAIRS[0]] > cp[:, _CORNER_PAIRS[1]], axis=1) % 2 !=
+            np.count_nonzero(ep[:, _EDGE_PAIRS[0]] > ep[:, _EDGE_PAIRS[1]], axis=1) % 2)
+
+
+def _parity(permutation):
+    """Work out whether a permutation is odd from its cycles.
+
+    Arguments:
+        permutation (list {int}): The permutation.
+
+    Returns:
+        (int): One if the permutation is odd, otherwise zero.
+    """
+    seen = [False] * len(permutation)
+    cycles = 0
+
+    for start in range(len(permutation)):
+        if not seen[start]:
+            cycles += 1
+
+            while not seen[start]:
+                seen[start] = True
+                start = permutation[start]
+
+    return (len(permutation) - cycles) % 2
+
+
+def _identify(state):
+    """Identify the corner and edge in each slot of a single cube from the
+    faces its stickers match.
+
+    Arguments:
+        state (np.array): The sticker colors of the cube.
+
+    Returns:
+        (tuple): The center colors in the same order as FACES, the corner
+            multiplied by three plus the twist in each corner slot and the
+            edge multiplied by two plus the flip in each edge slot, -1 where
+            there is no such piece. None if the centers aren't all different.
+    """
+    data = state.tobytes()
+    centers = bytes(data[sticker] for sticker in CENTERS.values())
+
+    if len(set(centers)) != len(FACES):
+        return None
+
+    lookup = bytearray([len(FACES)]) * 256
+
+    for face, color in enumerate(centers):
+        lookup[color] = face
+
+    faces = data.translate(lookup)
+    base = len(FACES) + 1
+
+    corners = [_CORNER_LOOKUP_LIST[(faces[a] * base + faces[b]) * base + faces[c]]
+               for a, b, c in CORNER_FACELETS]
+    edges = [_EDGE_LOOKUP_LIST[faces[a] * base + faces[b]] for a, b in EDGE_FACELETS]
+
+    return centers, corners, edges
+
+
+def is_solvable(state):
+    """Check that a single cube could be solved by turning the faces, see
+    solvable. This avoids numpy so that it only takes a few microseconds.
+
+    Arguments:
+        state (np.array): The sticker colors of the cube.
+
+    Returns:
+        (bool): True if the cube can be solved.
+    """
+    pieces = _identify(state)
+
+    if pieces is None:
+        return False
+
+    _, corners, edges = pieces
+
+    if -1 in corners or -1 in edges:
+        return False
+
+    cp = [corner // 3 for corner in corners]
+    ep = [edge // 2 for edge in edges]
+
+    return (len(set(cp)) == len(CORNERS) and len(set(ep)) == len(EDGES) and
+            sum(corner % 3 for corner in corners) % 3 == 0 and
+            sum(edge % 2 for edge in edges) % 2 == 0 and
+            _parity(cp) == _parity(ep))
+
+
+def is_solved(state):
+    """Check whether a single cube is solved, every corner and edge must be
+    in its slot relative to the centers so the cube may be turned any way
+    round.
+
+    Arguments:
+        state (np.array): The sticker colors of the cube.
+
+    Returns:
+        (bool): True if the cube is solved.
+    """
+    pieces = _identify(state)
+
+    return pieces is not None and pieces[1] == _SOLVED_CORNERS and pieces[2] == _SOLVED_EDGES
+
+
+def pack_state(state):
+    """Pack the sticker colors of a valid cube into 26 bytes; the six center
+    colors followed by the corner in each corner slot multiplied by three
+    plus its twist and the edge in each edge slot multiplied by two plus its
+    flip.
+
+    Arguments:
+        state (np.array): The sticker colors of the cube.
+
+    Returns:
+        (bytes): The packed cube.
+    """
+    centers, corners, edges = _identify(state)
+
+    return centers + bytes(corners) + bytes(edges)
+
+
+def unpack_state(data):
+    """Get the sticker colors of a cube packed by pack_state.
+
+    Arguments:
+        data (bytes): The packed cube.
+
+    Returns:
+        (np.array): The sticker colors, or None if the data can't be
+            unpacked.
+    """
+    if len(data) != PACKED_SIZE:
+        return None
+
+    pieces = np.frombuffer(data, dtype=np.uint8)
+    corners = pieces[len(FACES):len(FACES) + len(CORNERS)]
+    edges = pieces[len(FACES) + len(CORNERS):]
+
+    if corners.max() >= len(_CORNER_FACES) or edges.max() >= len(_EDGE_FACES):
+        return None
+
+    return build_states(corners[None], edges[None], pieces[:len(FACES)])[0]
+
+
+def build_states(corners, edges, centers):
+    """Get the sticker colors of many cubes from the corner and edge in each
+    of their slots.
+
+    Arguments:
+        corners (np.ndarray): The corner multiplied by three plus its twist,
+            one row per cube and one column per corner slot.
+        edges (np.ndarray): The edge multiplied by two plus its flip, one
+            row per cube and one column per edge slot.
+        centers (np.array): The color of each face in the same order as
+            FACES.
+
+    Returns:
+        (np.ndarray): The sticker colors, one row per cube.
+    """
+    centers = np.asarray(centers, dtype=np.uint8)
+    count = len(corners)
+
+    # the stickers are gathered with the centers first, then the corners and
+    # then the edges, and put into place with one more gather.
+    stickers = np.empty((count, len(FACELETS)), dtype=np.uint8)
+    stickers[:, :len(FACES)] = centers
+    stickers[:, len(FACES):_EDGES_START] = centers[_CORNER_FACES][corners].reshape(count, -1)
+    stickers[:, _EDGES_START:] = centers[_EDGE_FACES][edges].reshape(count, -1)
+
+    return stickers.take(_STICKER_ORDER, axis=1)
+
+
+def solvable(states):
+    """Check that many cubes could be solved by turning the faces. Every corner
+    and edge must be on the cube once, the corner twists must add up to a
+    multiple of three, the edge flips must add up to a multiple of two and
+    the corner and edge permutations must both be even or both be odd.
+
+    Arguments:
+        states (np.ndarray): The sticker colors of the cubes, one row per
+            cube.
+
+    Returns:
+        (np.array): True for each cube which can be solved.
+    """
+    centers = states[:, _CENTER_STICKERS]
+    distinct = (np.diff(np.sort(centers, axis=1), axis=1) != 0).all(axis=1)
+
+    matches = states[:, :, None] == centers[:, None, :]
+    faces = np.where(matches.any(axis=2), matches.argmax(axis=2), len(FACES))
+
+    base = len(FACES) + 1
+    corners = _CORNER_LOOKUP[faces[:, _CORNER_STICKERS] @ (base * base, base, 1)]
+    edges = _EDGE_LOOKUP[faces[:, _EDGE_STICKERS] @ (base, 1)]
+
+    cp, co = np.divmod(corners, 3)
+    ep, eo = np.divmod(edges, 2)
+
+    return (distinct &
+            (np.sort(cp, axis=1) == np.arange(len(CORNERS))).all(axis=1) &
+            (np.sort(ep, axis=1) == np.arange(len(EDGES))).all(axis=1) &
+            (co.sum(axis=1) % 3 == 0) &
+            (eo.sum(axis=1) % 2 == 0) &
+            ~mismatched_parity(cp, ep))
+
+
+class CubieCube():
+    """The cube described by which corner and edge sits in each slot and
+    how it is twisted or flipped, relative to the center colors. This is the
+    representation the search coordinates are built from.
+
+    Arguments:
+        cp (list {int}): The corner in each corner slot.
+        co (list {int}): The twist of each corner slot.
+        ep (list {int}): The edge in each edge slot.
+        eo (list {int}): The flip of each edge slot.
+    """
+    def __init__(self, cp=None, co=None, ep=None, eo=None):
+        self.cp = list(range(len(CORNERS))) if cp is None else list(cp)
+        self.co = [0] * len(CORNERS) if co is None else list(co)
+        self.ep = list(range(len(EDGES))) if ep is None else list(ep)
+        self.eo = [0] * len(EDGES) if eo is None else list(eo)
+
+    @classmethod
+    def from_state(cls, state):
+        """Work out the corners and edges from the sticker colors of a cube.
+
+        Arguments:
+            state (np.array): The sticker colors of a cube.
+
+        Returns:
+            (CubieCube): The cube, or None if a corner or edge doesn't match
+                the center colors.
+        """
+        colors = face_colors(state)
+        corners = {tuple(colors[face] for face in corner): index
+                   for index, corner in enumerate(CORNERS)}
+        edges = {tuple(colors[face] for face in edge): index
+                 for index, edge in enumerate(EDGES)}
+
+        cube = cls()
+
+        for slot, facelets in enumerate(CORNER_FACELETS):
+            stickers = [state[facelet] for facelet in facelets]
+
+            for twist in range(3):
+                corner = corners.get(tuple(stickers[twist:] + stickers[:twist]))
+
+                if corner is not None:
+                    cube.cp[slot], cube.co[slot] = corner, twist
+                    break
+            else:
+                return None
+
+        for slot, facelets in enumerate(EDGE_FACELETS):
+            stickers = [state[facelet] for facelet in facelets]
+
+            for flip in range(2):
+                edge = edges.get(tuple(stickers[flip:] + stickers[:flip]))
+
+                if edge is not None:
+                    cube.ep[slot], cube.eo[slot] = edge, flip
+                    break
+            else:
+                return None
+
+        return cube
+
+    def to_state(self, colors):
+        """Get the sticker colors of the cube.
+
+        Arguments:
+            colors (dict): Lookup from a face e.g. U to its color.
+
+        Returns:
+            (np.array): The sticker colors in the same order as the cube
+                string.
+        """
+        state = np.zeros(len(FACELETS), dtype=np.uint8)
+
+        for face, sticker in CENTERS.items():
+            state[sticker] = colors[face]
+
+        for slot, facelets in enumerate(CORNER_FACELETS):
+            for index, face in enumerate(CORNERS[self.cp[slot]]):
+                state[facelets[(index + self.co[slot]) % 3]] = colors[face]
+
+        for slot, facelets in enumerate(EDGE_FACELETS):
+            for index, face in enumerate(EDGES[self.ep[slot]]):
+                state[facelets[(index + self.eo[slot]) % 2]] = colors[face]
+
+        return state
+
+    def multiply(self, other):
+        """Apply the corner and edge changes of another cube to this one,
+        this is how a move is performed on a CubieCube.
+
+        Arguments:
+            other (CubieCube): The cube to multiply by e.g. one of MOVE_CUBES.
+
+        Returns:
+            (CubieCube): The product of the two cubes.
+        """
+        return CubieCube([self.cp[slot] for slot in other.cp],
+                         [(self.co[slot] + twist) % 3 for slot, twist in zip(other.cp, other.co)],
+                         [self.ep[slot] for slot in other.ep],
+                         [(self.eo[slot] + flip) % 2 for slot, flip in zip(other.ep, other.eo)])
+
+    def move(self, move):
+        """Perform a face move.
+
+        Arguments:
+            move (int): The move id, which must be one of the face moves.
+
+        Returns:
+            (CubieCube): The cube after the move.
+        """
+        return self.multiply(MOVE_CUBES[move])
+
+
+def _move_cube(move):
+    """Build the CubieCube for a face move applied to a solved cube.
+
+    Arguments:
+        move (int): The move id.
+
+    Returns:
+        (CubieCube): The corners and edges after the move.
+    """
+    cube = CubieCube()
+
+    for corner in range(len(CORNERS)):
+        slot, twist = divmod(CORNER_MOVES[corner * 3, move], 3)
+        cube.cp[slot], cube.co[slot] = corner, twist
+
+    for edge in range(len(EDGES)):
+        slot, flip = divmod(EDGE_MOVES[edge * 2, move], 2)
+        cube.ep[slot], cube.eo[slot] = edge, flip
+
+    return cube
+
+
+# the corners and edges after each face move, indexed by move id.
+MOVE_CUBES = tuple(_move_cube(move) for move in range(FACE_MOVES))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+from .constants import (X_AXIS, Y_AXIS, Z_AXIS, UP, DOWN, RIGHT, LEFT, FRONT,
+                        BACK, ROT_YZ, ROT_YZ_PRIME, ROT_XZ, ROT_XZ_PRIME,
+                        ROT_XY, ROT_XY_PRIME, FACELETS)
+
+
+# the layer turned by each move along with its clockwise quarter turn. The
+# first six are the outer faces which the solvers search over.
+LAYERS = tuple((name, np.array(layer), np.array(matrix)) for name, layer, matrix in (
+    ('U', UP, ROT_XZ),
+    ('R', RIGHT, ROT_YZ),
+    ('F', FRONT, ROT_XY),
+    ('D', DOWN, ROT_XZ_PRIME),
+    ('L', LEFT, ROT_YZ_PRIME),
+    ('B', BACK, ROT_XY_PRIME),
+    ('M', np.add(Y_AXIS, Z_AXIS), ROT_YZ_PRIME),
+    ('E', np.add(X_AXIS, Z_AXIS), ROT_XZ_PRIME),
+    ('S', np.add(X_AXIS, Y_AXIS), ROT_XY)
+))
+
+# wide moves and whole cube rotations, each is the quarter turns of several
+# layers at once.
+COMPOUND = (
+    ('r', ('R', "M'")),
+    ('l', ('L', 'M')),
+    ('u', ('U', "E'")),
+    ('d', ('D', 'E')),
+    ('f', ('F', 'S')),
+    ('b', ('B', "S'")),
+    ('x', ('R', "M'", "L'")),
+    ('y', ('U', "E'", "D'")),
+    ('z', ('F', 'S', "B'"))
+)
+
+# every move in standard notation, the index of a move in this tuple is its
+# move id. Move ids are grouped in threes; quarter turn, prime, half turn.
+MOVE_NAMES = tuple(name + suffix for name in
+                   [name for name, _, _ in LAYERS] + [name for name, _ in COMPOUND]
+                   for suffix in ('', "'", '2'))
+
+# lookup from the standard notation to the move id.
+MOVES = {name: move for move, name in enumerate(MOVE_NAMES)}
+
+# the number of moves which only turn an outer face e.g. R, U' or F2.
+FACE_MOVES = 18
+
+# lookup from a stickers position and direction to its index in the cube.
+_FACELET_INDEX = {facelet: index for index, facelet in enumerate(FACELETS)}
+
+
+def _build_positions():
+    """Group the sticker indices by the position of the piece they belong
+    to.
+
+    Returns:
+        (dict): Lookup from a piece position to its sticker indices.
+    """
+    positions = {}
+
+    for sticker, (position, _) in enumerate(FACELETS):
+        positions.setdefault(position, []).append(sticker)
+
+    return {position: tuple(stickers) for position, stickers in positions.items()}
+
+
+def _build_layers():
+    """Work out which stickers belong to each face and middle slice.
+
+    Returns:
+        (dict): Lookup from a face vector e.g. UP or a plane of rotation e.g.
+            np.add(X_AXIS, Y_AXIS) to the sticker indices in that layer.
+    """
+    layers = {}
+
+    for _, layer, _ in LAYERS:
+        if np.count_nonzero(layer) == 1:
+            members = [stickers for position, stickers in POSITIONS.items()
+                       if np.dot(position, layer) == 1]
+        else:
+            members = [stickers for position, stickers in POSITIONS.items()
+                       if np.dot(position, 1 - layer) == 0]
+
+        layers[tuple(layer)] = frozenset(sum(members, ()))
+
+    return layers
+
+
+# lookup from a piece position to the indices of its stickers.
+POSITIONS = _build_positions()
+
+# lookup from a face or slice to the indices of the stickers it contains.
+LAYER_STICKERS = _build_layers()
+
+
+def _quarter_turn(layer, matrix):
+    """Build the sticker permutation for a single quarter turn of a layer.
+    The result is used as a gather index, where the new sticker at index i is
+    the old sticker at index permutation[i].
+
+    Arguments:
+        layer (np.array): The face or plane being turned.
+        matrix (np.ndarray): The rotation which will be applied to each
+            sticker in the layer.
+
+    Returns:
+        (np.array): The sticker permutation for the quarter turn.
+    """
+    permutation = np.arange(len(FACELETS))
+
+    for sticker in LAYER_STICKERS[tuple(layer)]:
+        position, direction = FACELETS[sticker]
+
+        destination = _FACELET_INDEX[(tuple(np.matmul(matrix, position)),
+                                      tuple(np.matmul(matrix, direction)))]
+
+        permutation[destination] = sticker
+
+    return permutation
+
+
+def _build_permutations():
+    """Build the sticker permutation for every move.
+
+    Returns:
+        (np.ndarray): One row of gather indices per move id.
+    """
+    permutations = []
+
+    for _, layer, matrix in LAYERS:
+        quarter = _quarter_turn(layer, matrix)
+        half = quarter[quarter]
+
+        permutations += [quarter, half[quarter], half]
+
+    for _, layers in COMPOUND:
+        quarter = np.arange(len(FACELETS))
+
+        for layer in layers:
+            quarter = quarter[permutations[MOVES[layer]]]
+
+        half = quarter[quarter]
+
+        permutations += [quarter, half[quarter], half]
+
+    permutations = np.array(permutations, dtype=np.intp)
+    permutations.flags.writeable = False
+
+    return permutations
+
+
+# sticker permutation for every move, indexed by move id.
+PERMUTATIONS = _build_permutations()
+
+# lookup from a move id to the move id which undoes it.
+INVERSE = tuple(move + (1 if move % 3 == 0 else -1 if move % 3 == 1 else 0)
+                for move in range(len(MOVE_NAMES)))
+
+
+def redundant(last, move):
+    """Check whether a face move can be skipped during a search because it
+    turns the same face as the previous move, or an opposite face in a fixed
+    order.
+
+    Arguments:
+        last (int): The move id of the previous move.
+        move (int): The move id of the next move.
+
+    Returns:
+        (bool): True if the move doesn't need to be searched.
+    """
+    face, last_face = move // 3, last // 3
+
+    return face == last_face or (face % 3 == last_face % 3 and face < last_face)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+from .constants import SOLVED
+from .cubie import CENTERS, CORNERS, EDGES, build_states, mismatched_parity
+
+
+# the number of cubes generated at once, which only bounds the memory used;
+# every cube is built from its own row of random numbers so the same seed
+# gives the same cubes whether they are generated as an array or as a stream.
+CHUNK_SIZE = 65536
+
+# the color of each face of the cubes which are generated.
+_CENTERS = np.frombuffer(SOLVED.encode('ascii'), dtype=np.uint8)[list(CENTERS.values())]
+
+# where the random numbers for the corner and edge permutations, twists and
+# flips end in each row.
+_SPLITS = np.cumsum([len(CORNERS), len(EDGES), len(CORNERS)])
+
+
+def _random_permutations(draws):
+    """Pick permutations uniformly at random.
+
+    Arguments:
+        draws (np.ndarray): One random number in [0, 1) per item, one row
+            per permutation.
+
+    Returns:
+        (np.ndarray): One permutation per row.
+    """
+    # small integers make counting the inversions much quicker.
+    return np.argsort(draws, axis=1).astype(np.int8)
+
+
+def _random_orientations(draws, twists):
+    """Pick the twist or flip of every piece uniformly at random, apart from
+    the last which is fixed so that they add up to a multiple of the number
+    of twists.
+
+    Arguments:
+        draws (np.ndarray): One random number in [0, 1) per piece, one row
+            per cube.
+        twists (int): Three for corners and two for edges.
+
+    Returns:
+        (np.ndarray): The twist or flip of each piece, one row per cube.
+    """
+    orientations = (draws * twists).astype(np.int8)
+    orientations[:, -1] = -orientations[:, :-1].sum(axis=1) % twists
+
+    return orientations
+
+
+def _generate(generator, count):
+    """Generate random cubes, see random_states.
+
+    Arguments:
+        generator (np.random.Generator): The random number generator.
+        count (int): The number of cubes.
+
+    Returns:
+        (np.ndarray): The sticker colors of the cubes, one row per cube.
+    """
+    # a single draw keeps each cube's random numbers together, so a cube
+    # doesn't depend on how many others are generated alongside it.
+    draws = generator.random((count, 2 * (len(CORNERS) + len(EDGES))))
+    corners, edges, twists, flips = np.split(draws, _SPLITS, axis=1)
+
+    cp = _random_permutations(corners)
+    ep = _random_permutations(edges)
+
+    # swapping two edges turns every odd permutation into a different even
+    # one, so fixing the parity this way keeps every cube equally likely.
+    odd = mismatched_parity(cp, ep)
+    ep[odd, :2] = ep[odd, 1::-1]
+
+    co = _random_orientations(twists, 3)
+    eo = _random_orientations(flips, 2)
+
+    return build_states(cp * 3 + co, ep * 2 + eo, _CENTERS)
+
+
+def random_states(count, seed=None):
+    """Generate cubes picked uniformly at random from every solvable cube,
+    unlike scrambling with random moves which favours cubes close to the
+    scramble's start.
+
+    Arguments:
+        count (int): The number of cubes.
+        seed (int|np.random.Generator): The seed of the random number
+            generator, or None to seed it from the operating system.
+
+    Returns:
+        (np.ndarray): The sticker colors of the cubes in the same layout as
+            the Cube object, one row per cube.
+    """
+    generator = np.random.default_rng(seed)
+    states = np.empty((count, len(SOLVED)), dtype=np.uint8)
+
+    for start in range(0, count, CHUNK_SIZE):
+        states[start:start + CHUNK_SIZE] = _generate(generator, min(CHUNK_SIZE, count - start))
+
+    return states
+
+
+def random_cube_strings(count=None, seed=None):
+    """Generate the cube strings of cubes picked uniformly at random, see
+    random_states. The cubes are generated in chunks so any number can be
+    streamed.
+
+    Arguments:
+        count (int): The number of cubes, or None to go on forever.
+        seed (int|np.random.Generator): The seed of the random number
+            generator, or None to seed it from the operating system.
+
+    Yields:
+        (str): The cube strings.
+    """
+    generator = np.random.default_rng(seed)
+    start = 0
+
+    while count is None or start < count:
+        size = CHUNK_SIZE if count is None else min(CHUNK_SIZE, count - start)
+        data = _generate(generator, size).tobytes().decode('ascii')
+
+        yield from (data[index:index + len(SOLVED)] for index in range(0, len(data), len(SOLVED)))
+
+        start += size
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import collections
+import functools
+import itertools
+
+import numpy as np
+
+from .constants import FACELETS
+from .cube import InvalidCubeString
+from .cubie import CENTERS, FACES
+from .moves import MOVE_NAMES, PERMUTATIONS
+from ..util.algorithm import Algorithm
+
+
+# the label given to the stickers matching each center, in the same order as
+# FACES.
+FACE_LABELS = ''.join(FACES)
+
+# how each symmetry moves the cube, see symmetries.
+Symmetries = collections.namedtuple('Symmetries', ['sources', 'face_maps', 'inverses',
+                                                   'move_symmetries'])
+
+
+def _matrices():
+    """Build every rotation and reflection of the cube, these are the 3x3
+    matrices with one entry of plus or minus one in each row and column.
+
+    Returns:
+        (list {np.ndarray}): The 48 matrices, starting with the identity.
+    """
+    matrices = []
+
+    for order in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            matrix = np.zeros((3, 3), dtype=int)
+            matrix[range(3), order] = signs
+            matrices.append(matrix)
+
+    return matrices
+
+
+def _transform(matrix, vector):
+    """Apply a symmetry to a position or direction.
+
+    Arguments:
+        matrix (np.ndarray): The symmetry.
+        vector (tuple {int}): The position or direction.
+
+    Returns:
+        (tuple {int}): The transformed vector.
+    """
+    return tuple(int(v) for v in matrix @ vector)
+
+
+def _build_symmetries():
+    """Work out how each symmetry moves the stickers and faces of the cube.
+
+    Returns:
+        (tuple): The sticker which ends up at each sticker index, the face
+            each face is moved to, and the symmetry which undoes each one.
+    """
+    matrices = _matrices()
+    facelet_index = {facelet: index for index, facelet in enumerate(FACELETS)}
+    directions = [tuple(int(v) for v in direction) for direction in FACES.values()]
+
+    sources = np.zeros((len(matrices), len(FACELETS)), dtype=np.intp)
+    face_maps = np.zeros((len(matrices), len(FACES)), dtype=np.uint8)
+
+    for symmetry, matrix in enumerate(matrices):
+        for index, (position, direction) in enumerate(FACELETS):
+            target = (_transform(matrix, position), _transform(matrix, direction))
+            sources[symmetry, facelet_index[target]] = index
+
+        for face, direction in enumerate(directions):
+            face_maps[symmetry, face] = directions.index(_transform(matrix, direction))
+
+    inverses = tuple(next(other for other, candidate in enumerate(matrices)
+                          if (candidate == matrix.T).all()) for matrix in matrices)
+
+    return sources, face_maps, inverses
+
+
+def _build_move_symmetries(sources):
+    """Work out which move each move becomes when the cube is transformed by
+    a symmetry, reflections turn clockwise moves into anticlockwise ones.
+
+    Arguments:
+        sources (np.ndarray): The sticker which ends up at each sticker
+            index, indexed by symmetry.
+
+    Returns:
+        (tuple {tuple {int}}): The new move id, indexed by symmetry then move
+            id.
+    """
+    moves = {}
+
+    for move in range(len(MOVE_NAMES)):
+        moves.setdefault(PERMUTATIONS[move].tobytes(), move)
+
+    table = []
+
+    for source in sources:
+        targets = np.argsort(source)
+        table.append(tuple(moves[targets[PERMUTATIONS[move][source]].tobytes()]
+                           for move in range(len(MOVE_NAMES))))
+
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=None)
+def symmetries():
+    """Get how each symmetry moves the cube, building it the first time it
+    is used since it takes longer than importing everything else.
+
+    Returns:
+        (Symmetries): For each symmetry; the sticker which is moved to each
+            sticker index (sources), the face each face is moved to
+            (face_maps), the symmetry which undoes it (inverses) and the move
+            id each move becomes (move_symmetries).
+    """
+    sources, face_maps, inverses = _build_symmetries()
+
+    sources.flags.writeable = False
+    face_maps.flags.writeable = False
+
+    return Symmetries(sources, face_maps, inverses, _build_move_symmetries(sources))
+
+
+# the sticker index of each center, in the same order as FACES.
+_CENTERS = np.array(list(CENTERS.values()))
+
+
+def face_labels(state):
+    """Replace the colors of a cube with the face whose center has that
+    color, which makes every relabelling of the colors look the same.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+
+    Returns:
+        (np.array): The index in FACES of the face matching each sticker.
+    """
+    centers = state[_CENTERS]
+
+    if len(set(centers.tolist())) != len(FACES):
+        raise InvalidCubeString
+
+    lookup = np.zeros(256, dtype=np.uint8)
+    lookup[centers] = np.arange(len(FACES))
+
+    return lookup[state]
+
+
+def canonical(cube):
+    """Get a key which is the same for every cube equivalent under the 48
+    symmetries of the cube and relabelling of the colors. These cubes are
+    all solved by the same algorithm, after it is transformed by the
+    symmetry.
+
+    Arguments:
+        cube (Cube): The cube.
+
+    Returns:
+        (tuple): The key as a string of face labels e.g. UUUUUUUUU... and the
+            symmetry which transforms the cube into the one the key
+            describes.
+    """
+    sources, face_maps = symmetries().sources, symmetries().face_maps
+
+    candidates = face_maps[np.arange(len(sources))[:, None], face_labels(cube.state)[sources]]
+    keys = [candidate.tobytes() for candidate in candidates]
+    symmetry = min(range(len(keys)), key=keys.__getitem__)
+
+    return ''.join(FACE_LABELS[label] for label in keys[symmetry]), symmetry
+
+
+def transform_algorithm(algorithm, symmetry):
+    """Transform an algorithm by a symmetry. If the algorithm solves a cube,
+    the transformed algorithm solves the cube transformed by the symmetry.
+
+    Arguments:
+        algorithm (Algorithm): The algorithm.
+        symmetry (int): The symmetry e.g. from canonical.
+
+    Returns:
+        (Algorithm): The transformed algorithm.
+    """
+    moves = symmetries().move_symmetries[symmetry]
+
+    return Algorithm.from_moves([moves[move] for move in algorithm.moves])
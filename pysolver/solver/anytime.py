@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from .cfop.solver import CFOPSolver
+from .stats import SolveStats
+from .twophase.search import SPLIT_DEPTH, split_moves
+from .twophase.solver import MAX_PHASE1_DEPTH, TwoPhaseSolver
+from ..cube.cube import InvalidCubeString
+from ..cube.cubie import CubieCube
+from ..util.algorithm import Algorithm
+
+
+# seconds to spend improving a solution when no time budget is given.
+MAX_TIME = 1.0
+
+
+class _ImprovingSolver(TwoPhaseSolver):
+    """The two phase search used to improve on a solution. Every solution
+    must be shorter than the one before, they are kept until they are
+    collected and the search stops at a fixed deadline. The tables are
+    loaded straight away, so that no solve spends its time budget on them.
+
+    Arguments:
+        max_length (int): Stop as soon as a solution this short is found.
+    """
+    def __init__(self, max_length):
+        super().__init__(max_length)
+
+        self._bound = None
+        self._stop_at = None
+        self._improvements = []
+
+        self._load_tables()
+
+    def start(self, cube, bound, stop_at):
+        """Start a new search.
+
+        Arguments:
+            cube (CubieCube): The cube to solve.
+            bound (int): The length every solution must be shorter than.
+            stop_at (float): When the search must stop by time.monotonic.
+        """
+        self.reset(cube)
+
+        self._bound = bound
+        self._stop_at = stop_at
+        self._improvements = []
+
+    def depths(self):
+        """Get the phase one depths which are worth searching.
+
+        Returns:
+            (range): The depths, starting from the lower bound.
+        """
+        return range(self._phase1_distance(*self._root), MAX_PHASE1_DEPTH + 1)
+
+    def improvements(self):
+        """Collect the solutions found since the last time.
+
+        Returns:
+            (list {list {int}}): The move ids of each solution, each shorter
+                than the one before.
+        """
+        improvements, self._improvements = self._improvements, []
+
+        return improvements
+
+    def best_length(self):
+        """Get the length every further solution must be shorter than.
+
+        Returns:
+            (int): The length of the best solution so far, or the bound the
+                search was started with.
+        """
+        return self._bound if self._best is None else len(self._best)
+
+    def _best_length(self):
+        return self.best_length()
+
+    def _found(self, solution):
+        self._best = solution
+        self._improvements.append(solution)
+
+    def _finished(self):
+        if self._best is not None and len(self._best) <= self.max_length:
+            return True
+
+        return time.monotonic() > self._stop_at
+
+
+class AnytimeSolver():
+    """Solve a Rubik's cube within a time budget, getting shorter solutions
+    the more time there is. A CFOP solution is found first since it takes
+    a few milliseconds, then the two phase search looks for shorter ones
+    until the time runs out.
+
+    Arguments:
+        max_time (float): Seconds to spend on each cube.
+        max_length (int): Stop as soon as a solution this short is found.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, with the stages
+            of both solvers.
+    """
+    def __init__(self, max_time=MAX_TIME, max_length=20):
+        self.max_time = max_time
+        self.stats = SolveStats()
+
+        self._fast = CFOPSolver()
+        self._search = _ImprovingSolver(max_length)
+
+    def solutions(self, cube, max_time=None):
+        """Find shorter and shorter solutions until the time runs out, the
+        search stops as soon as the generator is closed.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+            max_time (float): Seconds to spend, defaults to max_time.
+
+        Yields:
+            (Algorithm): Each solution, shorter than the one before.
+        """
+        start = time.monotonic()
+        stop_at = start + (self.max_time if max_time is None else max_time)
+
+        best = self._fast.solve(cube)
+        self.stats = SolveStats()
+        self.stats.stages += self._fast.stats.stages
+
+        yield best
+
+        # the CFOP solution alone may have used up the time.
+        if time.monotonic() > stop_at:
+            self.stats.seconds = time.monotonic() - start
+            return
+
+        cube = CubieCube.from_state(cube.state)
+
+        if cube is None:
+            raise InvalidCubeString
+
+        search = self._search
+        search.start(cube, len(best.moves), stop_at)
+        self.stats.stages += search.stats.stages
+
+        try:
+            for depth in search.depths():
+                if depth >= search.best_length() or time.monotonic() > stop_at:
+                    return
+
+                # searching a few moves at a time lets the solutions found so
+                # far be handed out while the search goes on.
+                for prefix in split_moves(min(depth, SPLIT_DEPTH)):
+                    finished = search.search(prefix, depth)
+
+                    for solution in search.improvements():
+                        yield Algorithm.from_moves(solution)
+
+                    if finished:
+                        return
+        finally:
+            self.stats.seconds = time.monotonic() - start
+
+    def solve(self, cube):
+        """Find the shortest algorithm which solves the cube within the time
+        budget.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        best = None
+
+        for algorithm in self.solutions(cube):
+            best = algorithm
+
+        return best
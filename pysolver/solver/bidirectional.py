@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import numpy as np
+
+from .stats import SolveStats
+from ..cube.constants import SOLVED
+from ..cube.cube import Cube
+from ..cube.moves import FACE_MOVES, INVERSE, PERMUTATIONS, redundant
+from ..cube.symmetry import face_labels
+from ..util.algorithm import Algorithm
+
+
+# the bytes each state takes at the most, counting the states generated
+# while expanding a frontier.
+STATE_BYTES = 130
+
+# the most memory both searches may use together before the fallback solver
+# is used, which finds solutions of up to 10 moves. Every process solving
+# cubes holds its own search from the solved cube.
+MAX_MEMORY = 256 * 1024 * 1024
+
+# the most states both searches may hold together.
+MAX_STATES = MAX_MEMORY // STATE_BYTES
+
+# the stickers are padded to a multiple of eight so each state can be hashed
+# as 64-bit words.
+_WIDTH = 56
+
+# the gather which makes each face move on the padded stickers, the padding
+# stays where it is.
+_PERMUTATIONS = np.concatenate([PERMUTATIONS[:FACE_MOVES],
+                                np.tile(np.arange(len(SOLVED), _WIDTH), (FACE_MOVES, 1))], axis=1)
+
+# whether each face move is searched after each face move, the last row is
+# for the start of the search where there is no previous move.
+_ALLOWED = np.array([[not redundant(last, move) for move in range(FACE_MOVES)]
+                     for last in range(FACE_MOVES)] + [[True] * FACE_MOVES])
+
+# the odd multiplier of each 64-bit word of a state when it is hashed.
+_WEIGHTS = np.random.default_rng(0x5eed).integers(1, 1 << 63, _WIDTH // 8, dtype=np.uint64) | \
+    np.uint64(1)
+
+
+def _labels(state):
+    """Get the face of every sticker of a cube, padded so it can be hashed.
+    Every cube with the same stickers up to the colors looks the same, so
+    they all share the search from the solved cube.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+
+    Returns:
+        (np.array): The padded face labels.
+    """
+    labels = np.zeros(_WIDTH, dtype=np.uint8)
+    labels[:len(SOLVED)] = face_labels(state)
+
+    return labels
+
+
+def _hash(states):
+    """Hash many states at once, the hash may collide so states which share
+    one are checked before they are used in a solution.
+
+    Arguments:
+        states (np.ndarray): The padded face labels of each state.
+
+    Returns:
+        (np.ndarray): The 64-bit hash of each state.
+    """
+    words = states.view(np.uint64)
+    keys = words[:, 0] * _WEIGHTS[0]
+
+    for index in range(1, len(_WEIGHTS)):
+        keys += words[:, index] * _WEIGHTS[index]
+
+    # mix the high bits into the low bits, which only depend on a few words.
+    return keys ^ (keys >> np.uint64(29))
+
+
+def _matches(keys, other):
+    """Find the hashes which are in both of two sorted arrays, the smaller
+    one is looked up in the larger one since that is much quicker.
+
+    Arguments:
+        keys (np.ndarray): Sorted hashes without repeats.
+        other (np.ndarray): More sorted hashes without repeats.
+
+    Returns:
+        (tuple {np.ndarray}): The index of each match in keys and in other.
+    """
+    if len(keys) > len(other):
+        theirs, mine = _matches(other, keys)
+
+        return mine, theirs
+
+    index = np.minimum(np.searchsorted(other, keys), len(other) - 1)
+    mine = np.flatnonzero(other[index] == keys)
+
+    return mine, index[mine]
+
+
+class _Tree():
+    """A breadth first search from one cube, keeping every state it has
+    reached by its hash. Each depth of the search is kept sorted by hash so
+    that the other search can look states up in it, and only the states at
+    the deepest depth are kept in full so they can be expanded.
+
+    Arguments:
+        root (np.array): The padded face labels of the cube searched from.
+
+    Attributes:
+        root (np.array): The padded face labels of the cube searched from.
+        size (int): The number of states kept at every depth.
+        nodes (int): The number of states generated by expanding.
+        pruned (int): The number of generated states which were dropped
+            because they had been reached before.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.size = 1
+        self.nodes = 0
+        self.pruned = 0
+
+        self._states = root[None]
+        self._keys = [_hash(self._states)]
+        self._parents = [np.zeros(1, dtype=np.intp)]
+        self._moves = [np.array([FACE_MOVES], dtype=np.uint8)]
+
+    @property
+    def depth(self):
+        """Get the deepest depth the search has reached.
+
+        Returns:
+            (int): The depth.
+        """
+        return len(self._keys) - 1
+
+    def keys(self, depth):
+        """Get the hashes of the states reached at a depth.
+
+        Arguments:
+            depth (int): The depth of the search.
+
+        Returns:
+            (np.ndarray): The sorted hashes.
+        """
+        return self._keys[depth]
+
+    def children(self):
+        """Get the number of states expanding the deepest depth would
+        generate, before the ones reached before are dropped.
+
+        Returns:
+            (int): The number of states.
+        """
+        return int(_ALLOWED[self._moves[-1]].sum())
+
+    def expand(self):
+        """Search one move deeper, states already reached are dropped."""
+        allowed = _ALLOWED[self._moves[-1]]
+        states = np.empty((int(allowed.sum()), _WIDTH), dtype=np.uint8)
+        parents, moves = [], []
+        start = 0
+
+        for move in range(FACE_MOVES):
+            rows = np.flatnonzero(allowed[:, move])
+
+            # taking the rows then the columns is several times quicker than
+            # indexing both at once.
+            np.take(self._states.take(rows, axis=0), _PERMUTATIONS[move], axis=1,
+                    out=states[start:start + len(rows)], mode='wrap')
+
+            parents.append(rows)
+            moves.append(np.full(len(rows), move, dtype=np.uint8))
+            start += len(rows)
+
+        self.nodes += len(states)
+
+        # each depth is kept sorted by hash, the first of each run of equal
+        # hashes is kept.
+        keys = _hash(states)
+        order = np.argsort(keys)
+        keys = keys[order]
+        first = np.ones(len(keys), dtype=bool)
+        np.not_equal(keys[1:], keys[:-1], out=first[1:])
+
+        # a state one move deeper than another can only be reached at the
+        # same depth or the depth before it.
+        first &= ~self._contains(keys, self.depth)
+
+        if self.depth > 0:
+            first &= ~self._contains(keys, self.depth - 1)
+
+        order = order[first]
+        self.pruned += len(states) - len(order)
+        self.size += len(order)
+
+        self._states = states.take(order, axis=0)
+        self._keys.append(keys[first])
+        self._parents.append(np.concatenate(parents)[order])
+        self._moves.append(np.concatenate(moves)[order])
+
+    def _contains(self, keys, depth):
+        """Check which hashes were reached at a depth.
+
+        Arguments:
+            keys (np.ndarray): The hashes to look up.
+            depth (int): The depth of the search.
+
+        Returns:
+            (np.ndarray): True for each hash reached at the depth.
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        found[_matches(keys, self._keys[depth])[0]] = True
+
+        return found
+
+    def meetings(self, depth, other, other_depth):
+        """Find the states at a depth of this search which the other search
+        reached at any depth up to a limit.
+
+        Arguments:
+            depth (int): The depth of this search.
+            other (_Tree): The other search.
+            other_depth (int): The deepest depth of the other search to look
+                at.
+
+        Returns:
+            (list {tuple}): The index of each state in this search, with the
+                depth and index of the same state in the other search.
+        """
+        found = []
+
+        for deepest in range(other_depth + 1):
+            for mine, theirs in zip(*_matches(self._keys[depth], other.keys(deepest))):
+                found.append((int(mine), deepest, int(theirs)))
+
+        return found
+
+    def path(self, depth, index):
+        """Get the moves which reach a state from the cube searched from.
+
+        Arguments:
+            depth (int): The depth of the state.
+            index (int): The position of the state in that depth.
+
+        Returns:
+            (list {int}): The move ids.
+        """
+        moves = []
+
+        for level in range(depth, 0, -1):
+            moves.append(int(self._moves[level][index]))
+            index = self._parents[level][index]
+
+        return moves[::-1]
+
+
+class BidirectionalSolver():
+    """Find the shortest solution of a cube which is only a few moves from
+    solved by searching forwards from the cube and backwards from the solved
+    cube at the same time, until the two searches reach the same state. Each
+    search only has to go half as deep as a search from one side, which is
+    far fewer states for short scrambles.
+
+    The search from the solved cube is the same for every cube, so it is
+    kept between solves until clear is called. Cubes which need more states
+    than max_states are solved by the fallback solver instead.
+
+    Arguments:
+        max_states (int): The most states both searches may hold, each takes
+            up to STATE_BYTES.
+        fallback (function): Creates the solver used for cubes which are too
+            far from solved, defaults to TwoPhaseSolver.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, with the stages
+            of the fallback solver after the meet stage when it was
+            used.
+    """
+    def __init__(self, max_states=MAX_STATES, fallback=None):
+        self.max_states = max_states
+        self.stats = SolveStats()
+
+        self._create_fallback = fallback
+        self._fallback = None
+        self._goal = None
+
+    def solve(self, cube):
+        """Find an algorithm which solves the cube, it is the shortest
+        possible unless the fallback solver was used.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        start = time.perf_counter()
+
+        stats = SolveStats()
+
+        with stats.stage('meet') as stage_stats:
+            solution = self._search(_labels(cube.state), stage_stats)
+
+        if solution is None:
+            solution = self._fallback_solver().solve(cube)
+            stats.stages += self._fallback.stats.stages
+        else:
+            solution = Algorithm.from_moves(solution)
+            stage_stats.moves = len(solution.moves)
+
+        stats.seconds = time.perf_counter() - start
+        self.stats = stats
+
+        return solution
+
+    def clear(self):
+        """Forget the search from the solved cube, freeing its memory. The
+        next solve starts it again.
+        """
+        self._goal = None
+
+    def _fallback_solver(self):
+        """Get the solver used for cubes which are too far from solved,
+        creating it the first time since it loads its own tables.
+
+        Returns:
+            (object): The solver.
+        """
+        if self._fallback is None and self._create_fallback is not None:
+            self._fallback = self._create_fallback()
+        elif self._fallback is None:
+            from .twophase.solver import TwoPhaseSolver
+            self._fallback = TwoPhaseSolver()
+
+        return self._fallback
+
+    def _search(self, start, stats):
+        """Deepen the search from the cube and the search from the solved
+        cube in turn until they meet. Each time a search is deepened its new
+        states are looked up in every depth the other has reached, so the
+        first time they meet is at the shortest solution. States are matched
+        by their hashes, so the searches go on when every match was a
+        collision.
+
+        Arguments:
+            start (np.array): The padded face labels of the cube.
+            stats (StageStats): Where the statistics of the search are
+                recorded.
+
+        Returns:
+            (list {int}): The move ids of the shortest solution, or None if
+                the searches would need more than max_states.
+        """
+        if self._goal is None:
+            self._goal = _Tree(_labels(Cube(SOLVED).state))
+
+        forward, goal = _Tree(start), self._goal
+        goal_nodes, goal_pruned = goal.nodes, goal.pruned
+
+        # the goal search may already be deeper from earlier solves, only the
+        # depths up to goal_depth have been looked at for this cube.
+        goal_depth = 0
+        meetings = [(0, mine, depth, index) for mine, depth, index in goal.meetings(0, forward, 0)]
+        solution = self._shortest(forward, goal, start, meetings)
+
+        try:
+            while solution is None:
+                # both searches grow at the same rate, the search from the
+                # solved cube is deepened first since it is kept for later
+                # solves and may already be deeper.
+                deepen_goal = goal_depth <= forward.depth
+
+                if deepen_goal and goal.depth > goal_depth:
+                    cost = 0
+                else:
+                    cost = goal.children() if deepen_goal else forward.children()
+
+                if forward.size + goal.size + cost > self.max_states:
+                    return None
+
+                if deepen_goal:
+                    if goal.depth == goal_depth:
+                        goal.expand()
+
+                    goal_depth += 1
+                    meetings = [(depth, index, goal_depth, mine) for mine, depth, index in
+                                goal.meetings(goal_depth, forward, forward.depth)]
+                else:
+                    forward.expand()
+                    meetings = [(forward.depth, mine, depth, index) for mine, depth, index in
+                                forward.meetings(forward.depth, goal, goal_depth)]
+
+                solution = self._shortest(forward, goal, start, meetings)
+        finally:
+            stats.nodes = forward.nodes + goal.nodes - goal_nodes
+            stats.pruned = forward.pruned + goal.pruned - goal_pruned
+            stats.depth = forward.depth + goal_depth
+
+        return solution
+
+    @staticmethod
+    def _shortest(forward, goal, start, meetings):
+        """Join the two halves of the solutions where the searches met and
+        get the shortest one which really solves the cube, states are only
+        matched by their hashes.
+
+        Arguments:
+            forward (_Tree): The search from the cube.
+            goal (_Tree): The search from the solved cube.
+            start (np.array): The padded face labels of the cube.
+            meetings (list {tuple}): The depth and index of each state where
+                the searches met, in the search from the cube and then the
+                search from the solved cube.
+
+        Returns:
+            (list {int}): The move ids of the solution, or None if there
+                were no meetings or every one was a hash collision.
+        """
+        for depth, index, goal_depth, goal_index in sorted(meetings, key=lambda m: m[0] + m[2]):
+            moves = forward.path(depth, index) + \
+                [INVERSE[move] for move in reversed(goal.path(goal_depth, goal_index))]
+
+            state = start
+
+            for move in moves:
+                state = state[_PERMUTATIONS[move]]
+
+            if (state == goal.root).all():
+                return moves
+
+        return None
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import collections
+import sqlite3
+import time
+
+from .stats import SolveStats
+from ..cube.symmetry import canonical, symmetries, transform_algorithm
+from ..util.algorithm import Algorithm
+
+
+# the number of solutions kept in memory.
+CACHE_SIZE = 65536
+
+
+def cache_key(name, cube):
+    """Work out the key a cube's solution is cached under, cubes which are a
+    rotation, mirror image or recoloring of each other share a key. Solvers
+    find different solutions so each keeps its own entries.
+
+    Arguments:
+        name (str): The name of the solver class e.g. CFOPSolver.
+        cube (Cube): The cube.
+
+    Returns:
+        (tuple): The key and the symmetry which takes the cube to the cube
+            the key describes.
+    """
+    key, symmetry = canonical(cube)
+
+    return f'{name}:{key}', symmetry
+
+
+def to_canonical(algorithm, symmetry):
+    """Turn the solution of a cube into the solution of the cube its key
+    describes, which is what the cache holds.
+
+    Arguments:
+        algorithm (Algorithm): The solution of the cube.
+        symmetry (int): The symmetry given by cache_key.
+
+    Returns:
+        (Algorithm): The solution to cache.
+    """
+    return transform_algorithm(algorithm, symmetry)
+
+
+def from_canonical(algorithm, symmetry):
+    """Turn a cached solution back into the solution of a cube, the reverse
+    of to_canonical.
+
+    Arguments:
+        algorithm (Algorithm): The cached solution.
+        symmetry (int): The symmetry given by cache_key.
+
+    Returns:
+        (Algorithm): The solution of the cube.
+    """
+    return transform_algorithm(algorithm, symmetries().inverses[symmetry])
+
+
+class SolutionCache():
+    """Remember solutions by key, the most recently used solutions are kept
+    in memory and every solution can also be kept in an SQLite database so
+    that it survives between runs and is shared between processes. It may
+    be used from any thread, but only from one at a time.
+
+    Arguments:
+        path (str): The path of the SQLite database, or None to only keep
+            solutions in memory.
+        size (int): The number of solutions kept in memory.
+
+    Attributes:
+        hits (int): The number of lookups which found a solution.
+        misses (int): The number of lookups which didn't.
+    """
+    def __init__(self, path=None, size=CACHE_SIZE):
+        self.hits = 0
+        self.misses = 0
+
+        self._size = size
+        self._memory = collections.OrderedDict()
+        self._database = None
+
+        if path is not None:
+            self._database = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                             check_same_thread=False)
+            self._database.execute('CREATE TABLE IF NOT EXISTS solutions '
+                                   '(key TEXT PRIMARY KEY, solution TEXT NOT NULL)')
+
+    def get(self, key):
+        """Look up a solution.
+
+        Arguments:
+            key (str): The key the solution was stored under.
+
+        Returns:
+            (Algorithm): The solution, or None if it isn't in the cache.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+
+            return self._memory[key]
+
+        row = None
+
+        if self._database is not None:
+            row = self._database.execute('SELECT solution FROM solutions WHERE key = ?',
+                                         (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._remember(key, Algorithm(row[0]))
+
+        return self._memory[key]
+
+    def put(self, key, algorithm):
+        """Store a solution.
+
+        Arguments:
+            key (str): The key to store the solution under.
+            algorithm (Algorithm): The solution.
+        """
+        self._remember(key, algorithm)
+
+        if self._database is not None:
+            self._database.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?)',
+                                   (key, str(algorithm)))
+
+    def close(self):
+        """Close the database."""
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def _remember(self, key, algorithm):
+        """Keep a solution in memory, forgetting the least recently used one
+        if the cache is full.
+
+        Arguments:
+            key (str): The key of the solution.
+            algorithm (Algorithm): The solution.
+        """
+        self._memory[key] = algorithm
+        self._memory.move_to_end(key)
+
+        if len(self._memory) > self._size:
+            self._memory.popitem(last=False)
+
+
+class CachedSolver():
+    """Answer cubes from a solution cache before asking a solver. Cubes are
+    looked up by their canonical key, so a cube which is a rotation, mirror
+    image or recoloring of one solved before is answered by transforming
+    the cached solution.
+
+    Arguments:
+        solver (object): The solver to use when the cache misses.
+        cache (SolutionCache): The cache, an in memory cache by default.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, those of the
+            solver when the cache missed.
+    """
+    def __init__(self, solver, cache=None):
+        self.solver = solver
+        self.cache = SolutionCache() if cache is None else cache
+        self.stats = SolveStats()
+
+        self._name = type(solver).__name__
+
+    def solve(self, cube):
+        """Find an algorithm which solves the cube.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        start = time.perf_counter()
+
+        key, symmetry = cache_key(self._name, cube)
+        algorithm = self.cache.get(key)
+
+        if algorithm is not None:
+            self.stats = SolveStats()
+            self.stats.cache_hits = 1
+            self.stats.seconds = time.perf_counter() - start
+
+            return from_canonical(algorithm, symmetry)
+
+        algorithm = self.solver.solve(cube)
+        self.cache.put(key, to_canonical(algorithm, symmetry))
+
+        self.stats = self.solver.stats
+        self.stats.cache_misses = 1
+        self.stats.seconds = time.perf_counter() - start
+
+        return algorithm
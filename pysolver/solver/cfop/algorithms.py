@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+# the 57 algorithms which orient the last layer, numbered as usual.
+OLL = (
+    ('OLL 1', "R U2 R2 F R F' U2 R' F R F'"),
+    ('OLL 2', "r U r' U2 r U2 R' U2 R U' r'"),
+    ('OLL 3', "f R U R' U' f' U' F R U R' U' F'"),
+    ('OLL 4', "f R U R' U' f' U F R U R' U' F'"),
+    ('OLL 5', "l' U2 L U L' U l"),
+    ('OLL 6', "r U2 R' U' R U' r'"),
+    ('OLL 7', "r U R' U R U2 r'"),
+    ('OLL 8', "l' U' L U' L' U2 l"),
+    ('OLL 9', "R U R' U' R' F R2 U R' U' F'"),
+    ('OLL 10', "R U R' U R' F R F' R U2 R'"),
+    ('OLL 11', "r U R' U R' F R F' R U2 r'"),
+    ('OLL 12', "M' R' U' R U' R' U2 R U' R r'"),
+    ('OLL 13', "F U R U' R2 F' R U R U' R'"),
+    ('OLL 14', "R' F R U R' F' R F U' F'"),
+    ('OLL 15', "l' U' l L' U' L U l' U l"),
+    ('OLL 16', "r U r' R U R' U' r U' r'"),
+    ('OLL 17', "F R' F' R2 r' U R U' R' U' M'"),
+    ('OLL 18', "r U R' U R U2 r2 U' R U' R' U2 r"),
+    ('OLL 19', "r' R U R U R' U' M' R' F R F'"),
+    ('OLL 20', "r U R' U' M2 U R U' R' U' M'"),
+    ('OLL 21', "R U2 R' U' R U R' U' R U' R'"),
+    ('OLL 22', "R U2 R2 U' R2 U' R2 U2 R"),
+    ('OLL 23', "R2 D' R U2 R' D R U2 R"),
+    ('OLL 24', "r U R' U' r' F R F'"),
+    ('OLL 25', "F' r U R' U' r' F R"),
+    ('OLL 26', "R U2 R' U' R U' R'"),
+    ('OLL 27', "R U R' U R U2 R'"),
+    ('OLL 28', "r U R' U' r' R U R U' R'"),
+    ('OLL 29', "R U R' U' R U' R' F' U' F R U R'"),
+    ('OLL 30', "F R' F R2 U' R' U' R U R' F2"),
+    ('OLL 31', "R' U' F U R U' R' F' R"),
+    ('OLL 32', "L U F' U' L' U L F L'"),
+    ('OLL 33', "R U R' U' R' F R F'"),
+    ('OLL 34', "R U R2 U' R' F R U R U' F'"),
+    ('OLL 35', "R U2 R2 F R F' R U2 R'"),
+    ('OLL 36', "L' U' L U' L' U L U L F' L' F"),
+    ('OLL 37', "F R' F' R U R U' R'"),
+    ('OLL 38', "R U R' U R U' R' U' R' F R F'"),
+    ('OLL 39', "L F' L' U' L U F U' L'"),
+    ('OLL 40', "R' F R U R' U' F' U R"),
+    ('OLL 41', "R U R' U R U2 R' F R U R' U' F'"),
+    ('OLL 42', "R' U' R U' R' U2 R F R U R' U' F'"),
+    ('OLL 43', "F' U' L' U L F"),
+    ('OLL 44', "F U R U' R' F'"),
+    ('OLL 45', "F R U R' U' F'"),
+    ('OLL 46', "R' U' R' F R F' U R"),
+    ('OLL 47', "R' U' R' F R F' R' F R F' U R"),
+    ('OLL 48', "F R U R' U' R U R' U' F'"),
+    ('OLL 49', "r U' r2 U r2 U r2 U' r"),
+    ('OLL 50', "r' U r2 U' r2 U' r2 U r'"),
+    ('OLL 51', "F U R U' R' U R U' R' F'"),
+    ('OLL 52', "R U R' U R U' B U' B' R'"),
+    ('OLL 53', "l' U2 L U L' U' L U L' U l"),
+    ('OLL 54', "r U2 R' U' R U R' U' R U' r'"),
+    ('OLL 55', "R' F R U R U' R2 F' R2 U' R' U R U R'"),
+    ('OLL 56', "r' U' r U' R' U R U' R' U R r' U r"),
+    ('OLL 57', "R U R' U' M' U R U' r'")
+)
+
+# the 21 algorithms which permute the last layer once it is oriented.
+PLL = (
+    ('Aa', "x R' U R' D2 R U' R' D2 R2 x'"),
+    ('Ab', "x R2 D2 R U R' D2 R U' R x'"),
+    ('E', "x' R U' R' D R U R' D' R U R' D R U' R' D' x"),
+    ('F', "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R"),
+    ('Ga', "R2 U R' U R' U' R U' R2 U' D R' U R D'"),
+    ('Gb', "R' U' R U D' R2 U R' U R U' R U' R2 D"),
+    ('Gc', "R2 U' R U' R U R' U R2 U D' R U' R' D"),
+    ('Gd', "R U R' U' D R2 U' R U' R' U R' U R2 D'"),
+    ('H', "M2 U M2 U2 M2 U M2"),
+    ('Ja', "R' U L' U2 R U' R' U2 R L"),
+    ('Jb', "R U R' F' R U R' U' R' F R2 U' R'"),
+    ('Na', "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'"),
+    ('Nb', "R' U R U' R' F' U' F R U R' F R' F' R U' R"),
+    ('Ra', "R U' R' U' R U R D R' U' R D' R' U2 R'"),
+    ('Rb', "R2 F R U R U' R' F' R U2 R' U2 R"),
+    ('T', "R U R' U' R' F R2 U' R' U' R U R' F'"),
+    ('Ua', "M2 U M U2 M' U M2"),
+    ('Ub', "M2 U' M U2 M' U' M2"),
+    ('V', "R' U R' U' R D' R' D R' U D' R2 U' R2 D R2"),
+    ('Y', "F R U' R' U' R U R' F' R U R' U' R' F R F'"),
+    ('Z', "M' U M2 U M2 U M' U2 M2")
+)
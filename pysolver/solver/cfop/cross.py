@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+
+from ...cube.cubie import EDGES, EDGE_MOVES, edge_coordinate
+from ..tables import build_distance_table, load_table
+from ...cube.moves import FACE_MOVES, redundant
+from ...util.algorithm import Algorithm
+
+
+# the edges which make up the cross on the down face.
+CROSS_EDGES = tuple(EDGES.index(edge) for edge in ('DR', 'DF', 'DL', 'DB'))
+
+# every cross can be solved in at most eight moves.
+MAX_DEPTH = 8
+
+# the number of coordinates a single edge can have.
+_EDGE_STATES = EDGE_MOVES.shape[0]
+
+
+def cross_index(coordinates):
+    """Combine the coordinates of the four cross edges into a single index
+    into the pruning table.
+
+    Arguments:
+        coordinates (iterable {int}): The coordinate of each cross edge.
+
+    Returns:
+        (int): The index of the cross state.
+    """
+    index = 0
+
+    for coordinate in coordinates:
+        index = index * _EDGE_STATES + coordinate
+
+    return index
+
+
+def build_pruning_table():
+    """Work out the exact number of moves needed to solve every possible
+    cross using a breadth first search out from the solved cross.
+
+    Returns:
+        (np.array): The distance to a solved cross, indexed by cross_index.
+    """
+    return build_distance_table((EDGE_MOVES,) * len(CROSS_EDGES),
+                                tuple(edge * 2 for edge in CROSS_EDGES))
+
+
+@functools.lru_cache(maxsize=None)
+def pruning_table():
+    """Get the cross pruning table from the table store, it is only built
+    when it hasn't been saved yet.
+
+    Returns:
+        (np.array): The distance to a solved cross, indexed by cross_index.
+    """
+    return load_table('cross', build_pruning_table)
+
+
+class CrossSolver():
+    """Solve the cross on the down face of the cube using an iterative
+    deepening A* search. The pruning table holds the exact distance of every
+    cross state, so the search finds an optimal cross while only expanding
+    the nodes along the solution.
+
+    Attributes:
+        nodes (int): The number of nodes expanded during the last solve.
+        pruned (int): The number of nodes cut off by the pruning table.
+        depth (int): The depth of the last iteration of the search.
+    """
+    def __init__(self):
+        self.nodes = 0
+        self.pruned = 0
+        self.depth = 0
+        self._table = pruning_table()
+
+    def solve(self, cube):
+        """Find the shortest algorithm which solves the cross.
+
+        Arguments:
+            cube (Cube): The cube to solve the cross on.
+
+        Returns:
+            (Algorithm): The moves which solve the cross.
+        """
+        coordinates = tuple(edge_coordinate(cube.state, edge) for edge in CROSS_EDGES)
+
+        self.nodes = 0
+        self.pruned = 0
+        path = []
+
+        for depth in range(self._table[cross_index(coordinates)], MAX_DEPTH + 1):
+            self.depth = depth
+
+            if self._search(coordinates, depth, None, path):
+                break
+
+        return Algorithm.from_moves(path)
+
+    def _search(self, coordinates, depth, last, path):
+        """Depth limited search which is cut off as soon as the pruning table
+        shows that the cross can't be solved in the remaining moves.
+
+        Arguments:
+            coordinates (tuple {int}): The coordinate of each cross edge.
+            depth (int): The number of moves left before the cut off.
+            last (int): The move id of the previous move, or None.
+            path (list {int}): The moves made so far, the solution is left in
+                here when one is found.
+
+        Returns:
+            (bool): True if the cross was solved.
+        """
+        self.nodes += 1
+
+        distance = self._table[cross_index(coordinates)]
+
+        if distance == 0:
+            return True
+
+        if distance > depth:
+            self.pruned += 1
+            return False
+
+        for move in range(FACE_MOVES):
+            if last is not None and redundant(last, move):
+                continue
+
+            path.append(move)
+
+            if self._search(tuple(EDGE_MOVES[c, move] for c in coordinates),
+                            depth - 1, move, path):
+                return True
+
+            path.pop()
+
+        return False
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+import heapq
+
+import numpy as np
+
+from .cross import CROSS_EDGES
+from ...cube.cubie import (CORNERS, EDGES, CORNER_FACELETS, EDGE_FACELETS,
+                           CORNER_MOVES, EDGE_MOVES, CENTERS, corner_coordinate,
+                           edge_coordinate)
+from ...cube.moves import FACE_MOVES, INVERSE, MOVES
+from ...util.algorithm import Algorithm, compile_algorithm, simplify_moves
+
+
+# the corner and edge which make up each first two layers pair.
+PAIRS = tuple((CORNERS.index(corner), EDGES.index(edge)) for corner, edge in
+              (('DFR', 'FR'), ('DLF', 'FL'), ('DBL', 'BL'), ('DRB', 'BR')))
+
+# the number of coordinates a single corner or edge can have.
+_CORNER_STATES = CORNER_MOVES.shape[0]
+_EDGE_STATES = EDGE_MOVES.shape[0]
+
+# turns of the up face which are used to line up a pair before a trigger.
+_U_TURNS = tuple((MOVES[name],) for name in ('U', "U'", 'U2'))
+
+
+def _stickers(pair):
+    """Get the indices of the stickers owned by a pair.
+
+    Arguments:
+        pair (int): The index of the pair in PAIRS.
+
+    Returns:
+        (set {int}): The sticker indices of the pairs corner and edge slots.
+    """
+    corner, edge = PAIRS[pair]
+
+    return set(CORNER_FACELETS[corner]) | set(EDGE_FACELETS[edge])
+
+
+def _build_triggers():
+    """Find the short sequences of the form X U X' which lift a single pair
+    out of its slot while leaving the cross and the other three pairs alone.
+
+    Returns:
+        (tuple {tuple {tuple {int}}}): The triggers for each pair.
+    """
+    cross = set(CENTERS.values())
+
+    for edge in CROSS_EDGES:
+        cross |= set(EDGE_FACELETS[edge])
+
+    triggers = tuple([] for _ in PAIRS)
+
+    for move in range(FACE_MOVES):
+        if move // 3 in (MOVES['U'] // 3, MOVES['D'] // 3):
+            continue
+
+        for (turn,) in _U_TURNS:
+            trigger = (move, turn, INVERSE[move])
+            moved = {sticker for sticker, source in enumerate(
+                compile_algorithm(str(Algorithm.from_moves(trigger))))
+                if sticker != source}
+
+            disturbed = [pair for pair in range(len(PAIRS)) if moved & _stickers(pair)]
+
+            if not moved & cross and len(disturbed) == 1:
+                triggers[disturbed[0]].append(trigger)
+
+    return tuple(tuple(pair_triggers) for pair_triggers in triggers)
+
+
+# the triggers which only disturb each pair.
+TRIGGERS = _build_triggers()
+
+
+def pair_index(corner, edge):
+    """Combine the coordinates of a corner and edge into a single index.
+
+    Arguments:
+        corner (int): The coordinate of the corner.
+        edge (int): The coordinate of the edge.
+
+    Returns:
+        (int): The index of the pair state.
+    """
+    return corner * _EDGE_STATES + edge
+
+
+@functools.lru_cache(maxsize=None)
+def _transitions(sequences):
+    """Work out the new pair state after each sequence for every pair state.
+
+    Arguments:
+        sequences (tuple {tuple {int}}): The move ids of each sequence.
+
+    Returns:
+        (tuple {list {int}}): The next pair index after each sequence,
+            indexed by the current pair index.
+    """
+    corners, edges = np.divmod(np.arange(_CORNER_STATES * _EDGE_STATES), _EDGE_STATES)
+    transitions = []
+
+    for sequence in sequences:
+        corner, edge = corners, edges
+
+        for move in sequence:
+            corner, edge = CORNER_MOVES[corner, move], EDGE_MOVES[edge, move]
+
+        transitions.append(pair_index(corner, edge).tolist())
+
+    return tuple(transitions)
+
+
+def _shortest_paths(start, sequences, goal=None):
+    """Find the fewest moves from a pair state to every other pair state
+    using Dijkstra's algorithm where each sequence costs its length.
+
+    Arguments:
+        start (int): The pair index to search from.
+        sequences (tuple {tuple {int}}): The sequences which can be used.
+        goal (int): Stop as soon as this pair index is reached.
+
+    Returns:
+        (tuple): The parent of each reached pair index along with the
+            sequence that reached it, and the number of states expanded.
+    """
+    transitions = _transitions(sequences)
+    distance = {start: 0}
+    parent = {start: None}
+    queue = [(0, start)]
+    expanded = 0
+
+    while queue:
+        cost, index = heapq.heappop(queue)
+
+        if cost > distance[index]:
+            continue
+
+        expanded += 1
+
+        if index == goal:
+            break
+
+        for sequence, transition in zip(sequences, transitions):
+            reached = transition[index]
+
+            if cost + len(sequence) < distance.get(reached, cost + len(sequence) + 1):
+                distance[reached] = cost + len(sequence)
+                parent[reached] = (index, sequence)
+                heapq.heappush(queue, (cost + len(sequence), reached))
+
+    return parent, expanded
+
+
+def _unwind(parent, index):
+    """Follow the parents back to the start of a search.
+
+    Arguments:
+        parent (dict): The parent and sequence for each reached index.
+        index (int): The index to start from.
+
+    Returns:
+        (list {int}): The moves from the start of the search to the index.
+    """
+    moves = []
+
+    while parent[index] is not None:
+        index, sequence = parent[index]
+        moves = list(sequence) + moves
+
+    return moves
+
+
+@functools.lru_cache(maxsize=None)
+def case_table(pair):
+    """Build the lookup from every pair state which can be solved using only
+    the up face and the pairs own triggers, to the moves which solve it.
+    The sequences are all self inverting in their set, so searching out from
+    the solved pair and inverting the path gives the solution.
+
+    Arguments:
+        pair (int): The index of the pair in PAIRS.
+
+    Returns:
+        (tuple): The solving moves for each pair index, or None where the
+            pair needs to be freed from another slot first.
+    """
+    corner, edge = PAIRS[pair]
+    parent, _ = _shortest_paths(pair_index(corner * 3, edge * 2), _U_TURNS + TRIGGERS[pair])
+
+    table = [None] * (_CORNER_STATES * _EDGE_STATES)
+
+    for index in parent:
+        table[index] = tuple(INVERSE[move] for move in reversed(_unwind(parent, index)))
+
+    return tuple(table)
+
+
+class F2LSolver():
+    """Solve the first two layers of the cube once the cross is solved. Each
+    pair is looked up in a precomputed case table, and only pairs which are
+    stuck in another slot fall back to a search. The next pair is always the
+    one which takes the fewest moves.
+
+    Attributes:
+        nodes (int): The number of states expanded by fallback searches during
+            the last solve.
+    """
+    def __init__(self):
+        self.nodes = 0
+        self._tables = tuple(case_table(pair) for pair in range(len(PAIRS)))
+
+    def solve(self, cube):
+        """Find an algorithm which solves all four pairs.
+
+        Arguments:
+            cube (Cube): The cube to solve, the cross must already be solved.
+
+        Returns:
+            (Algorithm): The moves which solve the first two layers.
+        """
+        cube = cube.copy()
+        solution = []
+
+        self.nodes = 0
+
+        while True:
+            indices = [pair_index(corner_coordinate(cube.state, corner),
+                                  edge_coordinate(cube.state, edge))
+                       for corner, edge in PAIRS]
+
+            unsolved = [pair for pair, (corner, edge) in enumerate(PAIRS)
+                        if indices[pair] != pair_index(corner * 3, edge * 2)]
+
+            if not unsolved:
+                break
+
+            moves = min((self._solve_pair(pair, indices[pair], unsolved)
+                         for pair in unsolved), key=len)
+
+            cube.do_algorithm(Algorithm.from_moves(moves))
+            solution += moves
+
+        return Algorithm.from_moves(simplify_moves(solution))
+
+    def _solve_pair(self, pair, index, unsolved):
+        """Find the moves which solve a single pair without breaking the cross
+        or any solved pair.
+
+        Arguments:
+            pair (int): The index of the pair in PAIRS.
+            index (int): The current pair index.
+            unsolved (list {int}): The pairs which haven't been solved yet.
+
+        Returns:
+            (list {int}): The moves which solve the pair.
+        """
+        if self._tables[pair][index] is not None:
+            return list(self._tables[pair][index])
+
+        # the pair is stuck in another slot, so the triggers of any unsolved
+        # slot can be used to free it.
+        sequences = _U_TURNS + sum((TRIGGERS[other] for other in unsolved), ())
+        corner, edge = PAIRS[pair]
+
+        parent, expanded = _shortest_paths(index, sequences, pair_index(corner * 3, edge * 2))
+        self.nodes += expanded
+
+        return _unwind(parent, pair_index(corner * 3, edge * 2))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+
+import numpy as np
+
+from .algorithms import OLL, PLL
+from ...cube.constants import UP, SOLVED
+from ...cube.cube import Cube, InvalidCubeString
+from ...cube.cubie import CENTERS, face_colors
+from ...cube.moves import INVERSE, LAYER_STICKERS, MOVES
+from ...util.algorithm import Algorithm, simplify_moves
+
+
+# the stickers on the last layer, both on the up face and around its sides.
+LAST_LAYER = np.array(sorted(LAYER_STICKERS[tuple(UP)]))
+
+# the ways the up face can be turned to line up a case, including no turn.
+_AUF = ((), (MOVES['U'],), (MOVES['U2'],), (MOVES["U'"],))
+
+
+def oll_key(state):
+    """Hash the orientation of the last layer, which is the pattern of
+    stickers showing the up color.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+
+    Returns:
+        (bytes): The orientation pattern of the last layer.
+    """
+    return (state[LAST_LAYER] == state[CENTERS['U']]).tobytes()
+
+
+def pll_key(state):
+    """Hash the permutation of the last layer, which is the face each last
+    layer sticker belongs to.
+
+    Arguments:
+        state (np.array): The sticker colors of a cube.
+
+    Returns:
+        (bytes): The face of each sticker on the last layer.
+    """
+    faces = np.zeros(256, dtype=np.uint8)
+    faces[list(face_colors(state).values())] = np.arange(len(CENTERS))
+
+    return faces[state[LAST_LAYER]].tobytes()
+
+
+def _build_table(algorithms, key):
+    """Build the lookup from the hash of every case, in every orientation of
+    the up face, to the algorithm which solves it.
+
+    Arguments:
+        algorithms (tuple): The name and notation of each algorithm.
+        key (function): Hashes the last layer of a cube.
+
+    Returns:
+        (dict): Lookup from a hash to the algorithm which solves it.
+    """
+    table = {}
+    solved = Cube(SOLVED)
+
+    for _, notation in (('solved', ''),) + algorithms:
+        algorithm = Algorithm(notation)
+
+        # the case is made by undoing the moves, the algorithm and the turn
+        # after it are undone first so they are shared by every turn before.
+        cases = []
+
+        for after in _AUF:
+            cases.append(solved.copy())
+
+            for move in reversed(algorithm.moves + after):
+                cases[-1].push_move(INVERSE[move])
+
+        for before in _AUF:
+            for after, case in zip(_AUF, cases):
+                moves = simplify_moves(before + algorithm.moves + after)
+                cube = case.copy()
+
+                for move in reversed(before):
+                    cube.push_move(INVERSE[move])
+
+                if len(table.get(key(cube.state), moves)) >= len(moves):
+                    table[key(cube.state)] = moves
+
+    return {case: Algorithm.from_moves(moves) for case, moves in table.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def oll_table():
+    """Get the lookup from every orientation of the last layer to the
+    algorithm which orients it, building it the first time it is used.
+
+    Returns:
+        (dict): Lookup from oll_key to an algorithm.
+    """
+    return _build_table(OLL, oll_key)
+
+
+@functools.lru_cache(maxsize=None)
+def pll_table():
+    """Get the lookup from every permutation of an oriented last layer to the
+    algorithm which solves it, building it the first time it is used.
+
+    Returns:
+        (dict): Lookup from pll_key to an algorithm.
+    """
+    return _build_table(PLL, pll_key)
+
+
+class OLLSolver():
+    """Orient the last layer once the first two layers are solved. The case
+    is recognised with a single lookup of its sticker pattern.
+    """
+    def __init__(self):
+        self._table = oll_table()
+
+    def solve(self, cube):
+        """Find the algorithm which orients the last layer.
+
+        Arguments:
+            cube (Cube): The cube to solve, the first two layers must already
+                be solved.
+
+        Returns:
+            (Algorithm): The moves which orient the last layer.
+        """
+        try:
+            return self._table[oll_key(cube.state)]
+        except KeyError:
+            raise InvalidCubeString from None
+
+
+class PLLSolver():
+    """Permute the last layer once it has been oriented. The case and the
+    turns of the up face needed before and after it are recognised with a
+    single lookup of its sticker pattern.
+    """
+    def __init__(self):
+        self._table = pll_table()
+
+    def solve(self, cube):
+        """Find the algorithm which solves the last layer.
+
+        Arguments:
+            cube (Cube): The cube to solve, the last layer must already be
+                oriented.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        try:
+            return self._table[pll_key(cube.state)]
+        except KeyError:
+            raise InvalidCubeString from None
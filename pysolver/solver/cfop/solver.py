@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from .cross import CrossSolver
+from .f2l import F2LSolver
+from .ll import OLLSolver, PLLSolver
+from ..stats import SolveStats
+from ...util.algorithm import Algorithm, simplify_moves
+
+
+# the name of each stage of the method, in the order they are solved.
+STAGES = ('cross', 'f2l', 'oll', 'pll')
+
+# the solver of each stage, in the same order as STAGES.
+_STAGE_SOLVERS = (CrossSolver, F2LSolver, OLLSolver, PLLSolver)
+
+
+class CFOPSolver():
+    """Solve a Rubik's cube using the CFOP method; cross, first two layers,
+    orientation of the last layer and then permutation of the last layer.
+
+    The solver of each stage is only created, which loads its tables, once
+    a cube reaches that stage.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, with a stage
+            for each of STAGES.
+    """
+    def __init__(self):
+        self.stats = SolveStats()
+        self._stages = [None] * len(STAGES)
+
+    def solve(self, cube):
+        """Find an algorithm which solves the cube.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        moves = []
+
+        for _, algorithm in self.solve_stages(cube):
+            moves += algorithm.moves
+
+        return Algorithm.from_moves(simplify_moves(moves))
+
+    def solve_stages(self, cube):
+        """Find the algorithm which solves each stage of the cube in turn.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (list {tuple}): The name of each stage from STAGES and the moves
+                which solve it.
+        """
+        cube = cube.copy()
+        stages = []
+
+        stats = SolveStats()
+        start = time.perf_counter()
+
+        for index, name in enumerate(STAGES):
+            stage = self._stage(index)
+
+            with stats.stage(name) as stage_stats:
+                algorithm = stage.solve(cube)
+
+            # the last layer stages are lookups so they have no counters.
+            stage_stats.nodes = getattr(stage, 'nodes', 0)
+            stage_stats.pruned = getattr(stage, 'pruned', 0)
+            stage_stats.depth = getattr(stage, 'depth', 0)
+            stage_stats.moves = len(algorithm.moves)
+
+            cube.do_algorithm(algorithm)
+            stages.append((name, algorithm))
+
+        stats.seconds = time.perf_counter() - start
+        self.stats = stats
+
+        return stages
+
+    def _stage(self, index):
+        """Get the solver of a stage, creating it the first time.
+
+        Arguments:
+            index (int): The position of the stage in STAGES.
+
+        Returns:
+            (object): The solver of the stage.
+        """
+        if self._stages[index] is None:
+            self._stages[index] = _STAGE_SOLVERS[index]()
+
+        return self._stages[index]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import contextlib
+import time
+
+
+# the functions called as each stage of a solve starts and stops, see
+# add_hook. Callers check the list is empty before doing anything so hooks
+# cost nothing while there aren't any.
+HOOKS = []
+
+
+def add_hook(hook):
+    """Call a function as each stage of a solve starts and stops e.g. to
+    label the samples taken by a sampling profiler.
+
+    Arguments:
+        hook (function): Called with the event, either start or stop, and
+            the name of the stage.
+    """
+    HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    """Stop calling a function added by add_hook.
+
+    Arguments:
+        hook (function): The function.
+    """
+    HOOKS.remove(hook)
+
+
+def notify(event, name):
+    """Call every hook.
+
+    Arguments:
+        event (str): Either start or stop.
+        name (str): The name of the stage.
+    """
+    for hook in HOOKS:
+        hook(event, name)
+
+
+class StageStats():
+    """Statistics about one stage of a solve.
+
+    Arguments:
+        name (str): The name of the stage e.g. cross.
+
+    Attributes:
+        seconds (float): The time spent in the stage.
+        nodes (int): The number of search nodes expanded.
+        pruned (int): The number of branches cut off by a pruning table.
+        depth (int): The deepest the search went.
+        moves (int): The number of moves in the stage's part of the
+            solution.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.nodes = 0
+        self.pruned = 0
+        self.depth = 0
+        self.moves = 0
+
+    def add(self, other):
+        """Add the statistics of the same stage from another search e.g.
+        from another worker process.
+
+        Arguments:
+            other (StageStats): The statistics to add.
+        """
+        self.seconds += other.seconds
+        self.nodes += other.nodes
+        self.pruned += other.pruned
+        self.depth = max(self.depth, other.depth)
+
+    def to_dict(self):
+        """Get the statistics in a form which can be written as JSON.
+
+        Returns:
+            (dict): Lookup from the attribute name to its value.
+        """
+        return {'name': self.name, 'seconds': self.seconds, 'nodes': self.nodes,
+                'pruned': self.pruned, 'depth': self.depth, 'moves': self.moves}
+
+
+class SolveStats():
+    """Statistics about a single solve, made up of the statistics of each of
+    its stages.
+
+    Attributes:
+        seconds (float): The time taken by the whole solve.
+        cache_hits (int): The number of solutions found in a cache.
+        cache_misses (int): The number of lookups which missed the cache.
+        stages (list {StageStats}): The statistics of each stage.
+    """
+    def __init__(self):
+        self.seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stages = []
+
+    @property
+    def nodes(self):
+        """Get the number of search nodes expanded by every stage.
+
+        Returns:
+            (int): The number of nodes.
+        """
+        return sum(stage.nodes for stage in self.stages)
+
+    @property
+    def pruned(self):
+        """Get the number of branches cut off by a pruning table in every
+        stage.
+
+        Returns:
+            (int): The number of branches.
+        """
+        return sum(stage.pruned for stage in self.stages)
+
+    @property
+    def depth(self):
+        """Get the deepest any stage's search went.
+
+        Returns:
+            (int): The depth.
+        """
+        return max((stage.depth for stage in self.stages), default=0)
+
+    def add_stage(self, name):
+        """Start recording the statistics of another stage.
+
+        Arguments:
+            name (str): The name of the stage.
+
+        Returns:
+            (StageStats): The statistics of the stage.
+        """
+        stage = StageStats(name)
+        self.stages.append(stage)
+
+        return stage
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a stage of the solve, calling the hooks as it starts and
+        stops.
+
+        Arguments:
+            name (str): The name of the stage.
+
+        Yields:
+            (StageStats): The statistics of the stage.
+        """
+        stage = self.add_stage(name)
+
+        if HOOKS:
+            notify('start', name)
+
+        start = time.perf_counter()
+
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - start
+
+            if HOOKS:
+                notify('stop', name)
+
+    def to_dict(self):
+        """Get the statistics in a form which can be written as JSON.
+
+        Returns:
+            (dict): The totals and the statistics of each stage.
+        """
+        return {'seconds': self.seconds, 'nodes': self.nodes, 'pruned': self.pruned,
+                'depth': self.depth, 'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'stages': [stage.to_dict() for stage in self.stages]}
+
+    def __str__(self):
+        """Get the statistics as a table with a row per stage.
+
+        Returns:
+            (str): The table.
+        """
+        rows = [('stage', 'seconds', 'nodes', 'pruned', 'depth', 'moves')]
+        rows += [(stage.name, f'{stage.seconds:.6f}', stage.nodes, stage.pruned, stage.depth,
+                  stage.moves) for stage in self.stages]
+        rows.append(('total', f'{self.seconds:.6f}', self.nodes, self.pruned, self.depth,
+                     sum(stage.moves for stage in self.stages)))
+
+        lines = ['{:<8}{:>12}{:>12}{:>12}{:>8}{:>8}'.format(*row) for row in rows]
+        lines.append(f'cache hits {self.cache_hits}, misses {self.cache_misses}')
+
+        return '\n'.join(lines)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..cube.moves import PERMUTATIONS
+
+
+# bump this whenever the layout of a table file changes.
+FORMAT_VERSION = 1
+
+# the environment variable which overrides where tables are stored.
+TABLE_DIR_VARIABLE = 'PYSOLVER_TABLE_DIR'
+
+# marks an entry in a distance table which hasn't been reached yet.
+UNVISITED = 255
+
+# table files start with a fixed size header; magic, format version, the
+# fingerprint of the table definition, dtype, number of dimensions, shape
+# and the CRC32 of the data. The data starts at a page friendly offset.
+_MAGIC = b'PYSOLVER'
+_HEADER = struct.Struct('<8sI32s8sI4QI')
+_HEADER_SIZE = 128
+
+# shared memory attached to by this process, kept open while its tables are
+# in use.
+_attached = []
+
+
+def table_directory():
+    """Get the directory which holds the table files.
+
+    Returns:
+        (str): The path of the table directory.
+    """
+    if os.environ.get(TABLE_DIR_VARIABLE):
+        return os.environ[TABLE_DIR_VARIABLE]
+
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(cache, 'pysolver')
+
+
+def fingerprint(name, version):
+    """Identify a table definition, the fingerprint changes whenever the
+    file format, the tables own version or the move definitions change.
+
+    Arguments:
+        name (str): The name of the table.
+        version (int): The version of the table builder.
+
+    Returns:
+        (bytes): The SHA-256 digest of the table definition.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{FORMAT_VERSION}:{name}:{version}:'.encode('ascii'))
+    digest.update(PERMUTATIONS.tobytes())
+
+    return digest.digest()
+
+
+def build_distance_table(move_tables, solved):
+    """Work out the exact number of moves from the solved state to every
+    state of a group of coordinates, using a breadth first search which
+    expands a whole depth at once.
+
+    Arguments:
+        move_tables (tuple {np.ndarray}): The move table of each coordinate,
+            indexed by coordinate then move.
+        solved (tuple {int}): The value of each coordinate when solved.
+
+    Returns:
+        (np.array): The distance of each state, indexed by the coordinates
+            combined in the same order as move_tables.
+    """
+    shape = tuple(move_table.shape[0] for move_table in move_tables)
+    table = np.full(int(np.prod(shape)), UNVISITED, dtype=np.uint8)
+
+    frontier = np.array([np.ravel_multi_index(solved, shape)])
+    table[frontier] = 0
+    depth = 0
+
+    while frontier.size:
+        coordinates = np.unravel_index(frontier, shape)
+        reached = []
+
+        for move in range(move_tables[0].shape[1]):
+            index = np.ravel_multi_index(tuple(move_table[coordinate, move] for
+                                               move_table, coordinate in
+                                               zip(move_tables, coordinates)), shape)
+
+            index = index[table[index] == UNVISITED]
+            table[index] = depth + 1
+            reached.append(index)
+
+        frontier = np.unique(np.concatenate(reached))
+        depth += 1
+
+    table.flags.writeable = False
+
+    return table
+
+
+def load_table(name, builder, version=1, verify=False):
+    """Load a table from the table directory, building and saving it first
+    if it is missing, truncated or out of date. Tables are memory mapped read
+    only, so processes using the same table share its pages.
+
+    Arguments:
+        name (str): The name of the table, used as its file name.
+        builder (function): Builds the table as a numpy array.
+        version (int): The version of the table builder, bump it whenever
+            the builder produces a different table.
+        verify (bool): Check the checksum of a saved table, which reads the
+            whole file. The checksum is always checked once a table has been
+            written.
+
+    Returns:
+        (np.ndarray): The table.
+    """
+    path = os.path.join(table_directory(), f'{name}.tbl')
+    expected = fingerprint(name, version)
+
+    table = _open(path, expected, verify)
+
+    if table is not None:
+        return table
+
+    table = np.ascontiguousarray(builder())
+
+    try:
+        _write(path, expected, table)
+    except OSError:
+        return table
+
+    mapped = _open(path, expected, verify=True)
+
+    return table if mapped is None else mapped
+
+
+def share_table(table):
+    """Copy a table into shared memory so that worker processes can use it
+    without their own copy.
+
+    Arguments:
+        table (np.ndarray): The table to share.
+
+    Returns:
+        (tuple): The shared memory, which must be closed and unlinked once
+            the workers are finished, and the descriptor to pass to
+            attach_table.
+    """
+    memory = shared_memory.SharedMemory(create=True, size=max(table.nbytes, 1))
+    np.ndarray(table.shape, dtype=table.dtype, buffer=memory.buf)[...] = table
+
+    return memory, (memory.name, table.dtype.str, table.shape)
+
+
+def attach_table(descriptor):
+    """Use a table which another process has put into shared memory.
+
+    Arguments:
+        descriptor (tuple): The descriptor returned by share_table.
+
+    Returns:
+        (np.ndarray): A read only view of the shared table.
+    """
+    name, dtype, shape = descriptor
+
+    try:
+        memory = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # older versions of python always track shared memory, the process
+        # which created it still removes it.
+        memory = shared_memory.SharedMemory(name=name)
+
+    _attached.append(memory)
+
+    table = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+    table.flags.writeable = False
+
+    return table
+
+
+def _open(path, expected, verify=False):
+    """Memory map a table file after checking its header and size. Checking
+    the checksum reads every page of the table, so it is only done when
+    asked for.
+
+    Arguments:
+        path (str): The path of the table file.
+        expected (bytes): The fingerprint the table should have.
+        verify (bool): Check the checksum of the data as well.
+
+    Returns:
+        (np.ndarray): A view of the mapped table, or None if it can't be
+            used.
+    """
+    try:
+        with open(path, 'rb') as table_file:
+            header = table_file.read(_HEADER.size)
+            size = os.fstat(table_file.fileno()).st_size
+    except OSError:
+        return None
+
+    if len(header) != _HEADER.size:
+        return None
+
+    magic, version, found, dtype, ndim, *shape, checksum = _HEADER.unpack(header)
+
+    if magic != _MAGIC or version != FORMAT_VERSION or found != expected:
+        return None
+
+    try:
+        dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+        shape = tuple(shape[:ndim])
+
+        # a file which was cut short can't be mapped safely.
+        if size != _HEADER_SIZE + dtype.itemsize * int(np.prod(shape)):
+            return None
+
+        table = np.memmap(path, dtype=dtype, mode='r', offset=_HEADER_SIZE, shape=shape)
+    except (OSError, ValueError, TypeError):
+        return None
+
+    if verify and zlib.crc32(table) != checksum:
+        return None
+
+    return table.view(np.ndarray)
+
+
+def _write(path, expected, table):
+    """Write a table file. The file is written under a temporary name and
+    then moved into place so that other processes never see half a table.
+
+    Arguments:
+        path (str): The path of the table file.
+        expected (bytes): The fingerprint of the table.
+        table (np.ndarray): The table to write.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    shape = list(table.shape) + [0] * (4 - table.ndim)
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, expected, table.dtype.str.encode('ascii'),
+                          table.ndim, *shape, zlib.crc32(table))
+
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+
+    try:
+        with os.fdopen(descriptor, 'wb') as table_file:
+            table_file.write(header.ljust(_HEADER_SIZE, b'\0'))
+            table_file.write(table.tobytes())
+
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except OSError:
+        os.unlink(temporary)
+        raise
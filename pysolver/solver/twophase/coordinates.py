@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+import itertools
+import math
+
+import numpy as np
+
+from ..tables import build_distance_table, load_table
+from ...cube.cubie import CORNERS, EDGES, MOVE_CUBES
+from ...cube.moves import FACE_MOVES, MOVES
+
+
+# the moves which keep the cube inside the phase two subgroup.
+PHASE2_MOVES = tuple(MOVES[name] for name in
+                     ('U', "U'", 'U2', 'D', "D'", 'D2', 'R2', 'F2', 'L2', 'B2'))
+
+# the edges which belong in the middle layer between the up and down faces.
+SLICE_EDGES = tuple(EDGES.index(edge) for edge in ('FR', 'FL', 'BL', 'BR'))
+
+# the number of values each coordinate can take.
+TWISTS = 3 ** (len(CORNERS) - 1)
+FLIPS = 2 ** (len(EDGES) - 1)
+SLICES = math.comb(len(EDGES), len(SLICE_EDGES))
+CORNER_PERMUTATIONS = math.factorial(len(CORNERS))
+EDGE_PERMUTATIONS = math.factorial(len(EDGES) - len(SLICE_EDGES))
+SLICE_PERMUTATIONS = math.factorial(len(SLICE_EDGES))
+
+# every set of slots the slice edges can occupy as a bit mask, along with
+# the lookup from a bit mask back to its index.
+_SLICE_MASKS = np.array([sum(1 << slot for slot in slots) for slots in
+                         itertools.combinations(range(len(EDGES)), len(SLICE_EDGES))])
+_SLICE_INDEX = np.zeros(1 << len(EDGES), dtype=np.intp)
+_SLICE_INDEX[_SLICE_MASKS] = np.arange(SLICES)
+
+# the slice coordinate when the slice edges are in the middle layer.
+SOLVED_SLICE = int(_SLICE_INDEX[sum(1 << slot for slot in SLICE_EDGES)])
+
+
+def encode_orientation(orientation, base):
+    """Combine the orientations of every piece except the last, which is
+    fixed by the others, into a single coordinate.
+
+    Arguments:
+        orientation (np.ndarray): The twist or flip of each slot, one row per
+            cube.
+        base (int): Three for corners or two for edges.
+
+    Returns:
+        (np.array): The coordinate of each cube.
+    """
+    coordinate = np.zeros(len(orientation), dtype=np.intp)
+
+    for slot in range(orientation.shape[1] - 1):
+        coordinate = coordinate * base + orientation[:, slot]
+
+    return coordinate
+
+
+def decode_orientation(coordinate, base, pieces):
+    """Split orientation coordinates back into the orientation of each slot.
+
+    Arguments:
+        coordinate (np.array): The coordinate of each cube.
+        base (int): Three for corners or two for edges.
+        pieces (int): The number of slots.
+
+    Returns:
+        (np.ndarray): The twist or flip of each slot, one row per cube.
+    """
+    orientation = np.zeros((len(coordinate), pieces), dtype=np.intp)
+
+    for slot in range(pieces - 2, -1, -1):
+        coordinate, orientation[:, slot] = np.divmod(coordinate, base)
+
+    orientation[:, -1] = -orientation.sum(axis=1) % base
+
+    return orientation
+
+
+def encode_permutation(permutation):
+    """Get the lexicographic rank of permutations.
+
+    Arguments:
+        permutation (np.ndarray): One permutation per row.
+
+    Returns:
+        (np.array): The rank of each permutation.
+    """
+    size = permutation.shape[1]
+    rank = np.zeros(len(permutation), dtype=np.intp)
+
+    for slot in range(size):
+        smaller = np.count_nonzero(permutation[:, slot + 1:] < permutation[:, slot:slot + 1], axis=1)
+        rank += smaller * math.factorial(size - 1 - slot)
+
+    return rank
+
+
+@functools.lru_cache(maxsize=None)
+def decode_permutation(size):
+    """Get every permutation of a number of pieces in lexicographic order, so
+    that the row index is the rank of the permutation.
+
+    Arguments:
+        size (int): The number of pieces.
+
+    Returns:
+        (np.ndarray): One permutation per row.
+    """
+    return np.array(list(itertools.permutations(range(size))), dtype=np.intp)
+
+
+def encode_slice(occupied):
+    """Get the slice coordinate from which slots hold a slice edge.
+
+    Arguments:
+        occupied (np.ndarray): True where a slot holds a slice edge, one row
+            per cube.
+
+    Returns:
+        (np.array): The slice coordinate of each cube.
+    """
+    return _SLICE_INDEX[occupied.astype(np.intp) @ (1 << np.arange(len(EDGES)))]
+
+
+def decode_slice(coordinate):
+    """Work out which slots hold a slice edge from the slice coordinate.
+
+    Arguments:
+        coordinate (np.array): The slice coordinate of each cube.
+
+    Returns:
+        (np.ndarray): True where a slot holds a slice edge, one row per cube.
+    """
+    return (_SLICE_MASKS[coordinate][:, None] >> np.arange(len(EDGES))) & 1 == 1
+
+
+def coordinates(cube):
+    """Get the phase one coordinates of a cube.
+
+    Arguments:
+        cube (CubieCube): The cube.
+
+    Returns:
+        (tuple {int}): The twist, flip and slice coordinates.
+    """
+    return (int(encode_orientation(np.array([cube.co]), 3)[0]),
+            int(encode_orientation(np.array([cube.eo]), 2)[0]),
+            int(encode_slice(np.isin(np.array([cube.ep]), SLICE_EDGES))[0]))
+
+
+def phase2_coordinates(cube):
+    """Get the phase two coordinates of a cube which is in the phase two
+    subgroup.
+
+    Arguments:
+        cube (CubieCube): The cube.
+
+    Returns:
+        (tuple {int}): The corner, edge and slice permutation coordinates.
+    """
+    edges = np.array([cube.ep])
+
+    return (int(encode_permutation(np.array([cube.cp]))[0]),
+            int(encode_permutation(edges[:, :SLICE_EDGES[0]])[0]),
+            int(encode_permutation(edges[:, SLICE_EDGES[0]:] - SLICE_EDGES[0])[0]))
+
+
+def _orientation_moves(base, pieces, permutation, orientation):
+    """Build the move table for an orientation coordinate.
+
+    Arguments:
+        base (int): Three for corners or two for edges.
+        pieces (int): The number of slots.
+        permutation (str): The CubieCube attribute holding the permutation.
+        orientation (str): The CubieCube attribute holding the orientation.
+
+    Returns:
+        (np.ndarray): The coordinate after each face move, indexed by
+            coordinate then move id.
+    """
+    current = decode_orientation(np.arange(base ** (pieces - 1)), base, pieces)
+    table = np.zeros((len(current), FACE_MOVES), dtype=np.uint16)
+
+    for move, cube in enumerate(MOVE_CUBES):
+        moved = (current[:, getattr(cube, permutation)] + getattr(cube, orientation)) % base
+        table[:, move] = encode_orientation(moved, base)
+
+    return table
+
+
+def build_twist_moves():
+    """Build the move table for the corner twist coordinate.
+
+    Returns:
+        (np.ndarray): Indexed by twist then move id.
+    """
+    return _orientation_moves(3, len(CORNERS), 'cp', 'co')
+
+
+def build_flip_moves():
+    """Build the move table for the edge flip coordinate.
+
+    Returns:
+        (np.ndarray): Indexed by flip then move id.
+    """
+    return _orientation_moves(2, len(EDGES), 'ep', 'eo')
+
+
+def build_slice_moves():
+    """Build the move table for the coordinate of which slots hold the
+    slice edges.
+
+    Returns:
+        (np.ndarray): Indexed by slice then move id.
+    """
+    current = decode_slice(np.arange(SLICES))
+    table = np.zeros((SLICES, FACE_MOVES), dtype=np.uint16)
+
+    for move, cube in enumerate(MOVE_CUBES):
+        table[:, move] = encode_slice(current[:, cube.ep])
+
+    return table
+
+
+def _edge_permutation_moves(start, stop):
+    """Build the phase two move table for the permutation of a range of edge
+    slots, phase two moves never move an edge out of its range.
+
+    Arguments:
+        start (int): The first edge slot.
+        stop (int): The slot after the last edge slot.
+
+    Returns:
+        (np.ndarray): The coordinate after each phase two move, indexed by
+            coordinate then the index of the move in PHASE2_MOVES.
+    """
+    current = decode_permutation(stop - start)
+    table = np.zeros((len(current), len(PHASE2_MOVES)), dtype=np.uint16)
+
+    for index, move in enumerate(PHASE2_MOVES):
+        permutation = np.array(MOVE_CUBES[move].ep[start:stop]) - start
+        table[:, index] = encode_permutation(current[:, permutation])
+
+    return table
+
+
+def build_corner_moves():
+    """Build the phase two move table for the corner permutation.
+
+    Returns:
+        (np.ndarray): Indexed by corner permutation then phase two move.
+    """
+    current = decode_permutation(len(CORNERS))
+    table = np.zeros((len(current), len(PHASE2_MOVES)), dtype=np.uint16)
+
+    for index, move in enumerate(PHASE2_MOVES):
+        table[:, index] = encode_permutation(current[:, MOVE_CUBES[move].cp])
+
+    return table
+
+
+def build_edge_moves():
+    """Build the phase two move table for the permutation of the up and down
+    layer edges.
+
+    Returns:
+        (np.ndarray): Indexed by edge permutation then phase two move.
+    """
+    return _edge_permutation_moves(0, SLICE_EDGES[0])
+
+
+def build_slice_permutation_moves():
+    """Build the phase two move table for the permutation of the slice
+    edges.
+
+    Returns:
+        (np.ndarray): Indexed by slice permutation then phase two move.
+    """
+    return _edge_permutation_moves(SLICE_EDGES[0], len(EDGES))
+
+
+@functools.lru_cache(maxsize=None)
+def move_tables():
+    """Get every move table from the table store.
+
+    Returns:
+        (dict): Lookup from the coordinate name to its move table.
+    """
+    return {
+        'twist': load_table('twophase-twist-moves', build_twist_moves),
+        'flip': load_table('twophase-flip-moves', build_flip_moves),
+        'slice': load_table('twophase-slice-moves', build_slice_moves),
+        'corners': load_table('twophase-corner-moves', build_corner_moves),
+        'edges': load_table('twophase-edge-moves', build_edge_moves),
+        'slice_permutation': load_table('twophase-slice-permutation-moves',
+                                        build_slice_permutation_moves)
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def pruning_tables():
+    """Get every pruning table from the table store. Phase one combines the
+    slice coordinate with the twist and with the flip, phase two combines
+    the slice permutation with the corner and with the edge permutation.
+
+    Returns:
+        (dict): Lookup from the table name to its pruning table.
+    """
+    tables = move_tables()
+
+    def pruning(first, second, solved):
+        return lambda: build_distance_table((tables[first], tables[second]), solved)
+
+    return {
+        'slice_twist': load_table('twophase-slice-twist', pruning('slice', 'twist', (SOLVED_SLICE, 0))),
+        'slice_flip': load_table('twophase-slice-flip', pruning('slice', 'flip', (SOLVED_SLICE, 0))),
+        'slice_corners': load_table('twophase-slice-corners',
+                                    pruning('slice_permutation', 'corners', (0, 0))),
+        'slice_edges': load_table('twophase-slice-edges',
+                                  pruning('slice_permutation', 'edges', (0, 0)))
+    }
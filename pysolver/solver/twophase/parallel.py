@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import multiprocessing
+import os
+import time
+
+from .search import SPLIT_DEPTH, split_moves
+from .solver import MAX_PHASE1_DEPTH, TwoPhaseSolver, search_tables
+from ..stats import SolveStats
+from ..tables import attach_table, share_table
+from ...cube.cube import InvalidCubeString
+from ...cube.cubie import CubieCube
+from ...util.algorithm import Algorithm
+
+
+# the solver used by this worker process, created once by _initialise.
+_solver = None
+
+# the solve the worker's solver was last reset for.
+_solve_id = None
+
+
+class _SubtreeSolver(TwoPhaseSolver):
+    """The two phase solver run by each worker process. The best solution
+    length, the deadline and whether the search is over are shared with the
+    other workers, so that each worker bounds its search by every solution
+    found so far and they all stop together.
+
+    Arguments:
+        max_length (int): Stop as soon as a solution this short is found.
+        timeout (float): Seconds to spend looking for a shorter solution once
+            any solution has been found.
+        tables (dict): The move and pruning tables by name.
+        best (multiprocessing.Value): The length of the best solution found
+            by any worker, zero if there isn't one.
+        deadline (multiprocessing.Value): When the search must stop, zero
+            until there is a solution.
+        stopped (multiprocessing.Event): Set once the search is over.
+    """
+    def __init__(self, max_length, timeout, tables, best, deadline, stopped):
+        super().__init__(max_length, timeout, tables)
+
+        self._shared_best = best
+        self._shared_deadline = deadline
+        self._stopped = stopped
+
+        # reading through the raw values skips taking the lock, which is only
+        # needed to update them.
+        self._best_value = best.get_obj()
+        self._deadline_value = deadline.get_obj()
+
+    def _best_length(self):
+        return self._best_value.value or super()._best_length()
+
+    def _found(self, solution):
+        super()._found(solution)
+
+        with self._shared_best.get_lock():
+            if not self._best_value.value or len(solution) < self._best_value.value:
+                self._best_value.value = len(solution)
+
+        with self._shared_deadline.get_lock():
+            if not self._deadline_value.value:
+                self._deadline_value.value = time.monotonic() + self.timeout
+
+        if len(solution) <= self.max_length:
+            self._stopped.set()
+
+    def _finished(self):
+        if self._stopped.is_set():
+            return True
+
+        deadline = self._deadline_value.value
+
+        return bool(deadline) and time.monotonic() > deadline
+
+
+def _initialise(descriptors, max_length, timeout, best, deadline, stopped):
+    """Create the solver for a worker process using the tables in shared
+    memory.
+
+    Arguments:
+        descriptors (dict): Lookup from the table name to its shared memory
+            descriptor.
+        max_length (int): Stop as soon as a solution this short is found.
+        timeout (float): Seconds to spend looking for a shorter solution.
+        best (multiprocessing.Value): The shared best solution length.
+        deadline (multiprocessing.Value): The shared deadline.
+        stopped (multiprocessing.Event): Set once the search is over.
+    """
+    global _solver
+
+    tables = {name: attach_table(descriptor) for name, descriptor in descriptors.items()}
+    _solver = _SubtreeSolver(max_length, timeout, tables, best, deadline, stopped)
+
+
+def _search(task):
+    """Search one subtree in a worker process.
+
+    Arguments:
+        task (tuple): The id of the solve, the cube, the moves the subtree
+            starts with and the length of the phase one solutions.
+
+    Returns:
+        (tuple): The best solution this worker has found for the cube, or
+            None, the id of the worker process and the worker's statistics
+            for the cube so far.
+    """
+    global _solve_id
+
+    solve_id, cube, prefix, depth = task
+
+    if solve_id != _solve_id:
+        _solver.reset(cube)
+        _solve_id = solve_id
+
+    if not _solver.finished():
+        _solver.search(prefix, depth)
+
+    return _solver.best, os.getpid(), _solver.stats
+
+
+class ParallelTwoPhaseSolver():
+    """Solve a Rubik's cube using the two phase algorithm spread over a pool
+    of worker processes. Each depth of phase one is split by its first moves
+    and the subtrees are searched in parallel. The tables are copied into
+    shared memory once, so the workers don't each hold their own copy, and
+    the workers stop together as soon as the search is over.
+
+    The pool is kept for the life of the solver, call close or use the
+    solver as a context manager to shut it down.
+
+    Arguments:
+        processes (int): The number of worker processes, defaults to the
+            number of CPUs.
+        max_length (int): Stop as soon as a solution this short is found.
+        timeout (float): Seconds to spend looking for a shorter solution once
+            any solution has been found.
+        split_depth (int): The number of moves the search is split on.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, the time in
+            each phase is added up over the workers.
+    """
+    def __init__(self, processes=None, max_length=21, timeout=0.5, split_depth=SPLIT_DEPTH):
+        self.stats = SolveStats()
+        self._processes = processes or multiprocessing.cpu_count()
+        self._split_depth = split_depth
+        self._solves = 0
+
+        self._memory = []
+        descriptors = {}
+
+        for name, table in search_tables().items():
+            memory, descriptors[name] = share_table(table)
+            self._memory.append(memory)
+
+        self._best = multiprocessing.Value('i', 0)
+        self._deadline = multiprocessing.Value('d', 0.0)
+        self._stopped = multiprocessing.Event()
+
+        self._pool = multiprocessing.Pool(self._processes, initializer=_initialise,
+                                          initargs=(descriptors, max_length, timeout,
+                                                    self._best, self._deadline, self._stopped))
+
+    @property
+    def nodes(self):
+        """Get the number of nodes expanded by every worker during the last
+        solve.
+
+        Returns:
+            (int): The number of nodes.
+        """
+        return self.stats.nodes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes and free the shared tables."""
+        self._pool.terminate()
+        self._pool.join()
+
+        for memory in self._memory:
+            memory.close()
+            memory.unlink()
+
+        self._memory = []
+
+    def solve(self, cube):
+        """Find a short algorithm which solves the cube.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        cube = CubieCube.from_state(cube.state)
+
+        if cube is None:
+            raise InvalidCubeString
+
+        start = time.perf_counter()
+
+        self._best.value = 0
+        self._deadline.value = 0.0
+        self._stopped.clear()
+        self._solves += 1
+
+        best = None
+        best_worker = None
+
+        # the latest statistics from each worker, they cover the whole solve.
+        workers = {}
+
+        for depth in range(MAX_PHASE1_DEPTH + 1):
+            if best is not None and depth >= len(best):
+                break
+
+            tasks = [(self._solves, cube, prefix, depth)
+                     for prefix in split_moves(min(depth, self._split_depth))]
+            chunk_size = max(1, len(tasks) // (self._processes * 4))
+
+            for solution, worker, stats in self._pool.imap_unordered(_search, tasks, chunk_size):
+                workers[worker] = stats
+
+                if solution is not None and (best is None or len(solution) < len(best)):
+                    best, best_worker = solution, worker
+
+            deadline = self._deadline.value
+
+            if self._stopped.is_set() or (deadline and time.monotonic() > deadline):
+                break
+
+        self.stats = self._merge(workers.values(), workers.get(best_worker))
+        self.stats.seconds = time.perf_counter() - start
+
+        if best is None:
+            raise InvalidCubeString
+
+        return Algorithm.from_moves(best)
+
+    @staticmethod
+    def _merge(workers, best):
+        """Add up the statistics of every worker.
+
+        Arguments:
+            workers (iterable {SolveStats}): The statistics of each worker.
+            best (SolveStats): The statistics of the worker which found the
+                best solution, used for the moves in each stage.
+
+        Returns:
+            (SolveStats): The statistics of the whole solve.
+        """
+        stats = SolveStats()
+        stages = {}
+
+        for worker in workers:
+            for stage in worker.stages:
+                if stage.name not in stages:
+                    stages[stage.name] = stats.add_stage(stage.name)
+
+                stages[stage.name].add(stage)
+
+        for stage in best.stages if best is not None else ():
+            stages[stage.name].moves = stage.moves
+
+        return stats
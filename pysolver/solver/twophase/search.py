@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+
+from ...cube.moves import FACE_MOVES, redundant
+
+
+# the number of moves the search tree is split on, one move splits each
+# depth into eighteen subtrees and two moves split it into 243.
+SPLIT_DEPTH = 2
+
+
+@functools.lru_cache(maxsize=None)
+def split_moves(length):
+    """Get every sequence of face moves which a search would try, used to
+    split a search into subtrees.
+
+    Arguments:
+        length (int): The number of moves in each sequence.
+
+    Returns:
+        (tuple {tuple {int}}): The move ids of each sequence.
+    """
+    if length == 0:
+        return ((),)
+
+    return tuple(prefix + (move,) for prefix in split_moves(length - 1)
+                 for move in range(FACE_MOVES) if not prefix or not redundant(prefix[-1], move))
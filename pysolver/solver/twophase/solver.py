@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import numpy as np
+
+from .coordinates import (EDGE_PERMUTATIONS, PHASE2_MOVES, coordinates, move_tables,
+                          phase2_coordinates, pruning_tables)
+from .symmetry import symmetry_tables
+from ..stats import HOOKS, SolveStats, notify
+from ...cube.cube import InvalidCubeString
+from ...cube.cubie import CubieCube
+from ...cube.moves import FACE_MOVES, redundant
+from ...util.algorithm import Algorithm, simplify_moves
+
+
+# phase one never needs more than 12 moves and phase two never more than 18.
+MAX_PHASE1_DEPTH = 12
+MAX_PHASE2_DEPTH = 18
+
+# the number of nodes each phase searches between checks of whether the
+# search should stop, a few milliseconds of searching.
+CHECK_NODES = 256
+
+
+def search_tables():
+    """Get every move and pruning table used by the two phase search.
+
+    Returns:
+        (dict): Lookup from the table name to the table.
+    """
+    return {**move_tables(), **pruning_tables(), **symmetry_tables()}
+
+
+class _Stopped(Exception):
+    """Raised to abandon a phase two search once the search should stop."""
+
+
+def _flat(table):
+    """Get a flat view of a table, which is nearly as quick to index as a
+    list without copying the table.
+
+    Arguments:
+        table (np.ndarray): The table.
+
+    Returns:
+        (memoryview): The entries of the table, row after row.
+    """
+    return memoryview(np.ascontiguousarray(table).reshape(-1))
+
+
+def _successors(moves):
+    """Work out which moves are worth searching after each move.
+
+    Arguments:
+        moves (tuple {int}): The move ids which can be searched.
+
+    Returns:
+        (dict): Lookup from the previous move id, or None at the start of the
+            search, to a tuple of the index and move id of each move to try.
+    """
+    successors = {None: tuple(enumerate(moves))}
+
+    for last in range(FACE_MOVES):
+        successors[last] = tuple((index, move) for index, move in enumerate(moves)
+                                 if not redundant(last, move))
+
+    return successors
+
+
+class TwoPhaseSolver():
+    """Solve a Rubik's cube using Kociemba's two phase algorithm. Phase one
+    brings the cube into the subgroup generated by U, D, R2, F2, L2 and B2,
+    where every corner and edge is oriented and the middle layer edges are
+    in the middle layer. Phase two then solves the cube using only those
+    moves. Longer phase one solutions are tried until the total is short
+    enough or the time runs out.
+
+    Arguments:
+        max_length (int): Stop as soon as a solution this short is found.
+        timeout (float): Seconds to spend looking for a shorter solution once
+            any solution has been found.
+        tables (dict): The move and pruning tables by name, loaded from the
+            table store by the first solve when not given.
+
+    Attributes:
+        stats (SolveStats): Statistics about the last solve, with a stage
+            for each phase. Phase two is searched from inside phase one so
+            the time in phase one leaves out the time in phase two.
+    """
+    def __init__(self, max_length=21, timeout=0.5, tables=None):
+        self.max_length = max_length
+        self.timeout = timeout
+        self._tables = tables
+        self._twist = None
+
+        self._phase1_successors = _successors(tuple(range(FACE_MOVES)))
+        self._phase2_successors = _successors(PHASE2_MOVES)
+
+        self._cube = None
+        self._root = None
+        self._best = None
+        self._deadline = None
+        self._reset_stats()
+
+    def _load_tables(self):
+        """Unpack the tables into the forms the search reads fastest, this
+        takes a while so it is left until the first solve.
+        """
+        tables = search_tables() if self._tables is None else self._tables
+        self._tables = None
+
+        # the small move tables are turned into lists, which are the quickest
+        # to index. The large ones are indexed where they are, so processes
+        # sharing them through the page cache or shared memory don't each
+        # make their own copy.
+        self._twist = tables['twist'].tolist()
+        self._flip = tables['flip'].tolist()
+        self._slice = tables['slice'].tolist()
+        self._corners = _flat(tables['corners'])
+        self._edges = _flat(tables['edges'])
+        self._slice_permutation = tables['slice_permutation'].tolist()
+
+        self._slice_twist = memoryview(tables['slice_twist'])
+        self._slice_flip = memoryview(tables['slice_flip'])
+        self._slice_corners = memoryview(tables['slice_corners'])
+        self._slice_edges = memoryview(tables['slice_edges'])
+
+        # the corners and edges table only holds one corner permutation from
+        # each symmetry class, the edges are conjugated to match it.
+        self._corner_offset = _flat(tables['corner_class'] * EDGE_PERMUTATIONS)
+        self._corner_symmetry = _flat(tables['corner_symmetry'])
+        self._edge_conjugates = _flat(tables['edge_conjugates'])
+        self._corner_edges = memoryview(tables['corner_edges'])
+
+        self._twists = len(self._twist)
+        self._flips = len(self._flip)
+        self._permutations, self._phase2_moves = tables['corners'].shape
+        self._symmetries = tables['edge_conjugates'].shape[1]
+
+    @property
+    def nodes(self):
+        """Get the number of nodes expanded by both phases of the last
+        solve.
+
+        Returns:
+            (int): The number of nodes.
+        """
+        return self._phase1_stats.nodes + self._phase2_stats.nodes
+
+    def solve(self, cube):
+        """Find a short algorithm which solves the cube.
+
+        Arguments:
+            cube (Cube): The cube to solve.
+
+        Returns:
+            (Algorithm): The moves which solve the cube.
+        """
+        cube = CubieCube.from_state(cube.state)
+
+        if cube is None:
+            raise InvalidCubeString
+
+        start = time.perf_counter()
+        self.reset(cube)
+
+        for depth in range(self._phase1_distance(*self._root), MAX_PHASE1_DEPTH + 1):
+            best = self._best_length()
+
+            if best is not None and depth >= best:
+                break
+
+            if self.search((), depth):
+                break
+
+        self.stats.seconds = time.perf_counter() - start
+
+        if self._best is None:
+            raise InvalidCubeString
+
+        return Algorithm.from_moves(self._best)
+
+    def reset(self, cube):
+        """Start a new search.
+
+        Arguments:
+            cube (CubieCube): The cube to solve.
+        """
+        if self._twist is None:
+            self._load_tables()
+
+        self._cube = cube
+        self._root = coordinates(cube)
+        self._best = None
+        self._deadline = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        """Start recording the statistics of a new solve."""
+        self.stats = SolveStats()
+        self._phase1_stats = self.stats.add_stage('phase1')
+        self._phase2_stats = self.stats.add_stage('phase2')
+
+    def search(self, prefix, depth):
+        """Search every phase one solution of exactly depth moves which
+        starts with the moves in prefix, handing each one to phase two.
+        Searching each prefix separately lets several processes share one
+        search.
+
+        Arguments:
+            prefix (tuple {int}): The move ids the phase one solutions start
+                with.
+            depth (int): The length of the phase one solutions.
+
+        Returns:
+            (bool): True once the search should stop.
+        """
+        if HOOKS:
+            notify('start', 'phase1')
+
+        phase2_seconds = self._phase2_stats.seconds
+        start = time.perf_counter()
+
+        finished = self._search_prefix(prefix, depth)
+
+        # phase two is searched from inside phase one.
+        phase2_seconds = self._phase2_stats.seconds - phase2_seconds
+        self._phase1_stats.seconds += time.perf_counter() - start - phase2_seconds
+        self._phase1_stats.depth = max(self._phase1_stats.depth, depth)
+
+        if HOOKS:
+            notify('stop', 'phase1')
+
+        return finished
+
+    def _search_prefix(self, prefix, depth):
+        """Search every phase one solution of exactly depth moves which
+        starts with the moves in prefix, see search.
+
+        Arguments:
+            prefix (tuple {int}): The move ids the phase one solutions start
+                with.
+            depth (int): The length of the phase one solutions.
+
+        Returns:
+            (bool): True once the search should stop.
+        """
+        twist, flip, slice_ = self._root
+
+        for index, move in enumerate(prefix):
+            if index and redundant(prefix[index - 1], move):
+                return False
+
+            twist, flip, slice_ = self._twist[twist][move], self._flip[flip][move], \
+                self._slice[slice_][move]
+
+        remaining = depth - len(prefix)
+
+        if remaining < 0 or self._phase1_distance(twist, flip, slice_) > remaining:
+            return False
+
+        if remaining == 0:
+            # a phase one solution ending in a phase two move would already
+            # have been found one move earlier.
+            if prefix and prefix[-1] in PHASE2_MOVES:
+                return False
+
+            return self._start_phase2(list(prefix))
+
+        return self._phase1(twist, flip, slice_, remaining, list(prefix))
+
+    def _phase1_distance(self, twist, flip, slice_):
+        """Get a lower bound on the number of moves left in phase one.
+
+        Arguments:
+            twist (int): The corner twist coordinate.
+            flip (int): The edge flip coordinate.
+            slice_ (int): The slice coordinate.
+
+        Returns:
+            (int): The lower bound.
+        """
+        return max(self._slice_twist[slice_ * self._twists + twist],
+                   self._slice_flip[slice_ * self._flips + flip])
+
+    def _phase1(self, twist, flip, slice_, depth, path):
+        """Depth limited search for every way of reaching the phase two
+        subgroup in exactly depth moves, each one is handed to phase two.
+
+        Arguments:
+            twist (int): The corner twist coordinate.
+            flip (int): The edge flip coordinate.
+            slice_ (int): The slice coordinate.
+            depth (int): The number of moves left.
+            path (list {int}): The moves made so far.
+
+        Returns:
+            (bool): True once the search should stop.
+        """
+        stats = self._phase1_stats
+        stats.nodes += 1
+
+        # the time may run out deep inside a search, not just between
+        # solutions.
+        if not stats.nodes % CHECK_NODES and self._finished():
+            return True
+
+        twist_moves, flip_moves, slice_moves = self._twist[twist], self._flip[flip], self._slice[slice_]
+        slice_twist, slice_flip = self._slice_twist, self._slice_flip
+        twists, flips = self._twists, self._flips
+
+        for _, move in self._phase1_successors[path[-1] if path else None]:
+            next_twist, next_flip, next_slice = twist_moves[move], flip_moves[move], slice_moves[move]
+
+            if slice_twist[next_slice * twists + next_twist] >= depth or \
+                    slice_flip[next_slice * flips + next_flip] >= depth:
+                stats.pruned += 1
+                continue
+
+            # a phase one solution ending in a phase two move would already
+            # have been found one move earlier.
+            if depth == 1 and move in PHASE2_MOVES:
+                continue
+
+            path.append(move)
+
+            if depth == 1:
+                finished = self._start_phase2(path)
+            else:
+                finished = self._phase1(next_twist, next_flip, next_slice, depth - 1, path)
+
+            path.pop()
+
+            if finished:
+                return True
+
+        return False
+
+    def _start_phase2(self, path):
+        """Solve the rest of the cube from the end of a phase one solution.
+
+        Arguments:
+            path (list {int}): The phase one solution.
+
+        Returns:
+            (bool): True once the search should stop.
+        """
+        if HOOKS:
+            notify('start', 'phase2')
+
+        start = time.perf_counter()
+        stats = self._phase2_stats
+
+        limit = MAX_PHASE2_DEPTH
+        best = self._best_length()
+
+        if best is not None:
+            limit = min(limit, best - 1 - len(path))
+
+        cube = self._cube
+
+        for move in path:
+            cube = cube.move(move)
+
+        corners, edges, slice_ = phase2_coordinates(cube)
+        distance = self._phase2_distance(corners, edges, slice_)
+
+        # phase two may start by turning the face phase one finished on, the
+        # two turns are merged once the search is over.
+        try:
+            for depth in range(distance, limit + 1):
+                moves = []
+                stats.depth = max(stats.depth, depth)
+
+                if depth == 0 or self._phase2(corners, edges, slice_, depth, moves):
+                    self._phase1_stats.moves, stats.moves = len(path), len(moves)
+                    self._found(simplify_moves(path + moves))
+                    break
+        except _Stopped:
+            pass
+
+        stats.seconds += time.perf_counter() - start
+
+        if HOOKS:
+            notify('stop', 'phase2')
+
+        return self._finished()
+
+    def _phase2_distance(self, corners, edges, slice_):
+        """Get a lower bound on the number of moves left in phase two.
+
+        Arguments:
+            corners (int): The corner permutation coordinate.
+            edges (int): The up and down edge permutation coordinate.
+            slice_ (int): The slice edge permutation coordinate.
+
+        Returns:
+            (int): The lower bound, zero only when the cube is solved.
+        """
+        return max(self._slice_corners[slice_ * self._permutations + corners],
+                   self._slice_edges[slice_ * self._permutations + edges],
+                   self._corner_edges[self._corner_offset[corners] +
+                                      self._edge_conjugates[edges * self._symmetries +
+                                                            self._corner_symmetry[corners]]])
+
+    def _phase2(self, corners, edges, slice_, depth, path):
+        """Depth limited search for a phase two solution of exactly depth
+        moves.
+
+        Arguments:
+            corners (int): The corner permutation coordinate.
+            edges (int): The up and down edge permutation coordinate.
+            slice_ (int): The slice edge permutation coordinate.
+            depth (int): The number of moves left.
+            path (list {int}): The moves made so far, the solution is left in
+                here when one is found.
+
+        Returns:
+            (bool): True if the cube was solved.
+
+        Raises:
+            _Stopped: If the search should stop.
+        """
+        stats = self._phase2_stats
+        stats.nodes += 1
+
+        if not stats.nodes % CHECK_NODES and self._finished():
+            raise _Stopped
+
+        # the rows of the corner and edge move tables for this node.
+        corner_row, edge_row = corners * self._phase2_moves, edges * self._phase2_moves
+
+        corner_moves, edge_moves = self._corners, self._edges
+        slice_moves = self._slice_permutation[slice_]
+        slice_corners, slice_edges = self._slice_corners, self._slice_edges
+        corner_offset, corner_symmetry = self._corner_offset, self._corner_symmetry
+        edge_conjugates, corner_edges = self._edge_conjugates, self._corner_edges
+        permutations, symmetries = self._permutations, self._symmetries
+
+        for index, move in self._phase2_successors[path[-1] if path else None]:
+            next_corners, next_edges, next_slice = \
+                corner_moves[corner_row + index], edge_moves[edge_row + index], slice_moves[index]
+
+            if slice_corners[next_slice * permutations + next_corners] >= depth or \
+                    slice_edges[next_slice * permutations + next_edges] >= depth or \
+                    corner_edges[corner_offset[next_corners] +
+                                 edge_conjugates[next_edges * symmetries +
+                                                 corner_symmetry[next_corners]]] >= depth:
+                stats.pruned += 1
+                continue
+
+            path.append(move)
+
+            if depth == 1 or self._phase2(next_corners, next_edges, next_slice, depth - 1, path):
+                return True
+
+            path.pop()
+
+        return False
+
+    @property
+    def best(self):
+        """Get the best solution found since the last reset.
+
+        Returns:
+            (list {int}): The move ids of the solution, or None if there
+                isn't one yet.
+        """
+        return self._best
+
+    def finished(self):
+        """Check whether the search should stop, the search methods stop by
+        themselves so this is for code which drives the search.
+
+        Returns:
+            (bool): True if the search should stop.
+        """
+        return self._finished()
+
+    def _best_length(self):
+        """Get the length of the best solution found so far.
+
+        Returns:
+            (int): The length, or None if there isn't a solution yet.
+        """
+        return None if self._best is None else len(self._best)
+
+    def _found(self, solution):
+        """Record a solution which is shorter than any found so far.
+
+        Arguments:
+            solution (list {int}): The move ids of the solution.
+        """
+        self._best = solution
+
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.timeout
+
+    def _finished(self):
+        """Check whether the search should stop.
+
+        Returns:
+            (bool): True if the best solution is short enough or the time
+                has run out.
+        """
+        if self._best is None:
+            return False
+
+        return len(self._best) <= self.max_length or time.monotonic() > self._deadline
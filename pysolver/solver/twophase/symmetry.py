@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+
+import numpy as np
+
+from .coordinates import (EDGE_PERMUTATIONS, SLICE_EDGES, decode_permutation,
+                          encode_permutation, move_tables)
+from ..tables import UNVISITED, load_table
+from ...cube.cubie import CORNER_FACELETS, EDGE_FACELETS, FACES
+from ...cube.symmetry import symmetries
+
+
+# the number of distance table entries expanded at once while building.
+_CHUNK_SIZE = 1 << 22
+
+
+@functools.lru_cache(maxsize=None)
+def ud_symmetries():
+    """Get the symmetries which keep the up and down faces on the up-down
+    axis, these turn phase two moves into other phase two moves so phase two
+    distances are the same for every cube they relate.
+
+    Returns:
+        (tuple {int}): The symmetries.
+    """
+    up, down = list(FACES).index('U'), list(FACES).index('D')
+
+    return tuple(symmetry for symmetry, face_map in enumerate(symmetries().face_maps)
+                 if face_map[up] in (up, down))
+
+
+def _slot_symmetries(slots):
+    """Work out where each symmetry moves each corner or edge slot.
+
+    Arguments:
+        slots (tuple {tuple {int}}): The sticker indices of each slot e.g.
+            CORNER_FACELETS.
+
+    Returns:
+        (np.ndarray): The slot each slot is moved to, indexed by the position
+            of the symmetry in ud_symmetries then slot.
+    """
+    destinations = np.argsort(symmetries().sources, axis=1)
+    lookup = {facelet: slot for slot, facelets in enumerate(slots) for facelet in facelets}
+
+    return np.array([[lookup[destinations[symmetry][facelets[0]]] for facelets in slots]
+                     for symmetry in ud_symmetries()], dtype=np.intp)
+
+
+def _conjugates(size, slot_symmetries):
+    """Build the table of a permutation coordinate conjugated by each
+    symmetry, the cube is transformed by the symmetry so every piece and
+    slot is renamed.
+
+    Arguments:
+        size (int): The number of pieces in the permutation.
+        slot_symmetries (np.ndarray): Where each symmetry moves each slot.
+
+    Returns:
+        (np.ndarray): The conjugated coordinate, indexed by coordinate then
+            the position of the symmetry in ud_symmetries.
+    """
+    permutations = decode_permutation(size)
+    table = np.zeros((len(permutations), len(slot_symmetries)), dtype=np.uint16)
+
+    for index, slot_symmetry in enumerate(slot_symmetries):
+        table[:, index] = encode_permutation(slot_symmetry[permutations[:, np.argsort(slot_symmetry)]])
+
+    return table
+
+
+def build_corner_conjugates():
+    """Build the conjugation table of the corner permutation.
+
+    Returns:
+        (np.ndarray): Indexed by corner permutation then symmetry.
+    """
+    return _conjugates(len(CORNER_FACELETS), _slot_symmetries(CORNER_FACELETS))
+
+
+def build_edge_conjugates():
+    """Build the conjugation table of the up and down layer edge permutation.
+
+    Returns:
+        (np.ndarray): Indexed by edge permutation then symmetry.
+    """
+    return _conjugates(SLICE_EDGES[0], _slot_symmetries(EDGE_FACELETS[:SLICE_EDGES[0]]))
+
+
+@functools.lru_cache(maxsize=None)
+def corner_classes():
+    """Group the corner permutations into classes which are conjugates of
+    each other, the smallest permutation in each class represents it.
+
+    Returns:
+        (dict): The class of each corner permutation, the symmetry which
+            conjugates it into its representative, the representative of
+            each class and which symmetries leave each representative
+            unchanged.
+    """
+    conjugates = load_table('twophase-corner-conjugates', build_corner_conjugates)
+
+    smallest = conjugates.min(axis=1)
+    representatives = np.unique(smallest)
+
+    return {
+        'corner_class': np.searchsorted(representatives, smallest),
+        'corner_symmetry': conjugates.argmin(axis=1),
+        'representatives': representatives.astype(np.intp),
+        'stabilisers': conjugates[representatives] == representatives[:, None]
+    }
+
+
+def _fill_symmetric(table, index, depth, classes, edge_conjugates):
+    """Set the entries which are equivalent to newly reached entries because
+    their representative is unchanged by some symmetries.
+
+    Arguments:
+        table (np.array): The distance table being built.
+        index (np.array): The newly reached entries.
+        depth (int): Their distance.
+        classes (dict): The corner classes.
+        edge_conjugates (np.ndarray): The edge conjugation table.
+    """
+    corner_class, edges = np.divmod(index, EDGE_PERMUTATIONS)
+    stabilisers = classes['stabilisers'][corner_class]
+    symmetric = stabilisers[:, 1:].any(axis=1)
+
+    for symmetry in range(1, len(ud_symmetries())):
+        selected = symmetric & stabilisers[:, symmetry]
+        other = corner_class[selected] * EDGE_PERMUTATIONS + \
+            edge_conjugates[edges[selected], symmetry]
+
+        table[other[table[other] == UNVISITED]] = depth
+
+
+def build_corner_edge_table():
+    """Work out the exact number of phase two moves needed to solve the
+    corners and the up and down layer edges together. Entries are only kept
+    for one corner permutation in each class, any other is conjugated into
+    its representative along with the edges.
+
+    Returns:
+        (np.array): The distance, indexed by corner class multiplied by the
+            number of edge permutations plus the conjugated edge permutation.
+    """
+    tables = move_tables()
+    corner_moves, edge_moves = tables['corners'], tables['edges']
+    edge_conjugates = load_table('twophase-edge-conjugates', build_edge_conjugates)
+    classes = corner_classes()
+
+    table = np.full(len(classes['representatives']) * EDGE_PERMUTATIONS, UNVISITED, dtype=np.uint8)
+    table[classes['corner_class'][0] * EDGE_PERMUTATIONS] = 0
+    depth = 0
+
+    while True:
+        frontier = np.flatnonzero(table == depth)
+
+        if not frontier.size:
+            break
+
+        for start in range(0, frontier.size, _CHUNK_SIZE):
+            corner_class, edges = np.divmod(frontier[start:start + _CHUNK_SIZE], EDGE_PERMUTATIONS)
+            corners = classes['representatives'][corner_class]
+
+            for move in range(corner_moves.shape[1]):
+                moved = corner_moves[corners, move]
+                index = classes['corner_class'][moved] * EDGE_PERMUTATIONS + \
+                    edge_conjugates[edge_moves[edges, move], classes['corner_symmetry'][moved]]
+
+                index = np.unique(index[table[index] == UNVISITED])
+                table[index] = depth + 1
+
+                _fill_symmetric(table, index, depth + 1, classes, edge_conjugates)
+
+        depth += 1
+
+    table.flags.writeable = False
+
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def symmetry_tables():
+    """Get the sym-coordinate, conjugation and symmetry reduced pruning
+    tables from the table store.
+
+    Returns:
+        (dict): Lookup from the table name to the table.
+    """
+    classes = corner_classes()
+
+    return {
+        'corner_class': classes['corner_class'],
+        'corner_symmetry': classes['corner_symmetry'],
+        'edge_conjugates': load_table('twophase-edge-conjugates', build_edge_conjugates),
+        'corner_edges': load_table('twophase-corner-edges', build_corner_edge_table)
+    }
@@ -18,6 +18,27 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import functools
+
+import numpy as np
+
+from ..cube.moves import INVERSE, MOVE_NAMES, MOVES, PERMUTATIONS
+
+
+# the number of compiled algorithms which are kept in memory.
+CACHE_SIZE = 4096
+
+# how far each kind of move turns its layer in quarter turns, and the inverse
+# lookup from a number of quarter turns to the kind of move.
+_QUARTER_TURNS = (1, 3, 2)
+_MOVE_KIND = {1: 0, 3: 1, 2: 2}
+
+
+class InvalidAlgorithm(Exception):
+    """This exception is raised when an algorithm contains a step which is
+    not in the standard Rubik's cube notation.
+    """
+    pass
 
 class Algorithm():
     """Algorithms which will be used on a Rubik's cube and are stored as
@@ -30,6 +51,42 @@ class Algorithm():
     def __init__(self, steps):
         self._steps = steps.split()
 
+        try:
+            self._moves = tuple(MOVES[step] for step in self._steps)
+        except KeyError:
+            raise InvalidAlgorithm
+
+    @classmethod
+    def from_moves(cls, moves):
+        """Create an algorithm from a sequence of move ids.
+
+        Arguments:
+            moves (iterable {int}): The move ids which make up the algorithm.
+
+        Returns:
+            (Algorithm): The algorithm using the standard notation.
+        """
+        return cls(' '.join(MOVE_NAMES[move] for move in moves))
+
+    @property
+    def moves(self):
+        """Get the move ids for each step of the algorithm.
+
+        Returns:
+            (tuple {int}): The move ids in the order they are performed.
+        """
+        return self._moves
+
+    @property
+    def permutation(self):
+        """Get the sticker permutation for the whole algorithm, so that it
+        can be applied to a cube with a single gather.
+
+        Returns:
+            (np.array): The composed sticker permutation.
+        """
+        return compile_algorithm(str(self))
+
     @property
     def steps(self):
         """Get the list of steps that make up the algorithm
@@ -47,6 +104,32 @@ class Algorithm():
         """
         return self._steps[::-1]
 
+    def inverse(self):
+        """Get the algorithm which undoes this algorithm.
+
+        Returns:
+            (Algorithm): The inverse of the algorithm.
+        """
+        return Algorithm.from_moves(INVERSE[move] for move in reversed(self._moves))
+
+    def simplify(self):
+        """Get a copy of the algorithm where neighbouring turns of the same
+        layer have been merged or cancelled. e.g. R R' is removed and R R
+        becomes R2.
+
+        Returns:
+            (Algorithm): The simplified version of the algorithm.
+        """
+        return Algorithm.from_moves(simplify_moves(self._moves))
+
+    def __len__(self):
+        """Get the number of steps in the algorithm.
+
+        Returns:
+            (int): The number of moves.
+        """
+        return len(self._steps)
+
     def __iter__(self):
         """Allow iterating over the steps in the algorithm.
 
@@ -62,3 +145,49 @@ class Algorithm():
             (str): A space seperated list of Rubik's cube moves.
         """
         return ' '.join(self._steps)
+
+
+def simplify_moves(moves):
+    """Merge or cancel neighbouring turns of the same layer.
+
+    Arguments:
+        moves (iterable {int}): The move ids to simplify.
+
+    Returns:
+        (list {int}): The simplified move ids.
+    """
+    simplified = []
+
+    for move in moves:
+        if not simplified or simplified[-1] // 3 != move // 3:
+            simplified.append(move)
+            continue
+
+        turns = (_QUARTER_TURNS[simplified.pop() % 3] + _QUARTER_TURNS[move % 3]) % 4
+
+        if turns:
+            simplified.append(move // 3 * 3 + _MOVE_KIND[turns])
+
+    return simplified
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_algorithm(steps):
+    """Compose every step of an algorithm into a single sticker permutation.
+    The results are cached by their notation since the same algorithms are
+    used over and over again.
+
+    Arguments:
+        steps (str): Space separated list of steps.
+
+    Returns:
+        (np.array): The sticker permutation for the whole algorithm.
+    """
+    permutation = np.arange(PERMUTATIONS.shape[1])
+
+    for move in simplify_moves(Algorithm(steps).moves):
+        permutation = permutation[PERMUTATIONS[move]]
+
+    permutation.flags.writeable = False
+
+    return permutation
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+import json
+import sys
+
+from pysolver.cli.batch import read_cube_strings, solve_batch
+from pysolver.cli.main import create_solver, run_pysolver
+from pysolver.cube.constants import SOLVED
+from pysolver.cube.cube import Cube
+from pysolver.cube.cubie import CORNER_FACELETS
+from pysolver.cube.scramble import random_cube_strings
+from pysolver.util.algorithm import Algorithm
+
+
+# seeded random cubes, picked uniformly from every solvable cube.
+CUBE_STRINGS = list(random_cube_strings(6, seed=11))
+
+
+def _unsolvable():
+    """Swap two stickers of a corner, which has the right colors but isn't a
+    real cube.
+
+    Returns:
+        (str): The cube string.
+    """
+    stickers = list(SOLVED)
+    first, second = CORNER_FACELETS[0][:2]
+    stickers[first], stickers[second] = stickers[second], stickers[first]
+
+    return ''.join(stickers)
+
+
+def _solves(cube_string, solution):
+    cube = Cube(cube_string)
+    cube.do_algorithm(Algorithm(solution))
+
+    return cube.is_solved()
+
+
+def test_read_cube_strings_skips_blank_lines():
+    lines = [f'{CUBE_STRINGS[0]}\n', '\n', '   \n', f'  {CUBE_STRINGS[1]}  \n']
+
+    assert list(read_cube_strings(lines)) == [(0, CUBE_STRINGS[0]), (3, CUBE_STRINGS[1])]
+
+
+def test_results_are_in_input_order():
+    items = list(enumerate(CUBE_STRINGS + ['BAD', _unsolvable()]))
+    results = list(solve_batch(items, functools.partial(create_solver, 'cfop'), processes=2,
+                               chunk_size=2))
+
+    assert [result['index'] for result in results] == list(range(len(items)))
+
+    for result, cube_string in zip(results, CUBE_STRINGS):
+        assert result['cube'] == cube_string and _solves(cube_string, result['solution'])
+
+    assert results[-2]['error'] == results[-1]['error'] == 'Input cube is not valid'
+
+
+def test_unordered_results_cover_every_cube():
+    items = list(enumerate(CUBE_STRINGS))
+    results = list(solve_batch(items, functools.partial(create_solver, 'cfop'), processes=2,
+                               chunk_size=1, ordered=False, stats=True))
+
+    assert sorted(result['index'] for result in results) == list(range(len(items)))
+
+    for result in results:
+        assert _solves(result['cube'], result['solution'])
+        assert [stage['name'] for stage in result['stats']['stages']] == \
+            ['cross', 'f2l', 'oll', 'pll']
+
+
+def test_batch_command_line(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'cubes.txt'
+    path.write_text('\n'.join([CUBE_STRINGS[0], '', 'BAD', CUBE_STRINGS[1]]) + '\n')
+
+    monkeypatch.setattr(sys, 'argv', ['pysolver', '--batch', str(path), '--processes', '2'])
+    run_pysolver()
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [result['index'] for result in results] == [0, 2, 3]
+    assert _solves(CUBE_STRINGS[0], results[0]['solution'])
+    assert results[1] == {'index': 2, 'cube': 'BAD', 'error': 'Input cube is not valid'}
+    assert _solves(CUBE_STRINGS[1], results[2]['solution'])
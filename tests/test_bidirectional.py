@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from pysolver.cube.constants import SOLVED
+from pysolver.cube.cube import Cube
+from pysolver.cube.moves import FACE_MOVES, PERMUTATIONS
+from pysolver.solver.bidirectional import BidirectionalSolver
+from pysolver.util.algorithm import Algorithm
+
+
+def _scrambled(notation):
+    cube = Cube(SOLVED)
+    cube.do_algorithm(Algorithm(notation))
+
+    return cube
+
+
+def _optimal_length(cube):
+    """Find the fewest face moves which solve a cube by trying every
+    sequence, only quick for cubes a few moves from solved.
+
+    Arguments:
+        cube (Cube): The cube.
+
+    Returns:
+        (int): The number of moves.
+    """
+    # each state is one value so that repeats are quick to drop.
+    state_type = np.dtype((np.void, len(SOLVED)))
+
+    states = cube.state[None]
+    solved = Cube(SOLVED).state.view(state_type)
+    length = 0
+
+    while not (states.view(state_type) == solved).any():
+        states = states[:, PERMUTATIONS[:FACE_MOVES]].reshape(-1, len(SOLVED))
+        states = np.unique(states.view(state_type)).view(np.uint8).reshape(-1, len(SOLVED))
+        length += 1
+
+    return length
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return BidirectionalSolver()
+
+
+@pytest.mark.parametrize('notation', ['R', "R U'", 'R L R', "F2 U R' D", "R U F' L2 B",
+                                      "U R U' R' F2"])
+def test_solutions_are_optimal(solver, notation):
+    cube = _scrambled(notation)
+    algorithm = solver.solve(cube)
+
+    assert len(algorithm.moves) == _optimal_length(cube)
+    assert [stage.name for stage in solver.stats.stages] == ['meet']
+
+    cube.do_algorithm(algorithm)
+
+    assert cube.is_solved()
+
+
+def test_solved_cube_needs_no_moves(solver):
+    assert not solver.solve(Cube(SOLVED)).moves
+
+
+def test_goal_search_is_kept_until_cleared():
+    solver = BidirectionalSolver()
+    cube = _scrambled("R U F' L2 B D")
+
+    solver.solve(cube)
+    first = solver.stats.stages[0].nodes
+
+    solver.solve(cube)
+    second = solver.stats.stages[0].nodes
+
+    solver.clear()
+    solver.solve(cube)
+
+    assert second < first == solver.stats.stages[0].nodes
+
+
+def test_fallback_is_used_past_the_cap():
+    solver = BidirectionalSolver(max_states=100)
+    cube = _scrambled("R U F' L2 B D")
+    algorithm = solver.solve(cube)
+
+    assert [stage.name for stage in solver.stats.stages] == ['meet', 'phase1', 'phase2']
+
+    cube.do_algorithm(algorithm)
+
+    assert cube.is_solved()
+
+
+def test_search_goes_on_after_hash_collisions(monkeypatch):
+    shortest = BidirectionalSolver._shortest
+    rejected = []
+
+    def colliding(forward, goal, start, meetings):
+        # treat the first meeting of the searches as a collision.
+        if meetings and not rejected:
+            rejected.append(meetings)
+            return None
+
+        return shortest(forward, goal, start, meetings)
+
+    monkeypatch.setattr(BidirectionalSolver, '_shortest', staticmethod(colliding))
+
+    cube = _scrambled("F2 U R' D")
+    solver = BidirectionalSolver()
+    algorithm = solver.solve(cube)
+
+    assert rejected and [stage.name for stage in solver.stats.stages] == ['meet']
+
+    cube.do_algorithm(algorithm)
+
+    assert cube.is_solved()
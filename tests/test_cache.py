@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from pysolver.cube.cube import Cube
+from pysolver.cube.scramble import random_cube_strings
+from pysolver.solver.cache import (CachedSolver, SolutionCache, cache_key, from_canonical,
+                                   to_canonical)
+from pysolver.solver.cfop.solver import CFOPSolver
+from pysolver.util.algorithm import Algorithm
+
+
+# seeded random cubes, picked uniformly from every solvable cube.
+CUBE_STRINGS = list(random_cube_strings(4, seed=13))
+
+
+def _rotated(cube_string, rotations):
+    cube = Cube(cube_string)
+
+    for rotation in rotations.split():
+        cube.rotate(rotation)
+
+    return cube
+
+
+def _recolored(cube_string):
+    # swap the colors of opposite faces, which still gives a real cube.
+    return Cube(cube_string.translate(str.maketrans('WYGBOR', 'YWBGRO')))
+
+
+@pytest.fixture(scope='module')
+def cfop_solver():
+    return CFOPSolver()
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+@pytest.mark.parametrize('equivalent', [lambda cube_string: _rotated(cube_string, 'x y'),
+                                        lambda cube_string: _rotated(cube_string, "z2 y'"),
+                                        _recolored])
+def test_equivalent_cubes_share_a_key(cube_string, equivalent):
+    assert cache_key('Solver', Cube(cube_string))[0] == \
+        cache_key('Solver', equivalent(cube_string))[0]
+
+
+def test_solvers_keep_their_own_keys():
+    cube = Cube(CUBE_STRINGS[0])
+
+    assert cache_key('CFOPSolver', cube)[0] != cache_key('TwoPhaseSolver', cube)[0]
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+def test_cached_solution_solves_equivalent_cubes(cfop_solver, cube_string):
+    cube = Cube(cube_string)
+    key, symmetry = cache_key('CFOPSolver', cube)
+    cached = to_canonical(cfop_solver.solve(cube), symmetry)
+
+    for other in [_rotated(cube_string, 'x y'), _recolored(cube_string)]:
+        other_key, other_symmetry = cache_key('CFOPSolver', other)
+        other.do_algorithm(from_canonical(cached, other_symmetry))
+
+        assert other_key == key and other.is_solved()
+
+
+def test_least_recently_used_solution_is_forgotten():
+    cache = SolutionCache(size=2)
+    cache.put('first', Algorithm('R'))
+    cache.put('second', Algorithm('U'))
+
+    assert str(cache.get('first')) == 'R'
+
+    cache.put('third', Algorithm('F'))
+
+    assert cache.get('second') is None
+    assert str(cache.get('first')) == 'R' and str(cache.get('third')) == 'F'
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_database_outlives_the_cache(tmp_path):
+    path = str(tmp_path / 'solutions.db')
+
+    cache = SolutionCache(path, size=1)
+    cache.put('first', Algorithm("R U R' U'"))
+    cache.put('second', Algorithm('F2'))
+
+    # the first solution was pushed out of memory so is read back.
+    assert str(cache.get('first')) == "R U R' U'"
+    cache.close()
+
+    cache = SolutionCache(path)
+
+    assert str(cache.get('second')) == 'F2' and cache.get('third') is None
+    cache.close()
+
+
+def test_cached_solver_answers_equivalent_cubes(cfop_solver):
+    solver = CachedSolver(cfop_solver)
+
+    cube = Cube(CUBE_STRINGS[1])
+    cube.do_algorithm(solver.solve(cube))
+
+    assert cube.is_solved()
+    assert (solver.stats.cache_hits, solver.stats.cache_misses) == (0, 1)
+
+    for other in [Cube(CUBE_STRINGS[1]), _rotated(CUBE_STRINGS[1], "y z'"),
+                  _recolored(CUBE_STRINGS[1])]:
+        other.do_algorithm(solver.solve(other))
+
+        assert other.is_solved()
+        assert (solver.stats.cache_hits, solver.stats.cache_misses) == (1, 0)
+
+    assert (solver.cache.hits, solver.cache.misses) == (3, 1)
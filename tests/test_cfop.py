@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from pysolver.cube.constants import SOLVED
+from pysolver.cube.cube import Cube, InvalidCubeString
+from pysolver.cube.cubie import corner_coordinate, edge_coordinate
+from pysolver.cube.scramble import random_cube_strings
+from pysolver.util.algorithm import Algorithm
+from pysolver.solver.cfop.cross import (CROSS_EDGES, MAX_DEPTH, CrossSolver, cross_index,
+                                        pruning_table)
+from pysolver.solver.cfop.algorithms import OLL, PLL
+from pysolver.solver.cfop.f2l import PAIRS, F2LSolver
+from pysolver.solver.cfop.ll import OLLSolver, PLLSolver, oll_key
+from pysolver.solver.cfop.solver import STAGES, CFOPSolver
+
+
+# seeded random cubes, picked uniformly from every solvable cube.
+CUBE_STRINGS = list(random_cube_strings(10, seed=6))
+
+
+def _cross_coordinates(cube):
+    return tuple(edge_coordinate(cube.state, edge) for edge in CROSS_EDGES)
+
+
+@pytest.fixture(scope='module')
+def cross_solver():
+    return CrossSolver()
+
+
+def _pairs(cube):
+    return [(corner_coordinate(cube.state, corner), edge_coordinate(cube.state, edge))
+            for corner, edge in PAIRS]
+
+
+@pytest.fixture(scope='module')
+def f2l_solver():
+    return F2LSolver()
+
+
+def _case(notation, turn):
+    """Make a last layer case by undoing an algorithm on a solved cube.
+
+    Arguments:
+        notation (str): The algorithm which solves the case.
+        turn (str): A turn of the up face made before undoing it.
+
+    Returns:
+        (Cube): The case.
+    """
+    cube = Cube(SOLVED)
+    cube.do_algorithm(Algorithm(f'{notation} {turn}').inverse())
+
+    return cube
+
+
+@pytest.fixture(scope='module')
+def oll_solver():
+    return OLLSolver()
+
+
+@pytest.fixture(scope='module')
+def pll_solver():
+    return PLLSolver()
+
+
+@pytest.fixture(scope='module')
+def cfop_solver():
+    return CFOPSolver()
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+def test_cross_is_solved_optimally(cross_solver, cube_string):
+    cube = Cube(cube_string)
+    distance = pruning_table()[cross_index(_cross_coordinates(cube))]
+
+    algorithm = cross_solver.solve(cube)
+    cube.do_algorithm(algorithm)
+
+    assert _cross_coordinates(cube) == tuple(edge * 2 for edge in CROSS_EDGES)
+    assert len(algorithm.moves) == distance <= MAX_DEPTH
+
+
+def test_solved_cross_needs_no_moves(cross_solver):
+    assert not cross_solver.solve(Cube(SOLVED)).moves
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+def test_f2l_solves_every_pair(cross_solver, f2l_solver, cube_string):
+    cube = Cube(cube_string)
+    cube.do_algorithm(cross_solver.solve(cube))
+
+    before = cube.copy()
+    cube.do_algorithm(f2l_solver.solve(cube))
+
+    assert cube != before
+    assert _cross_coordinates(cube) == tuple(edge * 2 for edge in CROSS_EDGES)
+    assert _pairs(cube) == [(corner * 3, edge * 2) for corner, edge in PAIRS]
+
+
+def test_f2l_leaves_the_cube_alone(cross_solver, f2l_solver):
+    cube = Cube(CUBE_STRINGS[2])
+    cube.do_algorithm(cross_solver.solve(cube))
+
+    before = cube.copy()
+    f2l_solver.solve(cube)
+
+    assert cube == before
+
+
+def test_solved_f2l_needs_no_moves(f2l_solver):
+    assert not f2l_solver.solve(Cube(SOLVED)).moves
+
+
+@pytest.mark.parametrize('turn', ['', 'U', 'U2', "U'"])
+@pytest.mark.parametrize('name, notation', OLL)
+def test_oll_cases_are_oriented(oll_solver, name, notation, turn):
+    cube = _case(notation, turn)
+    cube.do_algorithm(oll_solver.solve(cube))
+
+    assert oll_key(cube.state) == oll_key(Cube(SOLVED).state), name
+
+
+@pytest.mark.parametrize('turn', ['', 'U', 'U2', "U'"])
+@pytest.mark.parametrize('name, notation', PLL)
+def test_pll_cases_are_solved(pll_solver, name, notation, turn):
+    cube = _case(notation, turn)
+    cube.do_algorithm(pll_solver.solve(cube))
+
+    assert cube.is_solved(), name
+
+
+@pytest.mark.parametrize('stage', [OLLSolver, PLLSolver])
+def test_unknown_last_layer_is_rejected(stage):
+    # a random cube doesn't have its first two layers solved.
+    with pytest.raises(InvalidCubeString) as error:
+        stage().solve(Cube(CUBE_STRINGS[3]))
+
+    assert error.value.__cause__ is None and error.value.__suppress_context__
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+def test_cfop_solves_random_cubes(cfop_solver, cube_string):
+    cube = Cube(cube_string)
+    cube.do_algorithm(cfop_solver.solve(cube))
+
+    assert cube.is_solved()
+
+
+def test_cfop_stages_solve_in_order(cfop_solver):
+    cube = Cube(CUBE_STRINGS[0])
+    stages = cfop_solver.solve_stages(cube)
+
+    assert [name for name, _ in stages] == list(STAGES)
+    assert [stage.name for stage in cfop_solver.stats.stages] == list(STAGES)
+
+    for _, algorithm in stages:
+        cube.do_algorithm(algorithm)
+
+    assert cube.is_solved()
+
+
+def test_cfop_leaves_the_cube_alone(cfop_solver):
+    cube = Cube(CUBE_STRINGS[1])
+    before = cube.copy()
+    cfop_solver.solve(cube)
+
+    assert cube == before
+
+
+def test_cfop_solved_cube(cfop_solver):
+    cube = Cube(SOLVED)
+    cube.do_algorithm(cfop_solver.solve(cube))
+
+    assert cube.is_solved()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from pysolver.cube.constants import SOLVED
+from pysolver.cube.cube import Cube, InvalidCubeString
+from pysolver.cube.cubie import CORNER_FACELETS, CubieCube, face_colors, is_solvable, solvable
+from pysolver.cube import scramble
+from pysolver.cube.moves import FACE_MOVES, LAYERS, MOVES
+from pysolver.util.algorithm import Algorithm, simplify_moves
+
+
+def _scrambled(seed, length=25):
+    """Scramble a solved cube with random face moves.
+
+    Arguments:
+        seed (int): The seed of the random number generator.
+        length (int): The number of moves.
+
+    Returns:
+        (Cube): The scrambled cube.
+    """
+    generator = random.Random(seed)
+    cube = Cube(SOLVED)
+    cube.do_algorithm(Algorithm.from_moves([generator.randrange(FACE_MOVES)
+                                            for _ in range(length)]))
+
+    return cube
+
+
+def _modified(cube, change):
+    """Change the pieces of a cube and get its cube string.
+
+    Arguments:
+        cube (Cube): The cube.
+        change (function): Changes the CubieCube of the cube in place.
+
+    Returns:
+        (str): The cube string of the changed cube.
+    """
+    cubie = CubieCube.from_state(cube.state)
+    change(cubie)
+
+    return cubie.to_state(face_colors(cube.state)).tobytes().decode('ascii')
+
+
+def _swap(items, first, second):
+    items[first], items[second] = items[second], items[first]
+
+
+def _twist(cubie):
+    cubie.co[0] = (cubie.co[0] + 1) % 3
+
+
+def _flip(cubie):
+    cubie.eo[0] = 1 - cubie.eo[0]
+
+
+def _swap_corners(cubie):
+    _swap(cubie.cp, 0, 1)
+
+
+def _swap_edges(cubie):
+    _swap(cubie.ep, 0, 1)
+
+
+def _swap_both(cubie):
+    _swap(cubie.cp, 0, 1)
+    _swap(cubie.ep, 0, 1)
+
+
+def _mirrored_corner():
+    """Swap two stickers of a corner of a solved cube, which gives a corner
+    that doesn't exist.
+
+    Returns:
+        (str): The cube string.
+    """
+    stickers = list(SOLVED)
+    first, second = CORNER_FACELETS[0][:2]
+    stickers[first], stickers[second] = stickers[second], stickers[first]
+
+    return ''.join(stickers)
+
+
+@pytest.mark.parametrize('change', [_twist, _flip, _swap_corners, _swap_edges])
+def test_unsolvable_cubes_are_rejected(change):
+    cube_string = _modified(_scrambled(1), change)
+
+    assert Cube.valid_cube_string(cube_string)
+    assert not is_solvable(np.frombuffer(cube_string.encode('ascii'), dtype=np.uint8))
+
+    with pytest.raises(InvalidCubeString):
+        Cube(cube_string)
+
+
+def test_mirrored_corner_is_rejected():
+    with pytest.raises(InvalidCubeString):
+        Cube(_mirrored_corner())
+
+
+def test_swapping_corners_and_edges_is_solvable():
+    Cube(_modified(_scrambled(2), _swap_both))
+
+
+def test_solvable_matches_is_solvable():
+    cube_strings = [str(_scrambled(seed)) for seed in range(10)]
+    cube_strings += [_modified(_scrambled(seed), change) for seed, change in
+                     enumerate([_twist, _flip, _swap_corners, _swap_edges, _swap_both])]
+    cube_strings.append(_mirrored_corner())
+
+    states = np.array([np.frombuffer(cube_string.encode('ascii'), dtype=np.uint8)
+                       for cube_string in cube_strings])
+
+    assert solvable(states).tolist() == [is_solvable(state) for state in states]
+
+
+@pytest.mark.parametrize('cube_string', ['', SOLVED[:-1], SOLVED + 'B', 'X' * 54,
+                                         SOLVED.replace('B', 'G', 1)])
+def test_invalid_cube_strings(cube_string):
+    assert not Cube.valid_cube_string(cube_string)
+
+    with pytest.raises(InvalidCubeString):
+        Cube(cube_string)
+
+
+def test_whitespace_is_ignored():
+    cube = _scrambled(3)
+    text = str(cube)
+
+    assert Cube('\n'.join(text[index:index + 9] for index in range(0, 54, 9))) == cube
+
+
+@pytest.mark.parametrize('notation, expected', [("R R'", ''), ('R R', 'R2'), ('R2 R', "R'"),
+                                                ("R U U' R'", ''), ('R L R', 'R L R')])
+def test_simplify_moves(notation, expected):
+    assert simplify_moves(Algorithm(notation).moves) == list(Algorithm(expected).moves)
+
+
+@pytest.mark.parametrize('name, layer, matrix', LAYERS)
+def test_moves_match_piece_rotation(name, layer, matrix):
+    cube = _scrambled(4)
+    layer, matrix = np.asarray(layer), np.asarray(matrix)
+
+    # faces have one non zero entry and slices have two.
+    if np.count_nonzero(layer) == 1:
+        turned = [piece for piece in cube if np.dot(piece.position, layer) == 1]
+    else:
+        turned = [piece for piece in cube if np.dot(piece.position, 1 - layer) == 0]
+
+    expected = {piece.position: piece.colors for piece in cube}
+
+    for piece in turned:
+        del expected[piece.position]
+
+    for piece in turned:
+        piece.rotate(matrix)
+        expected[piece.position] = piece.colors
+
+    cube.rotate(name)
+
+    assert {piece.position: piece.colors for piece in cube} == expected
+
+
+def test_push_and_pop_move():
+    cube = _scrambled(5)
+    before = cube.copy()
+
+    for move in range(len(MOVES)):
+        cube.push_move(move)
+
+    for _ in range(len(MOVES)):
+        cube.pop_move()
+
+    assert cube == before
+
+
+def test_inverse_algorithm_solves_scramble():
+    algorithm = Algorithm("R U R' U' F2 D' L B2 M E' S x y' z2")
+    cube = Cube(SOLVED)
+    cube.do_algorithm(algorithm)
+    cube.do_algorithm(algorithm.inverse())
+
+    assert cube == Cube(SOLVED)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bytes_round_trip(seed):
+    cube = _scrambled(seed)
+
+    assert Cube.from_bytes(cube.to_bytes()) == cube
+
+
+def test_from_bytes_rejects_unsolvable_cubes():
+    data = bytearray(_scrambled(6).to_bytes())
+    data[-1] ^= 1
+
+    with pytest.raises(InvalidCubeString):
+        Cube.from_bytes(bytes(data))
+
+
+def test_random_cubes_do_not_depend_on_chunking(monkeypatch):
+    monkeypatch.setattr(scramble, 'CHUNK_SIZE', 7)
+
+    states = scramble.random_states(20, 7)
+    cube_strings = [state.tobytes().decode('ascii') for state in states]
+
+    assert solvable(states).all()
+    assert list(scramble.random_cube_strings(20, 7)) == cube_strings
+    assert list(itertools.islice(scramble.random_cube_strings(None, 7), 20)) == cube_strings
+    assert scramble.random_states(3, 7).tolist() == states[:3].tolist()
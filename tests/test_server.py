@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import functools
+import json
+
+from pysolver.cli.server import SolveService, _handle
+from pysolver.cube.cube import Cube
+from pysolver.cube.scramble import random_cube_strings
+from pysolver.solver.cache import SolutionCache
+from pysolver.util.algorithm import Algorithm
+
+
+# seeded random cubes, picked uniformly from every solvable cube.
+CUBE_STRINGS = list(random_cube_strings(20, seed=22))
+
+
+def _solves(cube_string, solution):
+    cube = Cube(cube_string)
+    cube.do_algorithm(Algorithm(solution))
+
+    return cube.is_solved()
+
+
+def _run(test, **options):
+    """Run a test against a started service with one worker.
+
+    Arguments:
+        test (function): Coroutine function given the service.
+        options (dict): Further arguments of the service.
+
+    Returns:
+        (object): What the test returned.
+    """
+    async def main():
+        service = SolveService('cfop', processes=1, **options)
+        await service.start()
+
+        try:
+            return await test(service)
+        finally:
+            await service.close()
+
+    return asyncio.run(main())
+
+
+async def _wait_for_queue(service, depth):
+    while service.metrics()['queue_depth'] != depth:
+        await asyncio.sleep(0.001)
+
+
+def test_solutions_and_cache_hits():
+    async def test(service):
+        first = await service.solve(CUBE_STRINGS[0])
+
+        cube = Cube(CUBE_STRINGS[0])
+        cube.rotate('y')
+        second = await service.solve(str(cube))
+
+        return first, second, service.metrics()
+
+    first, second, metrics = _run(test)
+
+    assert _solves(CUBE_STRINGS[0], first['solution']) and not first['cached']
+    assert _solves(second['cube'], second['solution']) and second['cached']
+    assert (metrics['requests'], metrics['cache_hits'], metrics['batches']) == (2, 1, 1)
+    assert metrics['pending'] == metrics['in_flight'] == metrics['queue_depth'] == 0
+
+
+def test_cache_database_is_shared(tmp_path):
+    path = str(tmp_path / 'solutions.db')
+
+    first = _run(lambda service: service.solve(CUBE_STRINGS[1]), cache=SolutionCache(path))
+    second = _run(lambda service: service.solve(CUBE_STRINGS[1]), cache=SolutionCache(path))
+
+    assert not first['cached'] and second['cached']
+    assert second['solution'] == first['solution']
+
+
+def test_equivalent_requests_share_a_solve():
+    async def test(service):
+        cube = Cube(CUBE_STRINGS[2])
+        cube.rotate('x')
+
+        results = await asyncio.gather(service.solve(CUBE_STRINGS[2]), service.solve(str(cube)))
+
+        return results, service.metrics()
+
+    results, metrics = _run(test)
+
+    assert all(_solves(result['cube'], result['solution']) for result in results)
+    assert metrics['batches'] == 1 and metrics['mean_batch_size'] == 1
+
+
+def test_invalid_cube_is_rejected():
+    result = _run(lambda service: service.solve('BAD'))
+
+    assert result == {'cube': 'BAD', 'cached': False, 'error': 'Input cube is not valid'}
+
+
+def test_request_times_out_while_a_batch_is_in_flight():
+    async def test(service):
+        # the worker is busy with these while the last request times out.
+        busy = [asyncio.ensure_future(service.solve(cube_string))
+                for cube_string in CUBE_STRINGS[4:]]
+
+        while not service.metrics()['in_flight']:
+            await asyncio.sleep(0.001)
+
+        late = await service.solve(CUBE_STRINGS[3], timeout=0.001)
+        metrics = service.metrics()
+
+        # the timed out cube is dropped, not solved, and may be asked for again.
+        busy = await asyncio.gather(*busy)
+        again = await service.solve(CUBE_STRINGS[3])
+
+        return late, metrics, busy, again, service.metrics()
+
+    late, metrics, busy, again, final = _run(test, batch_size=len(CUBE_STRINGS))
+
+    assert late['error'] == 'Timed out' and metrics['timeouts'] == 1
+    assert all(_solves(result['cube'], result['solution']) for result in busy)
+    assert _solves(CUBE_STRINGS[3], again['solution'])
+    assert final['pending'] == final['in_flight'] == 0
+
+
+def test_dropped_cube_answers_its_waiting_request():
+    async def test(service):
+        # hold the only worker so that the request stays in the queue.
+        await service._workers.acquire()
+
+        task = asyncio.ensure_future(service.solve(CUBE_STRINGS[3], timeout=5))
+        await _wait_for_queue(service, 1)
+
+        # every request for the cube looks to have stopped waiting, but this
+        # one hasn't timed out yet.
+        for key in service._deadlines:
+            service._deadlines[key] = 0.0
+
+        service._workers.release()
+
+        return await task, service.metrics()
+
+    result, metrics = _run(test)
+
+    assert result['error'] == 'Timed out'
+    assert metrics['timeouts'] == 1 and metrics['batches'] == 0 and metrics['pending'] == 0
+
+
+def test_connection_answers_every_line():
+    lines = [CUBE_STRINGS[0], json.dumps({'cube': CUBE_STRINGS[1], 'id': 7}),
+             json.dumps({'cube': CUBE_STRINGS[2], 'timeout': -1, 'id': 'bad'}), '{not json',
+             'BAD']
+
+    async def test(service):
+        server = await asyncio.start_server(functools.partial(_handle, service), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(''.join(f'{line}\n\n' for line in lines).encode('utf-8'))
+            writer.write_eof()
+
+            responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+            writer.close()
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"metrics": true}\n')
+            writer.write_eof()
+
+            metrics = json.loads(await reader.readline())
+            writer.close()
+
+        return responses, metrics
+
+    responses, metrics = _run(test)
+
+    assert len(responses) == len(lines)
+    assert _solves(CUBE_STRINGS[0], next(response['solution'] for response in responses
+                                         if response.get('cube') == CUBE_STRINGS[0]))
+    assert _solves(CUBE_STRINGS[1], next(response['solution'] for response in responses
+                                         if response.get('id') == 7))
+    assert {'error': 'Request is not valid', 'id': 'bad'} in responses
+    assert {'error': 'Request is not valid'} in responses
+    assert {'cube': 'BAD', 'cached': False, 'error': 'Input cube is not valid'} in responses
+    assert metrics['metrics']['requests'] == 3
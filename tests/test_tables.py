@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from pysolver.solver.tables import TABLE_DIR_VARIABLE, load_table
+
+
+# the table saved by every test.
+TABLE = np.arange(4096, dtype=np.uint16).reshape(64, 64)
+
+
+class Builder():
+    """Build the table and count how many times it was built."""
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return TABLE.copy()
+
+
+@pytest.fixture(autouse=True)
+def table_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv(TABLE_DIR_VARIABLE, str(tmp_path))
+    return tmp_path
+
+
+def test_saved_table_is_mapped(table_directory):
+    builder = Builder()
+
+    first = load_table('test', builder)
+    second = load_table('test', builder)
+
+    assert builder.calls == 1
+    assert (first == TABLE).all() and (second == TABLE).all()
+    assert second.shape == (64, 64) and not second.flags.writeable
+
+
+def test_new_version_is_rebuilt():
+    builder = Builder()
+
+    load_table('test', builder)
+    load_table('test', builder, version=2)
+
+    assert builder.calls == 2
+
+
+def test_truncated_table_is_rebuilt(table_directory):
+    builder = Builder()
+    load_table('test', builder)
+
+    path = table_directory / 'test.tbl'
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert (load_table('test', builder) == TABLE).all()
+    assert builder.calls == 2
+
+
+def test_checksum_is_only_read_when_verifying(table_directory):
+    builder = Builder()
+    load_table('test', builder)
+
+    path = table_directory / 'test.tbl'
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xff
+    path.write_bytes(bytes(data))
+
+    assert load_table('test', builder)[-1, -1] != TABLE[-1, -1]
+    assert builder.calls == 1
+
+    assert (load_table('test', builder, verify=True) == TABLE).all()
+    assert builder.calls == 2
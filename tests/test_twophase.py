@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+This file is part of pysolver.
+
+Copyright (C) 2019, James Lee <jamesl33info@gmail.com>.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from pysolver.cube.constants import SOLVED
+from pysolver.cube.cube import Cube
+from pysolver.cube.cubie import CubieCube
+from pysolver.cube.scramble import random_cube_strings
+from pysolver.solver.anytime import AnytimeSolver
+from pysolver.solver.twophase.coordinates import (FLIPS, SLICES, SOLVED_SLICE, TWISTS,
+                                                  coordinates, decode_orientation,
+                                                  decode_permutation, decode_slice,
+                                                  encode_orientation, encode_permutation,
+                                                  encode_slice)
+from pysolver.solver.twophase.parallel import ParallelTwoPhaseSolver
+from pysolver.solver.twophase.solver import MAX_PHASE1_DEPTH, MAX_PHASE2_DEPTH, TwoPhaseSolver
+from pysolver.util.algorithm import Algorithm
+
+
+# seeded random cubes, picked uniformly from every solvable cube.
+CUBE_STRINGS = list(random_cube_strings(5, seed=10))
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return TwoPhaseSolver()
+
+
+@pytest.mark.parametrize('base, pieces, count', [(3, 8, TWISTS), (2, 12, FLIPS)])
+def test_orientation_coordinates_round_trip(base, pieces, count):
+    coordinate = np.arange(count)
+    orientation = decode_orientation(coordinate, base, pieces)
+
+    assert (orientation.sum(axis=1) % base == 0).all()
+    assert (encode_orientation(orientation, base) == coordinate).all()
+
+
+def test_permutation_coordinates_round_trip():
+    permutations = decode_permutation(5)
+
+    assert len(permutations) == math.factorial(5)
+    assert (encode_permutation(permutations) == np.arange(len(permutations))).all()
+
+
+def test_slice_coordinates_round_trip():
+    coordinate = np.arange(SLICES)
+    occupied = decode_slice(coordinate)
+
+    assert (occupied.sum(axis=1) == 4).all()
+    assert (encode_slice(occupied) == coordinate).all()
+
+
+def test_solved_cube_coordinates():
+    assert coordinates(CubieCube()) == (0, 0, SOLVED_SLICE)
+
+
+@pytest.mark.parametrize('cube_string', CUBE_STRINGS)
+def test_solves_random_cubes(solver, cube_string):
+    cube = Cube(cube_string)
+    algorithm = solver.solve(cube)
+
+    assert len(algorithm.moves) <= MAX_PHASE1_DEPTH + MAX_PHASE2_DEPTH
+
+    cube.do_algorithm(algorithm)
+
+    assert cube.is_solved()
+
+
+def test_short_scramble_is_undone():
+    cube = Cube(SOLVED)
+    cube.do_algorithm(Algorithm("R U F' D2"))
+
+    algorithm = TwoPhaseSolver(max_length=4).solve(cube)
+    cube.do_algorithm(algorithm)
+
+    assert cube.is_solved() and len(algorithm.moves) <= 4
+
+
+def test_solved_cube_needs_no_moves(solver):
+    assert not solver.solve(Cube(SOLVED)).moves
+
+
+def test_parallel_solver_solves_random_cubes():
+    with ParallelTwoPhaseSolver(processes=2) as parallel:
+        for cube_string in CUBE_STRINGS[:3]:
+            cube = Cube(cube_string)
+            cube.do_algorithm(parallel.solve(cube))
+
+            assert cube.is_solved() and parallel.nodes > 0
+
+
+@pytest.mark.parametrize('max_time', [0.01, 0.1])
+def test_anytime_solver_keeps_to_its_time(max_time):
+    solver = AnytimeSolver(max_length=10)
+    solver.solve(Cube(SOLVED))
+
+    for cube_string in CUBE_STRINGS:
+        start = time.monotonic()
+        solutions = list(solver.solutions(Cube(cube_string), max_time))
+        seconds = time.monotonic() - start
+
+        # the search stops within a few milliseconds, the margin is for
+        # busy machines.
+        assert seconds < max_time + 0.05
+
+        lengths = [len(solution.moves) for solution in solutions]
+        assert lengths == sorted(set(lengths), reverse=True)
+
+        cube = Cube(cube_string)
+        cube.do_algorithm(solutions[-1])
+        assert cube.is_solved()